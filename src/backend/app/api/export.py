@@ -0,0 +1,123 @@
+# backend/app/api/export.py - EXPORTS NDJSON EN FLUX
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services.fixture_store import fixture_stores, fixture_key
+from app.services.response_cache import dumps
+from app.services.metrics import metrics_engine
+from app.services.squads import build_detailed_player, fetch_squad_players
+from app.api.standings import build_league_standings
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+BATCH_SIZE = 100          # Lignes par écriture réseau
+SQUADS_PREFETCH = 3       # Équipes chargées à l'avance pendant l'envoi de la précédente
+
+
+def ndjson_response(lines: AsyncIterator[bytes], filename: str) -> StreamingResponse:
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers={
+        "Content-Disposition": f'attachment; filename="{filename}"'
+    })
+
+
+def encode_lines(items: List[Dict[str, Any]]) -> bytes:
+    return b"".join(dumps(item) + b"\n" for item in items)
+
+
+@router.get("/fixtures")
+async def export_fixtures(
+    league: int = Query(..., description="ID de la ligue"),
+    season: int = Query(2023, description="Année de la saison"),
+    team: Optional[int] = Query(None, description="ID d'équipe (optionnel)")
+):
+    """
+    Tous les matchs d'une saison, un par ligne (NDJSON), par date de coup d'envoi
+    """
+    store = await fixture_stores.get(league, season)
+    print(f"📤 Export matchs {league}/{season}: {len(store)} matchs")
+
+    async def lines():
+        after = None
+        while True:
+            batch = store.page(after, BATCH_SIZE, team_id=team)
+            if not batch:
+                return
+            yield encode_lines(batch)
+            after = fixture_key(batch[-1])
+            await asyncio.sleep(0)
+
+    return ndjson_response(lines(), f"fixtures_{league}_{season}.ndjson")
+
+
+@router.get("/standings")
+async def export_standings(
+    league: int = Query(..., description="ID de la ligue"),
+    season: int = Query(2023, description="Année de la saison")
+):
+    """
+    Classement d'une ligue, une équipe par ligne (NDJSON)
+    """
+    standings = await build_league_standings(league, season)
+    rows = [{"league_id": league, "season": season, **row} for row in standings["standings"]]
+    print(f"📤 Export classement {league}/{season}: {len(rows)} équipes")
+
+    async def lines():
+        for start in range(0, len(rows), BATCH_SIZE):
+            yield encode_lines(rows[start:start + BATCH_SIZE])
+
+    return ndjson_response(lines(), f"standings_{league}_{season}.ndjson")
+
+
+async def fetch_squad(team: Dict[str, Any], league: int, season: int) -> List[Dict[str, Any]]:
+    """Joueurs détaillés d'une équipe, toutes pages de l'endpoint `players` comprises"""
+    player_items = await fetch_squad_players(team["id"], league, season)
+    players = []
+    squad_metrics = metrics_engine.squad(team["id"], league, season, player_items)
+    for player_item, calculated_stats in zip(player_items, squad_metrics):
+        player = build_detailed_player(player_item, calculated_stats)
+        player["team"] = {"id": team["id"], "name": team["name"]}
+        players.append(player)
+    return players
+
+
+@router.get("/squads")
+async def export_squads(
+    league: int = Query(..., description="ID de la ligue"),
+    season: int = Query(2023, description="Année de la saison")
+):
+    """
+    Joueurs détaillés de toutes les équipes d'une ligue, un par ligne (NDJSON).
+    Chaque effectif est envoyé dès qu'il est chargé, les suivants étant
+    chargés en parallèle (SQUADS_PREFETCH équipes d'avance). Une équipe dont
+    l'effectif n'a pas pu être chargé donne une ligne {"error", "status", "team"}.
+    """
+    standings = await build_league_standings(league, season)
+    teams = [row["team"] for row in standings["standings"]]
+    print(f"📤 Export effectifs {league}/{season}: {len(teams)} équipes")
+
+    async def lines():
+        pending: List[asyncio.Task] = []
+        next_team = 0
+        try:
+            while next_team < len(teams) or pending:
+                while next_team < len(teams) and len(pending) < SQUADS_PREFETCH:
+                    pending.append(asyncio.ensure_future(fetch_squad(teams[next_team], league, season)))
+                    next_team += 1
+                team = teams[next_team - len(pending)]
+                try:
+                    squad = await pending.pop(0)
+                except HTTPException as e:
+                    # Effectif indisponible : ligne d'erreur explicite pour cette équipe,
+                    # jamais un effectif vide qui ferait passer l'export pour complet
+                    yield dumps({"error": e.detail, "status": e.status_code,
+                                 "team": {"id": team["id"], "name": team["name"]}}) + b"\n"
+                    if e.status_code == 429:
+                        return  # Quota épuisé : les équipes suivantes échoueraient aussi
+                    continue
+                yield encode_lines(squad)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    return ndjson_response(lines(), f"squads_{league}_{season}.ndjson")
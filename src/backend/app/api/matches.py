@@ -1,58 +1,16 @@
 # backend/app/api/matches.py - VERSION CORRIGÉE
-from fastapi import APIRouter, HTTPException, Query
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional
-import requests
-from datetime import datetime, timedelta
 from app.config.settings import settings
+from app.services.upstream import load
+from app.services.fixture_store import fixture_stores, fixture_key, encode_cursor, decode_cursor
+from app.services.live_poller import live_poller, format_event
+from app.services.response_cache import memoized_response, dumps
 
 router = APIRouter()
 
-# Configuration API Football
-BASE_URL = "https://v3.football.api-sports.io"
-headers = {
-    "X-RapidAPI-Key": settings.football_api_key,
-    "X-RapidAPI-Host": "v3.football.api-sports.io"
-}
-
-def filter_matches_by_date(matches, days_back=30, days_forward=30):
-    """
-    Filtrer les matchs par date côté Python (puisque last/next non disponible)
-    """
-    now = datetime.now()
-    date_start = now - timedelta(days=days_back)
-    date_end = now + timedelta(days=days_forward)
-    
-    recent_matches = []
-    upcoming_matches = []
-    live_matches = []
-    
-    for match in matches:
-        match_date = datetime.fromtimestamp(match['fixture']['timestamp'])
-        
-        # Matchs live
-        if match['fixture']['status']['short'] in ['1H', '2H', 'HT', 'ET', 'P', 'LIVE']:
-            live_matches.append(match)
-        
-        # Matchs récents (terminés dans les X derniers jours)
-        elif (match['fixture']['status']['short'] in ['FT', 'AET', 'PEN'] and 
-              date_start <= match_date <= now):
-            recent_matches.append(match)
-        
-        # Matchs à venir (programmés dans les X prochains jours)
-        elif (match['fixture']['status']['short'] in ['NS', 'TBD'] and 
-              now <= match_date <= date_end):
-            upcoming_matches.append(match)
-    
-    # Trier par date
-    recent_matches.sort(key=lambda x: x['fixture']['timestamp'], reverse=True)
-    upcoming_matches.sort(key=lambda x: x['fixture']['timestamp'])
-    
-    return {
-        'recent': recent_matches[:10],  # Limiter à 10
-        'upcoming': upcoming_matches[:10],  # Limiter à 10
-        'live': live_matches
-    }
-
 # ============= ENDPOINTS SPÉCIFIQUES - ORDRE CRITIQUE ! =============
 # ⚠️ CRITICAL: Ces endpoints DOIVENT être définis AVANT l'endpoint avec {match_id}
 # Sinon FastAPI confond "live", "recent", "upcoming" avec des IDs de match
@@ -78,23 +36,7 @@ async def get_live_matches(
         
         print(f"📡 Appel API live avec params: {api_params}")
         
-        response = requests.get(
-            f"{BASE_URL}/fixtures",
-            headers=headers,
-            params=api_params,
-            timeout=30
-        )
-        
-        print(f"📊 Réponse API: status={response.status_code}")
-        
-        if response.status_code != 200:
-            print(f"❌ Erreur API: {response.status_code} - {response.text}")
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Erreur API Football: {response.status_code}"
-            )
-        
-        data = response.json()
+        data = await load("fixtures", api_params)
         
         print(f"✅ Matchs live récupérés: {len(data.get('response', []))}")
         
@@ -113,6 +55,41 @@ async def get_live_matches(
             "response": []
         }
 
+@router.get("/matches/live/stream")
+async def stream_live_matches(
+    request: Request,
+    league: Optional[int] = Query(None, description="ID de la ligue (optionnel)"),
+    season: Optional[int] = Query(None, description="Saison de la ligue (défaut : saison en cours)")
+):
+    """
+    Flux Server-Sent Events des matchs en direct
+    - snapshot : matchs en cours à la connexion
+    - update : matchs modifiés depuis le dernier sondage
+    - ended : ids des matchs sortis du direct
+    Un seul sondeur upstream est partagé par tous les clients
+    """
+    subscription = await live_poller.subscribe(league, season)
+    print(f"📺 Client live connecté (league={league}), {len(live_poller.subscribers)} abonné(s)")
+    
+    async def events():
+        try:
+            yield format_event("snapshot", live_poller.current(league))
+            while not await request.is_disconnected():
+                try:
+                    event, data = await asyncio.wait_for(subscription.queue.get(), settings.live_stream_heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield format_event(event, data)
+        finally:
+            live_poller.unsubscribe(subscription)
+            print(f"📺 Client live déconnecté (league={league})")
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
+
 @router.get("/matches/recent")
 async def get_recent_matches(
     league: int = Query(..., description="ID de la ligue"),
@@ -126,42 +103,23 @@ async def get_recent_matches(
     try:
         print(f"📅 Récupération matchs récents: league={league}, season={season}")
         
-        # Récupérer tous les matchs de la saison (seul paramètre disponible)
+        # Saison indexée en mémoire (seul paramètre disponible côté API)
         api_params = {
             "league": league,
             "season": season
         }
+        store = await fixture_stores.get(league, season)
+        recent = store.recent(limit=limit)
         
-        response = requests.get(
-            f"{BASE_URL}/fixtures",
-            headers=headers,
-            params=api_params,
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Erreur API Football: {response.status_code}"
-            )
-        
-        data = response.json()
-        
-        if "response" not in data:
-            return {"response": [], "get": "fixtures", "parameters": api_params}
-        
-        # Filtrer les matchs côté serveur
-        filtered = filter_matches_by_date(data["response"])
-        
-        print(f"✅ Matchs récents filtrés: {len(filtered['recent'][:limit])}")
+        print(f"✅ Matchs récents filtrés: {len(recent)}")
         
         # Retourner seulement les matchs récents
         return {
             "get": "fixtures",
             "parameters": api_params,
-            "errors": data.get("errors", {}),
-            "results": len(filtered['recent'][:limit]),
-            "response": filtered['recent'][:limit]
+            "errors": store.errors,
+            "results": len(recent),
+            "response": recent
         }
         
     except HTTPException:
@@ -187,43 +145,66 @@ async def get_upcoming_matches(
             "league": league,
             "season": season
         }
+        store = await fixture_stores.get(league, season)
+        upcoming = store.upcoming(limit=limit)
         
-        response = requests.get(
-            f"{BASE_URL}/fixtures",
-            headers=headers,
-            params=api_params,
-            timeout=30
-        )
+        print(f"✅ Matchs à venir filtrés: {len(upcoming)}")
         
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Erreur API Football: {response.status_code}"
-            )
+        # Retourner seulement les matchs à venir
+        return {
+            "get": "fixtures",
+            "parameters": api_params,
+            "errors": store.errors,
+            "results": len(upcoming),
+            "response": upcoming
+        }
         
-        data = response.json()
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Erreur récupération matchs à venir: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/matches/by-date")
+async def get_matches_by_date(
+    league: int = Query(..., description="ID de la ligue"),
+    date: str = Query(..., description="Date (YYYY-MM-DD)"),
+    season: int = Query(2023, description="Année de la saison")
+):
+    """
+    Récupérer les matchs d'une date spécifique (ALTERNATIVE PLAN GRATUIT)
+    ⚠️ ENDPOINT DÉFINI AVANT /matches/{match_id} pour éviter la confusion
+    """
+    try:
+        print(f"📅 Récupération matchs du {date}: league={league}")
         
-        if "response" not in data:
-            return {"response": [], "get": "fixtures", "parameters": api_params}
+        api_params = {
+            "league": league,
+            "season": season,
+            "date": date  # Format: 2023-12-25
+        }
         
-        # Filtrer les matchs côté serveur
-        filtered = filter_matches_by_date(data["response"])
+        # Journée extraite de la saison indexée (même découpage UTC que le paramètre 'date' de l'API)
+        store = await fixture_stores.get(league, season)
+        try:
+            matches = store.on_date(date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Date invalide: {date} (format attendu: YYYY-MM-DD)")
         
-        print(f"✅ Matchs à venir filtrés: {len(filtered['upcoming'][:limit])}")
+        print(f"✅ Matchs du {date} récupérés: {len(matches)}")
         
-        # Retourner seulement les matchs à venir
         return {
             "get": "fixtures",
             "parameters": api_params,
-            "errors": data.get("errors", {}),
-            "results": len(filtered['upcoming'][:limit]),
-            "response": filtered['upcoming'][:limit]
+            "errors": store.errors,
+            "results": len(matches),
+            "response": matches
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Erreur récupération matchs à venir: {e}")
+        print(f"❌ Erreur récupération matchs par date: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # ============= ENDPOINT POUR DÉTAILS D'UN MATCH SPÉCIFIQUE =============
@@ -241,20 +222,7 @@ async def get_match_details(match_id: int):
         # Appel à l'API Football pour récupérer un match spécifique
         api_params = {"id": match_id}
         
-        response = requests.get(
-            f"{BASE_URL}/fixtures",
-            headers=headers,
-            params=api_params,
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Erreur API Football: {response.status_code}"
-            )
-        
-        data = response.json()
+        data = await load("fixtures", api_params)
         
         # Vérifier si le match existe
         if not data.get("response") or len(data["response"]) == 0:
@@ -278,116 +246,110 @@ async def get_match_details(match_id: int):
 
 # ============= AUTRES ENDPOINTS UTILITAIRES =============
 
-@router.get("/matches/by-date")
-async def get_matches_by_date(
-    league: int = Query(..., description="ID de la ligue"),
-    date: str = Query(..., description="Date (YYYY-MM-DD)"),
-    season: int = Query(2023, description="Année de la saison")
-):
+STREAM_BATCH_SIZE = 100
+
+def select_matches(store, filter_type: Optional[str], team: Optional[int],
+                   after: Optional[tuple], limit: Optional[int]):
     """
-    Récupérer les matchs d'une date spécifique (ALTERNATIVE PLAN GRATUIT)
-    ⚠️ ENDPOINT DÉFINI AVANT /matches/{match_id} pour éviter la confusion
+    Matchs du filtre demandé, strictement après le curseur, dans l'ordre du filtre
+    (limit + 1 éléments au plus pour savoir s'il reste une page)
     """
-    try:
-        print(f"📅 Récupération matchs du {date}: league={league}")
-        
-        # Utiliser le paramètre 'date' qui fonctionne en plan gratuit
-        api_params = {
-            "league": league,
-            "season": season,
-            "date": date  # Format: 2023-12-25
-        }
-        
-        response = requests.get(
-            f"{BASE_URL}/fixtures",
-            headers=headers,
-            params=api_params,
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Erreur API Football: {response.status_code}"
-            )
-        
-        data = response.json()
-        
-        print(f"✅ Matchs du {date} récupérés: {len(data.get('response', []))}")
-        
-        return data
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur récupération matchs par date: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if filter_type in ("recent", "upcoming", "live"):
+        if filter_type == "recent":
+            matches = store.recent(team_id=team)
+            descending = True
+        elif filter_type == "upcoming":
+            matches = store.upcoming(team_id=team)
+            descending = False
+        else:
+            matches = store.live(team_id=team)
+            descending = False
+        if after is not None:
+            matches = [match for match in matches
+                       if (fixture_key(match) < after if descending else fixture_key(match) > after)]
+        return matches[:limit + 1] if limit is not None else matches
+    
+    if limit is None and after is None:
+        # Sans pagination : toute la saison (ou toute l'équipe)
+        return store.by_team(team) if team is not None else store.all()
+    return store.page(after, (limit + 1) if limit is not None else len(store), team_id=team)
+
+async def stream_matches(store, filter_type: Optional[str], team: Optional[int], after: Optional[tuple]):
+    """NDJSON : un match par ligne, envoyé par lots sans construire la réponse complète"""
+    if filter_type in ("recent", "upcoming", "live"):
+        matches = select_matches(store, filter_type, team, after, None)
+        for start in range(0, len(matches), STREAM_BATCH_SIZE):
+            yield b"".join(dumps(match) + b"\n" for match in matches[start:start + STREAM_BATCH_SIZE])
+        return
+    while True:
+        batch = store.page(after, STREAM_BATCH_SIZE, team_id=team)
+        if not batch:
+            return
+        yield b"".join(dumps(match) + b"\n" for match in batch)
+        after = fixture_key(batch[-1])
+        await asyncio.sleep(0)
 
 @router.get("/matches")
+@memoized_response("matches")
 async def get_matches_optimized(
     league: int = Query(..., description="ID de la ligue"),
     season: int = Query(2023, description="Année de la saison"),
-    filter_type: Optional[str] = Query("all", description="Type de filtre: all, recent, upcoming, live")
+    filter_type: Optional[str] = Query("all", description="Type de filtre: all, recent, upcoming, live"),
+    team: Optional[int] = Query(None, description="ID d'équipe (optionnel)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Taille de page (pagination par curseur)"),
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé dans paging.next_cursor"),
+    stream: bool = Query(False, description="Diffuser les matchs en NDJSON (un match par ligne)")
 ):
     """
     Endpoint optimisé pour le plan gratuit
-    Récupère tous les matchs puis filtre côté serveur
+    Récupère tous les matchs puis filtre côté serveur via les index de la saison
+    Pagination par curseur (coup d'envoi + id) avec limit/cursor, ou diffusion NDJSON avec stream=true
     ⚠️ ENDPOINT DÉFINI AVANT /matches/{match_id} pour éviter la confusion
     """
     try:
         print(f"🎯 Récupération matchs optimisés: league={league}, filter={filter_type}")
         
-        # UN SEUL APPEL API pour récupérer tous les matchs
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        # UN SEUL APPEL API pour récupérer tous les matchs (indexés en mémoire)
         api_params = {
             "league": league,
             "season": season
         }
+        store = await fixture_stores.get(league, season)
         
-        response = requests.get(
-            f"{BASE_URL}/fixtures",
-            headers=headers,
-            params=api_params,
-            timeout=30
-        )
-        
-        if response.status_code != 200:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Erreur API Football: {response.status_code}"
-            )
-        
-        data = response.json()
-        
-        if "response" not in data:
-            return {"response": [], "get": "fixtures", "parameters": api_params}
+        if stream:
+            return StreamingResponse(stream_matches(store, filter_type, team, after),
+                                     media_type="application/x-ndjson")
         
         # Filtrer selon le type demandé
-        if filter_type == "all":
-            # Retourner tous les matchs
-            filtered_response = data["response"]
-        else:
-            # Filtrer par type
-            filtered = filter_matches_by_date(data["response"])
-            
-            if filter_type == "recent":
-                filtered_response = filtered['recent']
-            elif filter_type == "upcoming":
-                filtered_response = filtered['upcoming']
-            elif filter_type == "live":
-                filtered_response = filtered['live']
-            else:
-                filtered_response = data["response"]
+        filtered_response = select_matches(store, filter_type, team, after, limit)
+        
+        paging = None
+        if limit is not None or cursor is not None:
+            has_more = limit is not None and len(filtered_response) > limit
+            filtered_response = filtered_response[:limit] if limit is not None else filtered_response
+            paging = {
+                "limit": limit,
+                "next_cursor": encode_cursor(filtered_response[-1]) if has_more else None
+            }
         
         print(f"✅ Matchs filtrés ({filter_type}): {len(filtered_response)}")
         
-        return {
+        result = {
             "get": "fixtures",
             "parameters": api_params,
-            "errors": data.get("errors", {}),
+            "errors": store.errors,
             "results": len(filtered_response),
             "response": filtered_response,
             "filter_applied": filter_type
         }
+        if paging is not None:
+            result["paging"] = paging
+        return result
         
     except HTTPException:
         raise
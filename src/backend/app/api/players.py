@@ -3,38 +3,14 @@
 from fastapi import APIRouter, HTTPException, Query
 from datetime import datetime
 from typing import Optional
-import requests
-from app.config.settings import settings
+from app.services.upstream import make_api_request
+from app.services.search_index import search_indexes, fold, player_doc, with_fuzzy
+from app.services.metrics import metrics_engine
+from app.services.squads import cached_squad_players
+from app.services import request_context
 
 router = APIRouter(prefix="/players", tags=["players"])
 
-# Configuration API Football (même que dans teams.py)
-BASE_URL = "https://v3.football.api-sports.io"
-headers = {
-    "X-RapidAPI-Key": settings.football_api_key,
-    "X-RapidAPI-Host": "v3.football.api-sports.io"
-}
-
-async def make_api_request(endpoint: str, params: dict):
-    """Fonction utilitaire pour les appels API (même que teams.py)"""
-    try:
-        response = requests.get(
-            f"{BASE_URL}/{endpoint}",
-            headers=headers,
-            params=params,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"❌ Erreur API {endpoint}: {response.status_code}")
-            return {"response": []}
-            
-    except Exception as e:
-        print(f"❌ Exception API {endpoint}: {e}")
-        return {"response": []}
-
 @router.get("/{player_id}/details")
 async def get_player_details(
     player_id: int,
@@ -87,111 +63,12 @@ async def get_player_details(
             "red_cards": cards.get("red", 0)
         }
         
-        # 4. Statistiques calculées
-        calculated_stats = {}
-        if performance["appearances"] > 0:
-            appearances = performance["appearances"]
-            calculated_stats = {
-                "goals_per_match": round(performance["goals"] / appearances, 2),
-                "assists_per_match": round(performance["assists"] / appearances, 2),
-                "minutes_per_match": round(performance["minutes"] / appearances, 0) if performance["minutes"] else 0,
-                "goal_contribution": performance["goals"] + performance["assists"]
-            }
-        
-        # 5. Construire la réponse complète
-        result = {
-            "id": player["id"],
-            "name": player["name"],
-            "firstname": player.get("firstname"),
-            "lastname": player.get("lastname"),
-            "age": player.get("age"),
-            "birth_date": player.get("birth", {}).get("date"),
-            "birth_place": player.get("birth", {}).get("place"),
-            "birth_country": player.get("birth", {}).get("country"),
-            "nationality": player.get("nationality"),
-            "height": player.get("height"),
-            "weight": player.get("weight"),
-            "injured": player.get("injured", False),
-            "photo": player.get("photo"),
-            "current_team": current_team,
-            "performance": performance,
-            "calculated_stats": calculated_stats,
-            "season": season,
-            "league": league,
-            "last_update": datetime.now().isoformat()
-        }
-        
-        print(f"✅ Détails joueur {player['name']} récupérés")
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"❌ Erreur détails joueur {player_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération: {str(e)}")
-
-@router.get("/{player_id}/details")
-async def get_player_details(
-    player_id: int,
-    league: int = Query(61, description="ID de la ligue"), 
-    season: int = Query(2023, description="Année de la saison")
-):
-    """
-    Récupérer les détails complets d'un joueur avec ses statistiques
-    """
-    try:
-        print(f"👤 Récupération détails joueur {player_id}")
-        
-        # 1. Récupérer les statistiques du joueur pour la saison
-        player_stats = await make_api_request("players", {
-            "id": player_id,
-            "league": league,
-            "season": season
-        })
-        
-        if not player_stats.get("response") or len(player_stats["response"]) == 0:
-            raise HTTPException(status_code=404, detail="Joueur non trouvé")
-        
-        player_data = player_stats["response"][0]
-        player = player_data["player"]
-        statistics = player_data.get("statistics", [{}])[0] if player_data.get("statistics") else {}
-        
-        # 2. Informations de l'équipe actuelle
-        current_team = None
-        if statistics.get("team"):
-            current_team = {
-                "id": statistics["team"]["id"],
-                "name": statistics["team"]["name"],
-                "logo": statistics["team"]["logo"]
-            }
-        
-        # 3. Statistiques de performance
-        games = statistics.get("games", {})
-        goals_stats = statistics.get("goals", {})
-        cards = statistics.get("cards", {})
-        
-        performance = {
-            "position": games.get("position"),
-            "appearances": games.get("appearences", 0),
-            "minutes": games.get("minutes", 0),
-            "rating": games.get("rating"),
-            "captain": games.get("captain", False),
-            "goals": goals_stats.get("total", 0),
-            "assists": goals_stats.get("assists", 0),
-            "yellow_cards": cards.get("yellow", 0),
-            "red_cards": cards.get("red", 0)
-        }
-        
-        # 4. Statistiques calculées
-        calculated_stats = {}
-        if performance["appearances"] > 0:
-            appearances = performance["appearances"]
-            calculated_stats = {
-                "goals_per_match": round(performance["goals"] / appearances, 2),
-                "assists_per_match": round(performance["assists"] / appearances, 2),
-                "minutes_per_match": round(performance["minutes"] / appearances, 0) if performance["minutes"] else 0,
-                "goal_contribution": performance["goals"] + performance["assists"]
-            }
+        # 4. Statistiques calculées : parts de l'équipe seulement si l'effectif
+        # complet est déjà en cache (pas d'appels upstream pour une fiche)
+        squad_items = await cached_squad_players(current_team["id"], league, season) if current_team else None
+        if squad_items is None:
+            request_context.mark_uncacheable()  # Parts à None : ne pas figer cette réponse côté client
+        calculated_stats = metrics_engine.player(player_data, league, season, squad_items)
         
         # 5. Construire la réponse complète
         result = {
@@ -330,48 +207,26 @@ async def search_players(
     league: Optional[int] = Query(None, description="ID de la ligue pour filtrer")
 ):
     """
-    Rechercher des joueurs par nom
+    Rechercher des joueurs par nom : index local d'abord (dès 1 caractère,
+    sans accents), API si l'index n'a aucune correspondance exacte ou par
+    préfixe ; les correspondances approchées ne font que compléter la liste
     """
     try:
         print(f"🔍 Recherche joueurs: {q}")
         
-        search_params = {"search": q}
-        if league:
-            search_params["league"] = league
-            search_params["season"] = 2023
-            
-        players_data = await make_api_request("players", search_params)
-        
-        players = []
-        if players_data.get("response"):
-            for player_item in players_data["response"][:20]:  # Limite à 20 résultats
-                player = player_item["player"]
-                statistics = player_item.get("statistics", [{}])[0] if player_item.get("statistics") else {}
-                
-                # Équipe actuelle
-                current_team = None
-                if statistics.get("team"):
-                    current_team = {
-                        "id": statistics["team"]["id"],
-                        "name": statistics["team"]["name"],
-                        "logo": statistics["team"]["logo"]
-                    }
+        accept = (lambda entry: any(context[0] == league for context in entry.contexts)) if league else None
+        players, fuzzy = search_indexes.players.lookup(q, accept=accept)
+        if not players and len(fold(q)) >= 3:  # L'API exige au moins 3 caractères
+            search_params = {"search": q}
+            if league:
+                search_params["league"] = league
+                search_params["season"] = 2023
                 
-                player_result = {
-                    "id": player["id"],
-                    "name": player["name"],
-                    "age": player.get("age"),
-                    "nationality": player.get("nationality"),
-                    "photo": player.get("photo"),
-                    "current_team": current_team,
-                    "performance": {
-                        "position": statistics.get("games", {}).get("position"),
-                        "goals": statistics.get("goals", {}).get("total", 0),
-                        "assists": statistics.get("goals", {}).get("assists", 0),
-                        "appearances": statistics.get("games", {}).get("appearences", 0)
-                    } if statistics else None
-                }
-                players.append(player_result)
+            players_data = await make_api_request("players", search_params)
+            # Limite à 20 résultats
+            players = with_fuzzy([player_doc(player_item) for player_item in players_data.get("response", [])[:20]], fuzzy)
+        else:
+            players = players + fuzzy
         
         return {
             "query": q,
@@ -1,50 +1,188 @@
 # backend/app/api/teams.py - VERSION ENRICHIE AVEC STATISTIQUES
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-import requests
+from typing import Optional, Set
 from datetime import datetime
-from app.config.settings import settings
+from app.services.upstream import gateway, make_api_request
+from app.services.planner import UpstreamPlan
+from app.services.response_cache import memoized_response
+from app.services import request_context
+from app.services.search_index import search_indexes, fold, team_doc, with_fuzzy
+from app.services.metrics import metrics_engine, team_metrics
+from app.services.squads import build_detailed_player, fetch_squad_players
 
 router = APIRouter(prefix="/teams", tags=["teams"])
 
-# Configuration API Football
-BASE_URL = "https://v3.football.api-sports.io"
-headers = {
-    "X-RapidAPI-Key": settings.football_api_key,
-    "X-RapidAPI-Host": "v3.football.api-sports.io"
-}
+def add_team_statistics_calls(plan: UpstreamPlan, team_id: int, league: int, season: int) -> UpstreamPlan:
+    """Appels upstream nécessaires aux statistiques d'une équipe (tous indépendants)"""
+    # 1. Statistiques d'équipe principales
+    plan.add("team_stats", "teams/statistics", {
+        "team": team_id,
+        "league": league,
+        "season": season
+    })
+    
+    # 2. Classement pour contexte
+    plan.add("standings", "standings", {
+        "league": league,
+        "season": season
+    })
+    
+    # 3. Matchs récents pour la forme
+    plan.add("fixtures", "fixtures", {
+        "team": team_id,
+        "league": league,
+        "season": season,
+        "last": 10
+    })
+    
+    # 4. Meilleurs buteurs de l'équipe
+    plan.add("top_scorers", "players/topscorers", {
+        "team": team_id,
+        "league": league,
+        "season": season
+    })
+    return plan
 
-async def make_api_request(endpoint: str, params: dict):
-    """Fonction utilitaire pour les appels API avec retry automatique - AMÉLIORÉE"""
-    try:
-        print(f"🔍 API Call: {endpoint} avec params: {params}")
-        
-        response = requests.get(
-            f"{BASE_URL}/{endpoint}",
-            headers=headers,
-            params=params,
-            timeout=30
-        )
-        
-        print(f"📡 Response status: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Response OK - {len(data.get('response', []))} items")
-            return data
-        elif response.status_code == 429:
-            print("⚠️ Rate limit atteint - attendre")
-            raise HTTPException(status_code=429, detail="Rate limit API atteint")
-        else:
-            print(f"❌ Erreur API {endpoint}: {response.status_code}")
-            return {"response": []}
+def build_team_statistics(team_id: int, league: int, season: int, results: dict) -> dict:
+    """Construire les statistiques enrichies à partir des réponses du plan"""
+    team_stats = results["team_stats"]
+    standings = results["standings"]
+    fixtures = results["fixtures"]
+    top_scorers = results["top_scorers"]
+    
+    # Construire la réponse enrichie
+    result = {
+        "team_id": team_id,
+        "league": league,
+        "season": season,
+        "last_update": datetime.now().isoformat(),
+    }
+    
+    # Traitement des statistiques principales
+    if team_stats.get("response"):
+        stats = team_stats["response"]
+        
+        # Statistiques générales
+        result["general_stats"] = {
+            "matches_played": stats.get("fixtures", {}).get("played", {}).get("total", 0),
+            "wins": stats.get("fixtures", {}).get("wins", {}).get("total", 0),
+            "draws": stats.get("fixtures", {}).get("draws", {}).get("total", 0),
+            "losses": stats.get("fixtures", {}).get("loses", {}).get("total", 0),
+            "goals_for": stats.get("goals", {}).get("for", {}).get("total", {}).get("total", 0),
+            "goals_against": stats.get("goals", {}).get("against", {}).get("total", {}).get("total", 0),
+        }
+        
+        # Performance domicile/extérieur
+        result["home_away_stats"] = {
+            "home": {
+                "played": stats.get("fixtures", {}).get("played", {}).get("home", 0),
+                "wins": stats.get("fixtures", {}).get("wins", {}).get("home", 0),
+                "draws": stats.get("fixtures", {}).get("draws", {}).get("home", 0),
+                "losses": stats.get("fixtures", {}).get("loses", {}).get("home", 0),
+                "goals_for": stats.get("goals", {}).get("for", {}).get("total", {}).get("home", 0),
+                "goals_against": stats.get("goals", {}).get("against", {}).get("total", {}).get("home", 0),
+            },
+            "away": {
+                "played": stats.get("fixtures", {}).get("played", {}).get("away", 0),
+                "wins": stats.get("fixtures", {}).get("wins", {}).get("away", 0),
+                "draws": stats.get("fixtures", {}).get("draws", {}).get("away", 0),
+                "losses": stats.get("fixtures", {}).get("loses", {}).get("away", 0),
+                "goals_for": stats.get("goals", {}).get("for", {}).get("total", {}).get("away", 0),
+                "goals_against": stats.get("goals", {}).get("against", {}).get("total", {}).get("away", 0),
+            }
+        }
+        
+        # Statistiques avancées
+        result["advanced_stats"] = {
+            "biggest_wins": {
+                "home": stats.get("biggest", {}).get("wins", {}).get("home"),
+                "away": stats.get("biggest", {}).get("wins", {}).get("away")
+            },
+            "biggest_losses": {
+                "home": stats.get("biggest", {}).get("loses", {}).get("home"),
+                "away": stats.get("biggest", {}).get("loses", {}).get("away")
+            },
+            "clean_sheets": {
+                "home": stats.get("clean_sheet", {}).get("home", 0),
+                "away": stats.get("clean_sheet", {}).get("away", 0),
+                "total": stats.get("clean_sheet", {}).get("total", 0)
+            },
+            "failed_to_score": {
+                "home": stats.get("failed_to_score", {}).get("home", 0),
+                "away": stats.get("failed_to_score", {}).get("away", 0),
+                "total": stats.get("failed_to_score", {}).get("total", 0)
+            }
+        }
+    
+    # Traitement du classement
+    if standings.get("response"):
+        for standing_group in standings["response"]:
+            for team_standing in standing_group["league"]["standings"][0]:
+                if team_standing["team"]["id"] == team_id:
+                    result["league_position"] = {
+                        "position": team_standing["rank"],
+                        "points": team_standing["points"],
+                        "goal_diff": team_standing["goalsDiff"],
+                        "form": team_standing["form"],
+                        "description": team_standing["description"]
+                    }
+                    break
+    
+    # Traitement de la forme récente (5 derniers matchs)
+    if fixtures.get("response"):
+        recent_form = []
+        for match in fixtures["response"][-5:]:  # 5 derniers matchs
+            team_goals = 0
+            opponent_goals = 0
             
-    except requests.exceptions.Timeout:
-        print(f"⏰ Timeout API {endpoint}")
-        return {"response": []}
-    except Exception as e:
-        print(f"❌ Exception API {endpoint}: {e}")
-        return {"response": []}
+            if match["teams"]["home"]["id"] == team_id:
+                team_goals = match["goals"]["home"] or 0
+                opponent_goals = match["goals"]["away"] or 0
+            else:
+                team_goals = match["goals"]["away"] or 0
+                opponent_goals = match["goals"]["home"] or 0
+            
+            if team_goals > opponent_goals:
+                result_char = "W"
+            elif team_goals < opponent_goals:
+                result_char = "L"
+            else:
+                result_char = "D"
+            
+            recent_form.append({
+                "result": result_char,
+                "score": f"{team_goals}-{opponent_goals}",
+                "opponent": match["teams"]["away"]["name"] if match["teams"]["home"]["id"] == team_id else match["teams"]["home"]["name"],
+                "date": match["fixture"]["date"]
+            })
+        
+        result["recent_form"] = recent_form
+    
+    # Traitement des meilleurs buteurs
+    if top_scorers.get("response"):
+        result["top_scorers"] = []
+        for scorer in top_scorers["response"][:5]:  # Top 5
+            player = scorer["player"]
+            stats_data = scorer["statistics"][0] if scorer.get("statistics") else {}
+            
+            result["top_scorers"].append({
+                "id": player["id"],
+                "name": player["name"],
+                "photo": player.get("photo"),
+                "age": player.get("age"),
+                "nationality": player.get("nationality"),
+                "goals": stats_data.get("goals", {}).get("total", 0),
+                "assists": stats_data.get("goals", {}).get("assists", 0),
+                "matches": stats_data.get("games", {}).get("appearences", 0),
+                "position": stats_data.get("games", {}).get("position")
+            })
+    
+    # Calcul de métriques personnalisées
+    general = result.get("general_stats", {})
+    if general.get("matches_played", 0) > 0:
+        result["calculated_metrics"] = team_metrics(general)
+    
+    return result
 
 @router.get("/{team_id}/statistics")
 async def get_team_statistics(
@@ -59,171 +197,9 @@ async def get_team_statistics(
     try:
         print(f"📊 Récupération statistiques équipe {team_id} - Ligue {league}, Saison {season}")
         
-        # 1. Statistiques d'équipe principales
-        team_stats = await make_api_request("teams/statistics", {
-            "team": team_id,
-            "league": league,
-            "season": season
-        })
-        
-        # 2. Classement pour contexte
-        standings = await make_api_request("standings", {
-            "league": league,
-            "season": season
-        })
-        
-        # 3. Matchs récents pour la forme
-        fixtures = await make_api_request("fixtures", {
-            "team": team_id,
-            "league": league,
-            "season": season,
-            "last": 10
-        })
-        
-        # 4. Meilleurs buteurs de l'équipe
-        top_scorers = await make_api_request("players/topscorers", {
-            "team": team_id,
-            "league": league,
-            "season": season
-        })
-        
-        # Construire la réponse enrichie
-        result = {
-            "team_id": team_id,
-            "league": league,
-            "season": season,
-            "last_update": datetime.now().isoformat(),
-        }
-        
-        # Traitement des statistiques principales
-        if team_stats.get("response"):
-            stats = team_stats["response"]
-            
-            # Statistiques générales
-            result["general_stats"] = {
-                "matches_played": stats.get("fixtures", {}).get("played", {}).get("total", 0),
-                "wins": stats.get("fixtures", {}).get("wins", {}).get("total", 0),
-                "draws": stats.get("fixtures", {}).get("draws", {}).get("total", 0),
-                "losses": stats.get("fixtures", {}).get("loses", {}).get("total", 0),
-                "goals_for": stats.get("goals", {}).get("for", {}).get("total", {}).get("total", 0),
-                "goals_against": stats.get("goals", {}).get("against", {}).get("total", {}).get("total", 0),
-            }
-            
-            # Performance domicile/extérieur
-            result["home_away_stats"] = {
-                "home": {
-                    "played": stats.get("fixtures", {}).get("played", {}).get("home", 0),
-                    "wins": stats.get("fixtures", {}).get("wins", {}).get("home", 0),
-                    "draws": stats.get("fixtures", {}).get("draws", {}).get("home", 0),
-                    "losses": stats.get("fixtures", {}).get("loses", {}).get("home", 0),
-                    "goals_for": stats.get("goals", {}).get("for", {}).get("total", {}).get("home", 0),
-                    "goals_against": stats.get("goals", {}).get("against", {}).get("total", {}).get("home", 0),
-                },
-                "away": {
-                    "played": stats.get("fixtures", {}).get("played", {}).get("away", 0),
-                    "wins": stats.get("fixtures", {}).get("wins", {}).get("away", 0),
-                    "draws": stats.get("fixtures", {}).get("draws", {}).get("away", 0),
-                    "losses": stats.get("fixtures", {}).get("loses", {}).get("away", 0),
-                    "goals_for": stats.get("goals", {}).get("for", {}).get("total", {}).get("away", 0),
-                    "goals_against": stats.get("goals", {}).get("against", {}).get("total", {}).get("away", 0),
-                }
-            }
-            
-            # Statistiques avancées
-            result["advanced_stats"] = {
-                "biggest_wins": {
-                    "home": stats.get("biggest", {}).get("wins", {}).get("home"),
-                    "away": stats.get("biggest", {}).get("wins", {}).get("away")
-                },
-                "biggest_losses": {
-                    "home": stats.get("biggest", {}).get("loses", {}).get("home"),
-                    "away": stats.get("biggest", {}).get("loses", {}).get("away")
-                },
-                "clean_sheets": {
-                    "home": stats.get("clean_sheet", {}).get("home", 0),
-                    "away": stats.get("clean_sheet", {}).get("away", 0),
-                    "total": stats.get("clean_sheet", {}).get("total", 0)
-                },
-                "failed_to_score": {
-                    "home": stats.get("failed_to_score", {}).get("home", 0),
-                    "away": stats.get("failed_to_score", {}).get("away", 0),
-                    "total": stats.get("failed_to_score", {}).get("total", 0)
-                }
-            }
-        
-        # Traitement du classement
-        if standings.get("response"):
-            for standing_group in standings["response"]:
-                for team_standing in standing_group["league"]["standings"][0]:
-                    if team_standing["team"]["id"] == team_id:
-                        result["league_position"] = {
-                            "position": team_standing["rank"],
-                            "points": team_standing["points"],
-                            "goal_diff": team_standing["goalsDiff"],
-                            "form": team_standing["form"],
-                            "description": team_standing["description"]
-                        }
-                        break
-        
-        # Traitement de la forme récente (5 derniers matchs)
-        if fixtures.get("response"):
-            recent_form = []
-            for match in fixtures["response"][-5:]:  # 5 derniers matchs
-                team_goals = 0
-                opponent_goals = 0
-                
-                if match["teams"]["home"]["id"] == team_id:
-                    team_goals = match["goals"]["home"] or 0
-                    opponent_goals = match["goals"]["away"] or 0
-                else:
-                    team_goals = match["goals"]["away"] or 0
-                    opponent_goals = match["goals"]["home"] or 0
-                
-                if team_goals > opponent_goals:
-                    result_char = "W"
-                elif team_goals < opponent_goals:
-                    result_char = "L"
-                else:
-                    result_char = "D"
-                
-                recent_form.append({
-                    "result": result_char,
-                    "score": f"{team_goals}-{opponent_goals}",
-                    "opponent": match["teams"]["away"]["name"] if match["teams"]["home"]["id"] == team_id else match["teams"]["home"]["name"],
-                    "date": match["fixture"]["date"]
-                })
-            
-            result["recent_form"] = recent_form
-        
-        # Traitement des meilleurs buteurs
-        if top_scorers.get("response"):
-            result["top_scorers"] = []
-            for scorer in top_scorers["response"][:5]:  # Top 5
-                player = scorer["player"]
-                stats_data = scorer["statistics"][0] if scorer.get("statistics") else {}
-                
-                result["top_scorers"].append({
-                    "id": player["id"],
-                    "name": player["name"],
-                    "photo": player.get("photo"),
-                    "age": player.get("age"),
-                    "nationality": player.get("nationality"),
-                    "goals": stats_data.get("goals", {}).get("total", 0),
-                    "assists": stats_data.get("goals", {}).get("assists", 0),
-                    "matches": stats_data.get("games", {}).get("appearences", 0),
-                    "position": stats_data.get("games", {}).get("position")
-                })
-        
-        # Calcul de métriques personnalisées
-        general = result.get("general_stats", {})
-        if general.get("matches_played", 0) > 0:
-            result["calculated_metrics"] = {
-                "win_percentage": round((general.get("wins", 0) / general["matches_played"]) * 100, 1),
-                "goals_per_match": round(general.get("goals_for", 0) / general["matches_played"], 2),
-                "goals_conceded_per_match": round(general.get("goals_against", 0) / general["matches_played"], 2),
-                "goal_difference": general.get("goals_for", 0) - general.get("goals_against", 0),
-                "points_projection": round((general.get("wins", 0) * 3 + general.get("draws", 0)) / general["matches_played"] * 38, 0) if general["matches_played"] > 0 else 0
-            }
+        # Les 4 appels sont indépendants : ils partent en parallèle
+        results = await add_team_statistics_calls(UpstreamPlan(), team_id, league, season).run()
+        result = build_team_statistics(team_id, league, season, results)
         
         print(f"✅ Statistiques complètes récupérées pour l'équipe {team_id}")
         return result
@@ -246,70 +222,18 @@ async def get_team_players_detailed(
     try:
         print(f"👥 Récupération joueurs détaillés équipe {team_id}")
         
-        # Appel pour les joueurs avec statistiques
-        players_data = await make_api_request("players", {
-            "team": team_id,
-            "league": league,
-            "season": season
-        })
+        # Joueurs avec statistiques, toutes pages comprises
+        player_items = await fetch_squad_players(team_id, league, season)
         
-        if not players_data.get("response"):
+        if not player_items:
             return {"players": [], "total": 0}
         
-        detailed_players = []
-        
-        for player_item in players_data["response"]:
-            player = player_item["player"]
-            statistics = player_item.get("statistics", [{}])[0] if player_item.get("statistics") else {}
-            
-            # Statistiques de jeu
-            games = statistics.get("games", {})
-            goals_stats = statistics.get("goals", {})
-            cards = statistics.get("cards", {})
-            
-            player_data = {
-                "id": player["id"],
-                "name": player["name"],
-                "age": player.get("age"),
-                "nationality": player.get("nationality"),
-                "height": player.get("height"),
-                "weight": player.get("weight"),
-                "photo": player.get("photo"),
-                "injured": player.get("injured", False),
-                
-                # Statistiques de performance - CORRECTION ICI
-                "performance": {
-                    "position": games.get("position"),
-                    "appearances": games.get("appearences", 0) or 0,  # ← CORRIGER
-                    "minutes": games.get("minutes", 0) or 0,
-                    "rating": games.get("rating"),
-                    "captain": games.get("captain", False),
-                    
-                    # Buts et passes
-                    "goals": goals_stats.get("total", 0) or 0,
-                    "assists": goals_stats.get("assists", 0) or 0,
-                    "saves": goals_stats.get("saves", 0) or 0,
-                    
-                    # Cartons
-                    "yellow_cards": cards.get("yellow", 0) or 0,
-                    "red_cards": cards.get("red", 0) or 0,
-                },
-                
-                # Calculs personnalisés
-                "calculated_stats": {}
-            }
-            
-            # CORRECTION : Vérifier que appearances n'est pas None
-            appearances = player_data["performance"]["appearances"]
-            if appearances and appearances > 0:  # ← CORRIGER ICI
-                player_data["calculated_stats"] = {
-                    "goals_per_match": round(player_data["performance"]["goals"] / appearances, 2),
-                    "assists_per_match": round(player_data["performance"]["assists"] / appearances, 2),
-                    "minutes_per_match": round(player_data["performance"]["minutes"] / appearances, 0) if player_data["performance"]["minutes"] else 0,
-                    "goal_contribution": player_data["performance"]["goals"] + player_data["performance"]["assists"]
-                }
-            
-            detailed_players.append(player_data)
+        # Métriques de tout l'effectif en une passe (mémorisées par équipe/ligue/saison)
+        squad_metrics = metrics_engine.squad(team_id, league, season, player_items)
+        detailed_players = [
+            build_detailed_player(player_item, calculated_stats)
+            for player_item, calculated_stats in zip(player_items, squad_metrics)
+        ]
         
         # Trier par nombre d'apparitions (avec gestion des None)
         detailed_players.sort(key=lambda x: x["performance"]["appearances"] or 0, reverse=True)
@@ -328,37 +252,97 @@ async def get_team_players_detailed(
         print(f"❌ Erreur joueurs détaillés équipe {team_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur lors de la récupération des joueurs: {str(e)}")
 
-@router.get("/{team_id}/complete")
-async def get_team_complete_profile(
-    team_id: int,
-    league: int = Query(61, description="ID de la ligue"), 
-    season: int = Query(2023, description="Année de la saison")
-):
+# Sections optionnelles du profil d'équipe (include=) et champs de réponse associés (fields=)
+PROFILE_SECTIONS = {
+    "standing": ["current_season"],
+    "statistics": ["detailed_statistics"],
+    "players": ["players", "players_count"],
+}
+PROFILE_BASE_FIELDS = ["id", "name", "logo", "country", "code", "founded", "national", "venue", "last_update", "debug_info"]
+
+def parse_profile_sections(include: Optional[str], fields: Optional[str]) -> Set[str]:
     """
-    Endpoint combiné pour récupérer TOUTES les informations d'une équipe
-    Combine les détails de base + statistiques + joueurs
+    Sections à construire : toutes par défaut, sinon celles demandées par
+    include= ou nécessaires aux champs demandés par fields=
     """
-    try:
-        print(f"🔥 Profil complet équipe {team_id} - Ligue {league}, Saison {season}")
-        
-        # 1. Détails de base de l'équipe
-        team_data = await make_api_request("teams", {"id": team_id})
-        
-        if not team_data.get("response"):
-            raise HTTPException(status_code=404, detail="Équipe non trouvée")
-        
-        team_info = team_data["response"][0]
-        team = team_info["team"]
-        venue = team_info.get("venue", {})
-        
-        print(f"✅ Équipe trouvée: {team['name']}")
-        
-        # 2. CLASSEMENT pour obtenir la VRAIE position
-        print(f"🏆 Récupération classement ligue {league}")
-        standings_data = await make_api_request("standings", {
+    if not include and not fields:
+        return set(PROFILE_SECTIONS)
+    
+    sections = set()
+    for name in filter(None, (part.strip() for part in (include or "").split(","))):
+        if name not in PROFILE_SECTIONS:
+            raise HTTPException(status_code=400, detail=f"Section inconnue: {name} (valeurs: {', '.join(PROFILE_SECTIONS)})")
+        sections.add(name)
+    
+    for field in filter(None, (part.strip() for part in (fields or "").split(","))):
+        section = next((name for name, keys in PROFILE_SECTIONS.items() if field in keys), None)
+        if section:
+            sections.add(section)
+        elif field not in PROFILE_BASE_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Champ inconnu: {field}")
+    return sections
+
+async def build_team_profile(team_id: int, league: int, season: int, sections: Set[str]) -> dict:
+    """
+    Profil d'équipe limité aux sections demandées : les appels upstream des
+    sections non demandées ne sont pas planifiés
+    """
+    # Appels indépendants : un seul plan exécuté en parallèle
+    # (le classement est partagé avec les statistiques détaillées)
+    plan = UpstreamPlan()
+    plan.add("team", "teams", {"id": team_id})
+    if "standing" in sections:
+        plan.add("standings", "standings", {
             "league": league,
             "season": season
         })
+    if "statistics" in sections:
+        add_team_statistics_calls(plan, team_id, league, season)
+    if "players" in sections:
+        plan.add("players", "players", {
+            "team": team_id,
+            "league": league,
+            "season": season
+        })
+    results = await plan.run()
+    
+    # 1. Détails de base de l'équipe
+    team_data = results["team"]
+    
+    if not team_data.get("response"):
+        raise HTTPException(status_code=404, detail="Équipe non trouvée")
+    
+    team_info = team_data["response"][0]
+    team = team_info["team"]
+    venue = team_info.get("venue", {})
+    
+    print(f"✅ Équipe trouvée: {team['name']}")
+    
+    profile = {
+        # Informations de base
+        "id": team["id"],
+        "name": team["name"],
+        "logo": team["logo"],
+        "country": team["country"],
+        "code": team.get("code"),
+        "founded": team.get("founded"),
+        "national": team.get("national", False),
+        
+        # Informations du stade
+        "venue": {
+            "name": venue.get("name"),
+            "city": venue.get("city"),
+            "capacity": venue.get("capacity"),
+            "surface": venue.get("surface"),
+            "address": venue.get("address"),
+            "image": venue.get("image")
+        } if venue else None,
+    }
+    debug_info = {"sections": sorted(sections)}
+    
+    # 2. CLASSEMENT pour obtenir la VRAIE position
+    if "standing" in sections:
+        standings_data = results["standings"]
         
         current_position = None
         standing_stats = {}
@@ -385,37 +369,40 @@ async def get_team_complete_profile(
         
         print(f"📊 Position trouvée: {current_position}")
         
-        # 3. STATISTIQUES DÉTAILLÉES (optionnel)
-        try:
-            stats_response = await get_team_statistics(team_id, league, season)
-        except:
-            stats_response = {"error": "Statistiques non disponibles"}
-        
-        # 4. JOUEURS PRINCIPAUX - AVEC DEBUG
-        print(f"👥 DÉBUT Debug récupération joueurs équipe {team_id}")
-        print(f"🧪 DEBUG: Tentative récupération joueurs pour team={team_id}, league={league}, season={season}")
-        
-        players_data = await make_api_request("players", {
-            "team": team_id,
+        # STRUCTURE current_season
+        profile["current_season"] = {
             "league": league,
-            "season": season
-        })
-        
-        # DEBUG LOGS DÉTAILLÉS
-        print(f"🧪 DEBUG: Réponse players_data keys: {list(players_data.keys()) if players_data else 'None'}")
+            "season": season,
+            "position": current_position,
+            "points": standing_stats.get("points", 0),
+            "matches_played": standing_stats.get("matches_played", 0),
+            "wins": standing_stats.get("wins", 0),
+            "draws": standing_stats.get("draws", 0),
+            "losses": standing_stats.get("losses", 0),
+            "goals_for": standing_stats.get("goals_for", 0),
+            "goals_against": standing_stats.get("goals_against", 0),
+            "goal_difference": standing_stats.get("goal_difference", 0),
+            "form": standing_stats.get("form", "")
+        }
+    
+    # 3. STATISTIQUES DÉTAILLÉES (optionnel)
+    if "statistics" in sections:
+        try:
+            profile["detailed_statistics"] = build_team_statistics(team_id, league, season, results)
+        except Exception:
+            profile["detailed_statistics"] = {"error": "Statistiques non disponibles"}
+    
+    # 4. JOUEURS PRINCIPAUX
+    if "players" in sections:
+        players_data = results["players"]
         print(f"🧪 DEBUG: Response items: {len(players_data.get('response', [])) if players_data else 0}")
-        print(f"🧪 DEBUG: Raw response (first 300 chars): {str(players_data)[:300]}")
         
-        if players_data.get("response"):
-            if players_data['response']:
-                first_player = players_data['response'][0]
-                
         simplified_players = []
         if players_data.get("response"):
             print(f"👥 {len(players_data['response'])} joueurs trouvés - Traitement en cours...")
             
             # Prendre les 20 premiers joueurs avec statistiques
-            for i, player_item in enumerate(players_data["response"][:20]):
+            for player_item in players_data["response"][:20]:
                 player = player_item["player"]
                 statistics = player_item.get("statistics", [])
                 
@@ -468,60 +455,42 @@ async def get_team_complete_profile(
         # Trier joueurs par apparitions (avec gestion des None)
         simplified_players.sort(key=lambda x: x.get("appearances", 0) or 0, reverse=True)
         
-        # 5. CONSTRUIRE LA RÉPONSE COMPLÈTE - AVEC current_season
-        complete_profile = {
-            # Informations de base
-            "id": team["id"],
-            "name": team["name"],
-            "logo": team["logo"],
-            "country": team["country"],
-            "code": team.get("code"),
-            "founded": team.get("founded"),
-            "national": team.get("national", False),
-            
-            # STRUCTURE current_season
-            "current_season": {
-                "league": league,
-                "season": season,
-                "position": current_position,
-                "points": standing_stats.get("points", 0),
-                "matches_played": standing_stats.get("matches_played", 0),
-                "wins": standing_stats.get("wins", 0),
-                "draws": standing_stats.get("draws", 0),
-                "losses": standing_stats.get("losses", 0),
-                "goals_for": standing_stats.get("goals_for", 0),
-                "goals_against": standing_stats.get("goals_against", 0),
-                "goal_difference": standing_stats.get("goal_difference", 0),
-                "form": standing_stats.get("form", "")
-            },
-            
-            # Informations du stade
-            "venue": {
-                "name": venue.get("name"),
-                "city": venue.get("city"),
-                "capacity": venue.get("capacity"),
-                "surface": venue.get("surface"),
-                "address": venue.get("address"),
-                "image": venue.get("image")
-            } if venue else None,
-            
-            # Statistiques détaillées
-            "detailed_statistics": stats_response,
-            
-            # Joueurs
-            "players": simplified_players,
-            "players_count": len(simplified_players),
-            
-            # Métadonnées
-            "last_update": datetime.now().isoformat(),
-            "debug_info": {
-                "api_calls_made": 4,
-                "players_api_response_length": len(players_data.get('response', [])) if players_data else 0,
-                "players_processed": len(simplified_players)
-            }
-        }
+        profile["players"] = simplified_players
+        profile["players_count"] = len(simplified_players)
+        debug_info["players_api_response_length"] = len(players_data.get('response', [])) if players_data else 0
+        debug_info["players_processed"] = len(simplified_players)
+    
+    # Métadonnées
+    request_stats = request_context.current()
+    debug_info["api_calls_made"] = request_stats.upstream_calls if request_stats else None
+    profile["last_update"] = datetime.now().isoformat()
+    profile["debug_info"] = debug_info
+    return profile
+
+@router.get("/{team_id}/complete")
+async def get_team_complete_profile(
+    team_id: int,
+    league: int = Query(61, description="ID de la ligue"), 
+    season: int = Query(2023, description="Année de la saison"),
+    include: Optional[str] = Query(None, description="Sections à inclure: standing,statistics,players (toutes par défaut)"),
+    fields: Optional[str] = Query(None, description="Champs de réponse à renvoyer (ex: id,name,current_season)")
+):
+    """
+    Endpoint combiné pour récupérer TOUTES les informations d'une équipe
+    Combine les détails de base + statistiques + joueurs
+    include= / fields= limitent les sections, et donc les appels à l'API
+    """
+    try:
+        print(f"🔥 Profil complet équipe {team_id} - Ligue {league}, Saison {season}")
+        
+        sections = parse_profile_sections(include, fields)
+        complete_profile = await build_team_profile(team_id, league, season, sections)
         
-        print(f"✅ Profil complet généré - Position: {current_position}, Joueurs: {len(simplified_players)}")
+        if fields:
+            requested = {part.strip() for part in fields.split(",")} | {"id"}
+            complete_profile = {key: value for key, value in complete_profile.items() if key in requested}
+        
+        print(f"✅ Profil complet généré - Sections: {sorted(sections)}")
         return complete_profile
         
     except HTTPException:
@@ -539,28 +508,23 @@ async def search_teams(
     q: str = Query(..., description="Nom de l'équipe à rechercher"),
     country: Optional[str] = Query(None, description="Filtrer par pays")
 ):
-    """Rechercher des équipes par nom"""
+    """
+    Rechercher des équipes par nom : index local d'abord (dès 1 caractère,
+    sans accents), API si l'index n'a aucune correspondance exacte ou par
+    préfixe ; les correspondances approchées ne font que compléter la liste
+    """
     try:
+        accept = (lambda entry: fold(entry.doc.get("country")) == fold(country)) if country else None
+        teams, fuzzy = search_indexes.teams.lookup(q, accept=accept)
+        if teams or len(fold(q)) < 3:  # L'API exige au moins 3 caractères
+            return teams + fuzzy
+
         params = {"search": q}
         if country:
             params["country"] = country
             
         data = await make_api_request("teams", params)
-        
-        teams = []
-        for item in data.get("response", []):
-            team_data = item.get("team", {})
-            teams.append({
-                "id": team_data.get("id"),
-                "name": team_data.get("name"),
-                "country": team_data.get("country"),
-                "logo": team_data.get("logo"),
-                "founded": team_data.get("founded"),
-                "national": team_data.get("national", False),
-                "code": team_data.get("code")
-            })
-        
-        return teams
+        return with_fuzzy([team_doc(item.get("team", {})) for item in data.get("response", [])], fuzzy)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la recherche: {str(e)}")
 
@@ -574,8 +538,8 @@ async def get_team_with_players(
 ):
     """CORRIGÉ - Récupérer une équipe avec ses détails et joueurs + POSITION RÉELLE"""
     try:
-        # Utiliser le nouvel endpoint complet corrigé
-        complete_data = await get_team_complete_profile(team_id, league, season)
+        # Seule la carte d'en-tête est renvoyée : pas d'appel joueurs ni statistiques
+        complete_data = await build_team_profile(team_id, league, season, {"standing"})
         
         # Adapter au format attendu par le frontend existant
         result = {
@@ -629,13 +593,14 @@ async def debug_team_data(team_id: int, league: int = 61, season: int = 2023):
                 "leagues_count": len(standings_data.get("response", [])),
                 "first_league": standings_data.get("response", [{}])[0].get("league", {}).get("name") if standings_data.get("response") else None
             },
-            "api_key_valid": len(headers.get("X-RapidAPI-Key", "")) > 10
+            "api_key_valid": len(gateway.headers.get("X-RapidAPI-Key", "")) > 10
         }
     except Exception as e:
         return {"error": str(e)}
     
 # Endpoint pour équipes par championnat (EXISTANT)
 @router.get("/")
+@memoized_response("teams_by_league")
 async def get_teams_by_league(
     league: int = Query(..., description="ID de la ligue"),
     season: int = Query(..., description="Année de la saison")
@@ -727,11 +692,17 @@ async def get_popular_teams():
     """Récupérer une liste d'équipes populaires (équipes françaises par défaut)"""
     try:
         popular_team_ids = [85, 79, 80, 84, 81, 77]  # PSG, OM, OL, Nice, Monaco, Lille
-        teams = []
         
+        # Les 6 équipes sont récupérées en parallèle
+        plan = UpstreamPlan()
+        for team_id in popular_team_ids:
+            plan.add(str(team_id), "teams", {"id": team_id})
+        results = await plan.run()
+        
+        teams = []
         for team_id in popular_team_ids:
             try:
-                team_data = await make_api_request("teams", {"id": team_id})
+                team_data = results[str(team_id)]
                 if team_data.get("response"):
                     team_info = team_data["response"][0]["team"]
                     teams.append({
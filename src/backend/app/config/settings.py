@@ -1,11 +1,114 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 class Settings(BaseSettings):
     # API Football
     football_api_key: str
     football_api_base_url: str = "https://v3.football.api-sports.io"
     
+    # Pool de connexions upstream (client httpx partagé)
+    upstream_timeout: float = 30.0
+    upstream_connect_timeout: float = 5.0
+    upstream_max_connections: int = 20
+    upstream_max_keepalive: int = 10
+    upstream_keepalive_expiry: float = 30.0
+    upstream_http2: bool = True  # Actif seulement si le paquet h2 est installé
+    
+    # Cache mémoire des réponses upstream (durées en secondes)
+    cache_enabled: bool = True
+    cache_max_entries: int = 2000
+    cache_ttl_default: int = 300
+    cache_ttl_live: int = 15
+    cache_ttl_by_endpoint: Dict[str, int] = {
+        "teams": 86400,
+        "teams/statistics": 3600,
+        "standings": 300,
+        "fixtures": 60,
+        "fixtures/players": 3600,
+        "players": 3600,
+        "players/topscorers": 3600,
+        "transfers": 86400
+    }
+    cache_finished_statuses: List[str] = ["FT", "AET", "PEN"]  # Mis en cache sans expiration
+    
+    # Stale-while-revalidate : une entrée expirée est servie pendant son rafraîchissement
+    cache_swr_enabled: bool = True
+    cache_max_stale: int = 3600
+    cache_swr_endpoints: List[str] = ["standings", "fixtures", "teams", "teams/statistics", "players", "players/topscorers"]
+    
+    # Cache disque des données immuables (saisons terminées, matchs finis)
+    disk_cache_enabled: bool = True
+    disk_cache_path: str = "cache/upstream_cache.sqlite3"
+    season_rollover_month: int = 7  # La saison N est terminée à partir de juillet N+1
+    
+    # Timeouts adaptatifs (dérivés du p99 observé, bornés par upstream_timeout)
+    timeout_adaptive: bool = True
+    timeout_min: float = 2.0
+    timeout_multiplier: float = 3.0
+    latency_window: int = 200
+    latency_min_samples: int = 20
+    
+    # Disjoncteur par endpoint upstream
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout: float = 30.0
+    cache_stale_if_error: int = 86400  # Données expirées servies si l'API est en panne
+    
+    # Hedging : requête dupliquée si la réponse tarde au-delà du p95 observé
+    hedge_enabled: bool = True
+    hedge_endpoints: List[str] = ["fixtures", "players"]
+    hedge_percentile: float = 0.95
+    hedge_max_fraction: float = 0.05  # Part max des appels upstream pouvant être dupliqués
+    
+    # Budget de quota api-sports (recalé sur les en-têtes x-ratelimit-* des réponses)
+    quota_enabled: bool = True
+    quota_per_minute: int = 10
+    quota_daily: int = 100
+    quota_burst: int = 3                    # Rafale minimale (sinon le quota par minute moins la marge)
+    quota_headroom: float = 0.1             # Marge sous le plafond par minute
+    quota_interactive_reserve: float = 0.2  # Part du quota journalier réservée aux clients
+    quota_max_wait: float = 15.0            # Attente max dans la file avant 429 (refus immédiat si dépassée)
+    
+    # Synchronisation incrémentale des matchs d'une saison (fixture store)
+    fixture_sync_interval: int = 60          # Rafraîchissement de la fenêtre hier/aujourd'hui (1 appel)
+    fixture_reschedule_interval: int = 3600  # Relecture des matchs reportés (ids=)
+    fixture_full_sync_interval: int = 21600  # Rechargement complet de la saison
+    fixture_reschedule_statuses: List[str] = ["PST", "TBD", "SUSP", "INT"]  # Relus par ids=
+    
+    # Flux SSE des matchs en direct (un seul sondeur live=all par processus)
+    live_poll_interval: float = 15.0     # Match en cours (1H, 2H, ET, P)
+    live_poll_break: float = 60.0        # Mi-temps / pause (HT, BT)
+    live_poll_prematch: float = 30.0     # Coup d'envoi dans moins de live_prematch_window
+    live_poll_idle: float = 900.0        # Aucun match en cours ni imminent
+    live_prematch_window: int = 600
+    live_kickoff_grace: int = 1800       # Match NS dont le coup d'envoi est passé (retard)
+    live_stream_heartbeat: float = 15.0  # Commentaire SSE pour garder la connexion ouverte
+    live_stream_queue_size: int = 100    # Au-delà, le client lent reçoit un instantané complet
+    
+    # Réponses JSON pré-sérialisées (octets mémorisés tant que les données sont inchangées)
+    response_memo_enabled: bool = True
+    response_memo_max_entries: int = 500
+    response_memo_max_age: int = 300
+    
+    # Validation HTTP (ETag / Last-Modified / Cache-Control) des GET /api
+    http_cache_enabled: bool = True
+    http_cache_max_entries: int = 2000
+    http_cache_max_age: int = 86400  # Plafond de max-age (données immuables)
+    
+    # Compression des réponses /api (variantes mémorisées par ETag)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5  # Actif seulement si le paquet brotli est installé
+    compression_cache_max_bytes: int = 32 * 1024 * 1024
+    
+    # Index local de recherche (équipes et joueurs déjà reçus de l'API)
+    search_index_enabled: bool = True
+    search_index_limit: int = 20
+    search_index_min_similarity: float = 0.5  # Part des trigrammes de la requête retrouvés (fautes de frappe)
+    
+    # Métriques dérivées des joueurs (mémorisées par équipe, ligue, saison)
+    metrics_cache_max_entries: int = 500
+    
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
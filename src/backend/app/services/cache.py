@@ -0,0 +1,161 @@
+# backend/app/services/cache.py - CACHE MÉMOIRE DES RÉPONSES API-SPORTS
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Hashable, Optional
+from app.config.settings import settings
+
+# Durée de vie "infinie" (matchs terminés, données figées)
+FOREVER = None
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    stored_at: float
+    expires_at: Optional[float]  # None = n'expire jamais
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return self.expires_at is None or (now or time.time()) < self.expires_at
+
+    def age(self, now: Optional[float] = None) -> float:
+        return max(0.0, (now or time.time()) - self.stored_at)
+
+
+def is_season_completed(season: Any, today: Optional[date] = None) -> bool:
+    """Une saison N est terminée à partir du mois de bascule de l'année N+1"""
+    try:
+        season = int(season)
+    except (TypeError, ValueError):
+        return False
+    today = today or date.today()
+    return today >= date(season + 1, settings.season_rollover_month, 1)
+
+
+def current_season(today: Optional[date] = None) -> int:
+    """Saison en cours : la saison N commence au mois de bascule de l'année N"""
+    today = today or date.today()
+    return today.year if today.month >= settings.season_rollover_month else today.year - 1
+
+
+def _all_fixtures_finished(payload: Dict[str, Any]) -> bool:
+    items = payload.get("response") or []
+    return bool(items) and all(
+        item.get("fixture", {}).get("status", {}).get("short") in settings.cache_finished_statuses
+        for item in items
+    )
+
+
+def may_be_persisted(endpoint: str, params: Dict[str, str]) -> bool:
+    """Un appel peut-il avoir une réponse sur disque ? (évite les lectures inutiles)"""
+    if params.get("live") or params.get("search"):
+        return False
+    if is_season_completed(params.get("season")):
+        return True
+    # "last" / "next" sont relatifs à aujourd'hui : la réponse évoluera
+    return endpoint == "fixtures" and not (params.get("last") or params.get("next"))
+
+
+def is_immutable(endpoint: str, params: Dict[str, str], payload: Dict[str, Any]) -> bool:
+    """Réponse qui ne changera plus : saison terminée ou matchs tous finis"""
+    if payload.get("errors") or not payload.get("response"):
+        return False
+    if not may_be_persisted(endpoint, params):
+        return False
+    if is_season_completed(params.get("season")):
+        return True
+    return endpoint == "fixtures" and _all_fixtures_finished(payload)
+
+
+def ttl_for(endpoint: str, params: Dict[str, str], payload: Dict[str, Any]) -> Optional[float]:
+    """
+    Politique de cache d'un appel upstream (configurée dans settings).
+    Renvoie la durée en secondes, FOREVER, ou 0 pour ne pas mettre en cache.
+    """
+    # Réponse en erreur (quota, paramètre invalide) : jamais en cache
+    if payload.get("errors"):
+        return 0
+
+    if endpoint == "fixtures" and params.get("live"):
+        return settings.cache_ttl_live
+
+    if is_immutable(endpoint, params, payload):
+        return FOREVER
+
+    return settings.cache_ttl_by_endpoint.get(endpoint, settings.cache_ttl_default)
+
+
+class TTLCache:
+    """Cache LRU borné en nombre d'entrées, avec expiration par entrée"""
+
+    def __init__(self, max_entries: int, retention: float = 0):
+        self.max_entries = max_entries
+        self.retention = retention  # Durée de conservation après expiration (secours en cas de panne)
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Entrée fraîche ou None"""
+        return self.lookup(key)
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        """Entrée telle quelle (fraîche ou non), sans effet sur les compteurs ni l'ordre LRU"""
+        return self._entries.get(key)
+
+    def lookup(self, key: Hashable, max_stale: float = 0) -> Optional[CacheEntry]:
+        """
+        Entrée fraîche, ou expirée depuis moins de max_stale secondes
+        (stale-while-revalidate). Les entrées expirées depuis plus longtemps
+        que la rétention sont purgées.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and not entry.is_fresh():
+            expired_for = time.time() - entry.expires_at
+            if expired_for > max_stale:
+                if expired_for > self.retention:
+                    del self._entries[key]
+                entry = None
+            else:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                return entry
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float]) -> Optional[CacheEntry]:
+        if ttl == 0:
+            return None
+        now = time.time()
+        entry = CacheEntry(value=value, stored_at=now, expires_at=None if ttl is FOREVER else now + ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions
+        }
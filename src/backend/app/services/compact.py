@@ -0,0 +1,62 @@
+# backend/app/services/compact.py - REPRÉSENTATION COMPACTE DES MATCHS DU FIXTURESTORE
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+# Formes (tuples de clés) partagées par tous les objets de même structure
+_shapes: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def pack(value: Any) -> Any:
+    """
+    Objet JSON -> forme compacte : chaque dict devient un tuple
+    (forme, valeur1, valeur2, ...) dont la forme est partagée, les chaînes
+    sont internées. Les listes restent des listes.
+    """
+    if isinstance(value, dict):
+        keys = tuple(value)
+        shape = _shapes.get(keys)
+        if shape is None:
+            shape = _shapes[keys] = tuple(sys.intern(key) for key in keys)
+        return (shape, *[pack(item) for item in value.values()])
+    if isinstance(value, list):
+        return [pack(item) for item in value]
+    if isinstance(value, str):
+        return sys.intern(value) if len(value) <= 64 else value
+    return value
+
+
+def unpack(value: Any) -> Any:
+    """Forme compacte -> objet JSON identique à l'original"""
+    if isinstance(value, tuple):
+        return dict(zip(value[0], [unpack(item) for item in value[1:]]))
+    if isinstance(value, list):
+        return [unpack(item) for item in value]
+    return value
+
+
+class FixtureRecord:
+    """Match compact : champs lus par les index du FixtureStore + corps compacté"""
+
+    __slots__ = ("id", "timestamp", "status", "home_id", "away_id", "body")
+
+    def __init__(self, item: Dict[str, Any]):
+        fixture = item["fixture"]
+        teams = item.get("teams") or {}
+        self.id: int = fixture["id"]
+        self.timestamp: int = fixture.get("timestamp") or 0
+        self.status: str = sys.intern((fixture.get("status") or {}).get("short") or "")
+        self.home_id: Optional[int] = (teams.get("home") or {}).get("id")
+        self.away_id: Optional[int] = (teams.get("away") or {}).get("id")
+        self.body = pack(item)
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return self.timestamp, self.id
+
+    def to_item(self) -> Dict[str, Any]:
+        return unpack(self.body)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FixtureRecord) and self.body == other.body
+
+    __hash__ = None
@@ -0,0 +1,112 @@
+# backend/app/services/compression.py - COMPRESSION GZIP / BROTLI DES RÉPONSES
+import gzip
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.config.settings import settings
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:  # gzip seulement
+    BROTLI_AVAILABLE = False
+
+IDENTITY = "identity"
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """Par ordre de préférence à qualité égale"""
+    return ("br", "gzip") if BROTLI_AVAILABLE else ("gzip",)
+
+
+def negotiate(accept_encoding: Optional[str]) -> str:
+    """Choisir l'encodage selon Accept-Encoding (valeurs q comprises)"""
+    if not settings.compression_enabled or not accept_encoding:
+        return IDENTITY
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = IDENTITY, 0.0
+    for encoding in supported_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """ETag propre à chaque encodage : "hash" -> "hash-br" """
+    if encoding == IDENTITY:
+        return etag
+    return etag[:-1] + f"-{encoding}" + '"'
+
+
+def base_etag(etag: str) -> str:
+    for encoding in supported_encodings():
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+class CompressedVariants:
+    """
+    Variantes compressées déjà calculées, indexées par (ETag, encodage) :
+    un même corps n'est compressé qu'une fois, quel que soit le nombre de
+    clients. Cache LRU borné en octets.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def get(self, etag: str, body: bytes, encoding: str) -> bytes:
+        key = (etag, encoding)
+        compressed = self._entries.get(key)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            compressed = _compress(body, encoding)
+            self._entries[key] = compressed
+            self._size += len(compressed)
+            while self._size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        return compressed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "encodings": list(supported_encodings()),
+            "variants": len(self._entries),
+            "size_bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None
+        }
+
+
+# Instance globale
+variants = CompressedVariants(settings.compression_cache_max_bytes)
@@ -0,0 +1,106 @@
+# backend/app/services/disk_cache.py - CACHE DISQUE DES SAISONS TERMINÉES
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
+from app.services import payloads
+
+
+class DiskCache:
+    """
+    Cache persistant (SQLite) des réponses immuables : saisons terminées et
+    matchs finis. Lu avant tout appel réseau, il survit aux redémarrages et
+    est partagé entre les workers d'une même machine.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def _open(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS upstream_cache ("
+                " key TEXT PRIMARY KEY,"
+                " endpoint TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _serialize_key(key: Hashable) -> str:
+        return json.dumps(key, separators=(",", ":"))
+
+    def _get_sync(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._open().execute(
+                "SELECT payload, stored_at FROM upstream_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return row
+
+    def _put_sync(self, key: str, endpoint: str, payload: str, stored_at: float):
+        with self._lock:
+            conn = self._open()
+            conn.execute(
+                "INSERT OR REPLACE INTO upstream_cache (key, endpoint, payload, stored_at) VALUES (?, ?, ?, ?)",
+                (key, endpoint, payload, stored_at)
+            )
+            conn.commit()
+
+    async def start(self):
+        await asyncio.to_thread(self._locked_open)
+
+    def _locked_open(self):
+        with self._lock:
+            self._open()
+
+    async def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def get(self, key: Hashable) -> Optional[Tuple[Dict[str, Any], float]]:
+        """(payload, horodatage d'écriture) ou None"""
+        try:
+            row = await asyncio.to_thread(self._get_sync, self._serialize_key(key))
+        except sqlite3.Error as e:
+            print(f"❌ Lecture cache disque impossible: {e}")
+            return None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payloads.decode(row[0]), row[1]
+
+    async def put(self, key: Hashable, endpoint: str, payload: Dict[str, Any]):
+        try:
+            await asyncio.to_thread(
+                self._put_sync, self._serialize_key(key), endpoint,
+                json.dumps(payload, separators=(",", ":")), time.time()
+            )
+            self.writes += 1
+        except sqlite3.Error as e:
+            print(f"❌ Écriture cache disque impossible: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes
+        }
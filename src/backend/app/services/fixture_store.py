@@ -0,0 +1,380 @@
+# backend/app/services/fixture_store.py - MATCHS D'UNE SAISON INDEXÉS EN MÉMOIRE
+import base64
+import bisect
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from fastapi import HTTPException
+from app.config.settings import settings
+from app.services.upstream import load
+from app.services.cache import is_season_completed, FOREVER
+from app.services.planner import UpstreamPlan
+from app.services.singleflight import SingleFlight
+from app.services.compact import FixtureRecord
+from app.services import request_context
+
+LIVE_STATUSES = {"1H", "2H", "HT", "ET", "BT", "P", "LIVE", "INT"}
+FINISHED_STATUSES = {"FT", "AET", "PEN"}
+SCHEDULED_STATUSES = {"NS", "TBD"}
+
+DAY = 86400
+IDS_PER_CALL = 20  # Limite du paramètre ids= de l'API
+
+
+class FixtureStore:
+    """
+    Matchs d'une (ligue, saison) triés par coup d'envoi, avec index par
+    statut et par équipe : les filtres récents / à venir / live / date /
+    équipe deviennent des recherches dichotomiques au lieu de parcours
+    complets de la saison.
+
+    Chaque modification fusionnée reçoit un numéro de version croissant :
+    changed_since(version) renvoie les matchs modifiés depuis.
+
+    Les matchs sont conservés sous forme compacte (FixtureRecord) et
+    restitués au format api-sports par les requêtes.
+    """
+
+    def __init__(self, league: int, season: int):
+        self.league = league
+        self.season = season
+        self.fixtures: Dict[int, FixtureRecord] = {}
+        self.errors: Any = {}
+        self.version = 0
+        self.versions: Dict[int, int] = {}  # Match -> version de sa dernière modification
+        self.loaded_at: Optional[float] = None  # Dernier chargement complet (monotonic)
+        self.synced_at: Optional[float] = None  # Dernière synchronisation (monotonic)
+        self.rescheduled_at: Optional[float] = None  # Dernière relecture des matchs reportés (monotonic)
+        self._keys: List[Tuple[int, int]] = []  # (coup d'envoi, id) triés
+        self._timestamps: List[int] = []
+        self._ids: List[int] = []
+        self._by_status: Dict[str, Set[int]] = defaultdict(set)
+        self._by_team: Dict[int, List[int]] = defaultdict(list)
+        self.rebuilds = 0
+
+    def replace(self, payload: Dict[str, Any]) -> List[int]:
+        """Remplacer la saison par une réponse `fixtures` complète (versions conservées si inchangé)"""
+        items = payload.get("response", [])
+        self.errors = payload.get("errors", {})
+        removed = set(self.fixtures) - {item["fixture"]["id"] for item in items}
+        for fixture_id in removed:
+            del self.fixtures[fixture_id]
+            self.versions.pop(fixture_id, None)
+        changed = self.merge(items, reindex=bool(removed))
+        self.loaded_at = self.synced_at = self.rescheduled_at = time.monotonic()
+        return changed
+
+    def merge(self, items: Iterable[Dict[str, Any]], reindex: bool = False) -> List[int]:
+        """Fusionner des matchs rafraîchis, renvoyer les ids réellement modifiés"""
+        changed = []
+        for item in items:
+            if item.get("league", {}).get("season", self.season) != self.season:
+                continue
+            record = FixtureRecord(item)
+            if self.fixtures.get(record.id) == record:
+                continue
+            if not changed:
+                self.version += 1
+            self.fixtures[record.id] = record
+            self.versions[record.id] = self.version
+            changed.append(record.id)
+        if changed or reindex:
+            self._reindex()
+        return changed
+
+    def changed_since(self, version: int) -> List[Dict[str, Any]]:
+        """Matchs modifiés après `version`, par date de coup d'envoi"""
+        ids = [fixture_id for fixture_id, stamp in self.versions.items() if stamp > version]
+        return self._items(sorted(ids, key=self._key))
+
+    def needs_full_sync(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at >= settings.fixture_full_sync_interval
+
+    def needs_sync(self) -> bool:
+        return self.synced_at is None or time.monotonic() - self.synced_at >= settings.fixture_sync_interval
+
+    def needs_reschedule_check(self) -> bool:
+        return (self.rescheduled_at is None
+                or time.monotonic() - self.rescheduled_at >= settings.fixture_reschedule_interval)
+
+    def has_open_fixtures(self) -> bool:
+        """Au moins un match non terminé dans la saison"""
+        return any(ids for status, ids in self._by_status.items() if status not in FINISHED_STATUSES)
+
+    def _reindex(self):
+        ordered = sorted(self.fixtures.values(), key=lambda record: record.key)
+        self._keys = [record.key for record in ordered]
+        self._timestamps = [key[0] for key in self._keys]
+        self._ids = [key[1] for key in self._keys]
+        self._by_status = defaultdict(set)
+        self._by_team = defaultdict(list)
+        for record in ordered:
+            self._by_status[record.status].add(record.id)
+            for team_id in (record.home_id, record.away_id):
+                if team_id is not None:
+                    self._by_team[team_id].append(record.id)
+        self.rebuilds += 1
+
+    def _key(self, fixture_id: int) -> Tuple[int, int]:
+        return self.fixtures[fixture_id].key
+
+    def _items(self, ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.fixtures[fixture_id].to_item() for fixture_id in ids]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ============= REQUÊTES =============
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self._items(self._ids)
+
+    def page(self, after: Optional[Tuple[int, int]], limit: int,
+             team_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Matchs strictement après le curseur (coup d'envoi, id), par date croissante"""
+        if team_id is None:
+            start = bisect.bisect_right(self._keys, after) if after else 0
+            ids = self._ids[start:start + limit]
+        else:
+            team_ids = self._by_team.get(team_id, [])
+            start = bisect.bisect_right(team_ids, after, key=self._key) if after else 0
+            ids = team_ids[start:start + limit]
+        return self._items(ids)
+
+    def between(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Matchs dont le coup d'envoi est dans [start, end], par date croissante"""
+        lo = bisect.bisect_left(self._timestamps, start)
+        hi = bisect.bisect_right(self._timestamps, end)
+        return self._items(self._ids[lo:hi])
+
+    def recent(self, now: Optional[float] = None, days_back: int = 30, limit: int = 10,
+               team_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Matchs terminés des `days_back` derniers jours, du plus récent au plus ancien"""
+        now = _now(now)
+        lo = bisect.bisect_left(self._timestamps, now - days_back * DAY)
+        hi = bisect.bisect_right(self._timestamps, now)
+        return self._pick(reversed(range(lo, hi)), FINISHED_STATUSES, limit, team_id)
+
+    def upcoming(self, now: Optional[float] = None, days_forward: int = 30, limit: int = 10,
+                 team_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Matchs programmés des `days_forward` prochains jours, du plus proche au plus lointain"""
+        now = _now(now)
+        lo = bisect.bisect_left(self._timestamps, now)
+        hi = bisect.bisect_right(self._timestamps, now + days_forward * DAY)
+        return self._pick(range(lo, hi), SCHEDULED_STATUSES, limit, team_id)
+
+    def live(self, team_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.by_status(LIVE_STATUSES, team_id)
+
+    def by_status(self, statuses, team_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        ids = set().union(*(self._by_status.get(status, ()) for status in statuses))
+        if team_id is not None:
+            ids &= set(self._by_team.get(team_id, ()))
+        return self._items(sorted(ids, key=self._key))
+
+    def on_date(self, day: str) -> List[Dict[str, Any]]:
+        """Matchs d'une journée (YYYY-MM-DD, en UTC comme l'API sans paramètre timezone)"""
+        start = datetime.strptime(day, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+        return self.between(start, start + DAY - 1)
+
+    def by_team(self, team_id: int) -> List[Dict[str, Any]]:
+        return self._items(self._by_team.get(team_id, []))
+
+    def next_kickoff(self, after: float) -> Optional[int]:
+        """Prochain coup d'envoi d'un match pas encore commencé, à partir de `after`"""
+        start = bisect.bisect_left(self._timestamps, after)
+        for position in range(start, len(self._ids)):
+            if self.fixtures[self._ids[position]].status in SCHEDULED_STATUSES:
+                return self._timestamps[position]
+        return None
+
+    def _pick(self, positions, statuses: Set[str], limit: int, team_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        team_fixtures = set(self._by_team.get(team_id, ())) if team_id is not None else None
+        picked = []
+        for position in positions:
+            fixture_id = self._ids[position]
+            if team_fixtures is not None and fixture_id not in team_fixtures:
+                continue
+            record = self.fixtures[fixture_id]
+            if record.status in statuses:
+                picked.append(record.to_item())
+                if len(picked) >= limit:
+                    break
+        return picked
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fixtures": len(self),
+            "teams": len(self._by_team),
+            "statuses": {status: len(ids) for status, ids in self._by_status.items() if ids},
+            "version": self.version,
+            "rebuilds": self.rebuilds,
+            "synced_ago_s": round(time.monotonic() - self.synced_at, 1) if self.synced_at else None
+        }
+
+
+class StoreVersion:
+    """Dépendance d'une réponse mémorisée : valide tant que la saison n'a ni changé ni besoin d'être resynchronisée"""
+
+    __slots__ = ("store", "version")
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+        self.version = store.version
+
+    def is_current(self) -> bool:
+        return self.store.version == self.version and not self.store.needs_sync()
+
+    def remaining(self) -> Optional[float]:
+        """Secondes avant la prochaine synchronisation de la saison (None = matchs tous terminés)"""
+        if self.store.synced_at is None:
+            return 0.0
+        if len(self.store) and not self.store.has_open_fixtures():
+            # Données figées : même durée que ttl_for pour une saison terminée
+            return FOREVER
+        return max(0.0, settings.fixture_sync_interval - (time.monotonic() - self.store.synced_at))
+
+
+class FixtureStores:
+    """
+    Un FixtureStore par (ligue, saison), synchronisé de façon incrémentale :
+    la saison est chargée une fois, puis un seul appel relit les matchs d'hier
+    et d'aujourd'hui (en direct compris). Entre deux synchronisations, les matchs en direct arrivent par le
+    sondeur live (apply_live). Les matchs reportés sont relus toutes les
+    fixture_reschedule_interval secondes, la saison entière toutes les
+    fixture_full_sync_interval secondes.
+    """
+
+    def __init__(self):
+        self._stores: Dict[Tuple[int, int], FixtureStore] = {}
+        self._live: Dict[int, Dict[str, Any]] = {}  # Dernier instantané live=all du sondeur
+        self.inflight = SingleFlight()
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+
+    async def get(self, league: int, season: int) -> FixtureStore:
+        store = self._stores.get((league, season))
+        if store is None:
+            store = FixtureStore(league, season)
+            self._stores[(league, season)] = store
+        if store.needs_sync():
+            # Une seule synchronisation à la fois par saison
+            await self.inflight.do((league, season), lambda: self.sync(store), "fixtures/sync")
+        request_context.record_dependency(StoreVersion(store))
+        return store
+
+    async def sync(self, store: FixtureStore) -> List[int]:
+        if store.needs_full_sync():
+            data = await load("fixtures", {"league": store.league, "season": store.season})
+            changed = store.replace(data)
+            # Matchs en direct plus récents que la saison (éventuellement en cache)
+            changed += store.merge(self._live_items(store))
+            self.full_syncs += 1
+            print(f"🗂️ Saison {store.league}/{store.season} chargée: {len(store)} matchs")
+            return changed
+
+        if is_season_completed(store.season):
+            # Saison terminée : plus rien ne peut changer d'ici le prochain rechargement
+            store.synced_at = time.monotonic()
+            return []
+
+        try:
+            changed = store.merge(await self._fetch_window(store))
+        except HTTPException as e:
+            # Fenêtre indisponible (quota, panne) : la saison en mémoire reste servie
+            print(f"⚠️ Synchronisation {store.league}/{store.season} reportée: {e.detail}")
+            changed = []
+        store.synced_at = time.monotonic()
+        self.incremental_syncs += 1
+        if changed:
+            print(f"🔄 Saison {store.league}/{store.season}: {len(changed)} match(s) mis à jour (v{store.version})")
+        return changed
+
+    def next_kickoff(self, after: float, leagues: Optional[Set[int]] = None) -> Optional[int]:
+        """Prochain coup d'envoi connu parmi les saisons chargées (des ligues `leagues` si précisé)"""
+        kickoffs = [kickoff for kickoff in (store.next_kickoff(after) for (league, _), store in self._stores.items()
+                                            if leagues is None or league in leagues)
+                    if kickoff is not None]
+        return min(kickoffs, default=None)
+
+    def apply_live(self, items: List[Dict[str, Any]], ended: Iterable[int] = ()):
+        """Fusionner des matchs reçus par ailleurs (sondeur live) dans les saisons déjà chargées"""
+        for fixture_id in ended:
+            self._live.pop(fixture_id, None)
+        by_season: Dict[Tuple[int, int], List[Dict[str, Any]]] = defaultdict(list)
+        for item in items:
+            self._live[item["fixture"]["id"]] = item
+            league = item.get("league", {})
+            by_season[(league.get("id"), league.get("season"))].append(item)
+        for key, season_items in by_season.items():
+            store = self._stores.get(key)
+            if store is not None and store.loaded_at is not None:
+                store.merge(season_items)
+
+    def _live_items(self, store: FixtureStore) -> List[Dict[str, Any]]:
+        return [item for item in self._live.values()
+                if (item.get("league", {}).get("id"), item.get("league", {}).get("season")) == (store.league, store.season)]
+
+    async def _fetch_window(self, store: FixtureStore) -> List[Dict[str, Any]]:
+        """Matchs susceptibles d'avoir changé depuis la dernière synchronisation"""
+        today = datetime.now(timezone.utc).date()
+        plan = UpstreamPlan()
+        # Hier et aujourd'hui, matchs en direct compris : un seul appel, toujours
+        # envoyé car un match reporté peut être reprogrammé dans la fenêtre
+        plan.add("window", "fixtures", {
+            "league": store.league,
+            "season": store.season,
+            "from": (today - timedelta(days=1)).isoformat(),
+            "to": today.isoformat()
+        })
+
+        # Matchs reportés / suspendus : leur nouvelle date peut sortir de la fenêtre
+        reschedule_check = store.needs_reschedule_check()
+        if reschedule_check:
+            rescheduled = sorted(fixture_id for status in settings.fixture_reschedule_statuses
+                                 for fixture_id in store._by_status.get(status, ()))
+            for offset in range(0, len(rescheduled), IDS_PER_CALL):
+                chunk = rescheduled[offset:offset + IDS_PER_CALL]
+                plan.add(f"ids_{offset}", "fixtures", {"ids": "-".join(str(fixture_id) for fixture_id in chunk)})
+
+        results = await plan.run()
+        if reschedule_check:
+            store.rescheduled_at = time.monotonic()
+        return [item for data in results.values() for item in data.get("response", [])]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "seasons": {f"{league}/{season}": store.stats() for (league, season), store in self._stores.items()}
+        }
+
+
+def fixture_key(item: Dict[str, Any]) -> Tuple[int, int]:
+    fixture = item["fixture"]
+    return (fixture.get("timestamp") or 0, fixture["id"])
+
+
+def encode_cursor(item: Dict[str, Any]) -> str:
+    """Curseur opaque de pagination : position (coup d'envoi, id) d'un match"""
+    timestamp, fixture_id = fixture_key(item)
+    return base64.urlsafe_b64encode(f"{timestamp}:{fixture_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Lève ValueError si le curseur est invalide"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, fixture_id = raw.split(":")
+        return int(timestamp), int(fixture_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Curseur invalide: {cursor}") from e
+
+
+def _now(now: Optional[float]) -> float:
+    return datetime.now().timestamp() if now is None else now
+
+
+# Instance globale
+fixture_stores = FixtureStores()
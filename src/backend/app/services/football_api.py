@@ -1,34 +1,81 @@
-import httpx
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Type
 from datetime import datetime, date
-from app.config.settings import settings
+from pydantic import BaseModel, TypeAdapter
+from app.services.upstream import make_api_request
 from app.models.team import Team, TeamDetail, TeamWithPlayers, Player
 from app.models.match import Match, MatchDetail, MatchPreview, MatchScore, MatchGoal, MatchStats, TeamBase
 
+
+# ============= CONSTRUCTION DES MODÈLES PAR LOT =============
+# Une liste entière est validée en un seul appel (TypeAdapter, boucle en Rust)
+# au lieu d'un constructeur pydantic par élément et sous-modèle.
+# model_construct n'est pas utilisé : en pydantic 2 il reste une boucle
+# Python, plus lente que la validation (benchmarks/model_construction.py).
+
+LIST_ADAPTERS = {
+    Team: TypeAdapter(List[Team]),
+    Player: TypeAdapter(List[Player]),
+    MatchPreview: TypeAdapter(List[MatchPreview])
+}
+
+
+def build_models(model: Type[BaseModel], rows: List[Dict[str, Any]]) -> List[Any]:
+    """Lignes (dicts aux noms de champs du modèle) -> liste de modèles validés"""
+    return LIST_ADAPTERS[model].validate_python(rows)
+
+
+def team_row(team_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": team_data.get("id"),
+        "name": team_data.get("name"),
+        "country": team_data.get("country"),
+        "logo": team_data.get("logo"),
+        "founded": team_data.get("founded"),
+        "national": team_data.get("national", False),
+        "code": team_data.get("code")
+    }
+
+
+def player_row(player_data: Dict[str, Any]) -> Dict[str, Any]:
+    birth = player_data.get("birth", {})
+    return {
+        "id": player_data.get("id"),
+        "name": player_data.get("name"),
+        "firstname": player_data.get("firstname"),
+        "lastname": player_data.get("lastname"),
+        "age": player_data.get("age"),
+        "birth_date": birth.get("date"),
+        "birth_place": birth.get("place"),
+        "birth_country": birth.get("country"),
+        "nationality": player_data.get("nationality"),
+        "height": player_data.get("height"),
+        "weight": player_data.get("weight"),
+        "injured": player_data.get("injured", False),
+        "photo": player_data.get("photo")
+    }
+
+
+def match_preview_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    fixture = item.get("fixture", {})
+    teams = item.get("teams", {})
+    goals = item.get("goals", {})
+    home, away = teams.get("home", {}), teams.get("away", {})
+    return {
+        "id": fixture.get("id"),
+        "date": datetime.fromtimestamp(fixture.get("timestamp")),
+        "status": fixture.get("status", {}).get("long", ""),
+        # country pas toujours disponible dans cette endpoint
+        "home_team": {"id": home.get("id"), "name": home.get("name"), "country": "", "logo": home.get("logo")},
+        "away_team": {"id": away.get("id"), "name": away.get("name"), "country": "", "logo": away.get("logo")},
+        "score": {"home": goals.get("home"), "away": goals.get("away")}
+    }
+
+
 class FootballAPIService:
-    def __init__(self):
-        self.base_url = settings.football_api_base_url
-        self.headers = {
-            "X-RapidAPI-Key": settings.football_api_key,
-            "X-RapidAPI-Host": "v3.football.api-sports.io"
-        }
-    
     async def _make_request(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Faire une requête à l'API Football"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/{endpoint}",
-                    headers=self.headers,
-                    params=params or {},
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                print(f"Erreur API: {e}")
-                return {"response": []}
+        """Faire une requête à l'API Football (via la passerelle partagée)"""
+        return await make_api_request(endpoint, params or {})
     
     async def search_teams(self, query: str, country: str = None) -> List[Team]:
         """Rechercher des équipes par nom"""
@@ -37,21 +84,8 @@ class FootballAPIService:
             params["country"] = country
             
         data = await self._make_request("teams", params)
-        teams = []
-        
-        for item in data.get("response", []):
-            team_data = item.get("team", {})
-            teams.append(Team(
-                id=team_data.get("id"),
-                name=team_data.get("name"),
-                country=team_data.get("country"),
-                logo=team_data.get("logo"),
-                founded=team_data.get("founded"),
-                national=team_data.get("national", False),
-                code=team_data.get("code")
-            ))
-        
-        return teams
+        rows = [team_row(item.get("team", {})) for item in data.get("response", [])]
+        return build_models(Team, rows)
     
     async def get_team_by_id(self, team_id: int) -> Optional[TeamDetail]:
         """Récupérer les détails d'une équipe par ID"""
@@ -87,27 +121,8 @@ class FootballAPIService:
             "team": team_id,
             "season": season
         })
-        
-        players = []
-        for item in data.get("response", []):
-            player_data = item.get("player", {})
-            players.append(Player(
-                id=player_data.get("id"),
-                name=player_data.get("name"),
-                firstname=player_data.get("firstname"),
-                lastname=player_data.get("lastname"),
-                age=player_data.get("age"),
-                birth_date=player_data.get("birth", {}).get("date"),
-                birth_place=player_data.get("birth", {}).get("place"),
-                birth_country=player_data.get("birth", {}).get("country"),
-                nationality=player_data.get("nationality"),
-                height=player_data.get("height"),
-                weight=player_data.get("weight"),
-                injured=player_data.get("injured", False),
-                photo=player_data.get("photo")
-            ))
-        
-        return players
+        rows = [player_row(item.get("player", {})) for item in data.get("response", [])]
+        return build_models(Player, rows)
     
     async def get_matches_by_date(self, match_date: date = None) -> List[MatchPreview]:
         """Récupérer les matchs par date"""
@@ -117,36 +132,8 @@ class FootballAPIService:
         data = await self._make_request("fixtures", {
             "date": match_date.strftime("%Y-%m-%d")
         })
-        
-        matches = []
-        for item in data.get("response", []):
-            fixture = item.get("fixture", {})
-            teams = item.get("teams", {})
-            goals = item.get("goals", {})
-            
-            matches.append(MatchPreview(
-                id=fixture.get("id"),
-                date=datetime.fromtimestamp(fixture.get("timestamp")),
-                status=fixture.get("status", {}).get("long", ""),
-                home_team=TeamBase(
-                    id=teams.get("home", {}).get("id"),
-                    name=teams.get("home", {}).get("name"),
-                    country="",  # Pas toujours disponible dans cette endpoint
-                    logo=teams.get("home", {}).get("logo")
-                ),
-                away_team=TeamBase(
-                    id=teams.get("away", {}).get("id"),
-                    name=teams.get("away", {}).get("name"),
-                    country="",
-                    logo=teams.get("away", {}).get("logo")
-                ),
-                score=MatchScore(
-                    home=goals.get("home"),
-                    away=goals.get("away")
-                )
-            ))
-        
-        return matches
+        rows = [match_preview_row(item) for item in data.get("response", [])]
+        return build_models(MatchPreview, rows)
     
     async def get_match_by_id(self, match_id: int) -> Optional[MatchDetail]:
         """Récupérer les détails d'un match par ID"""
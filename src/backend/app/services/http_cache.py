@@ -0,0 +1,176 @@
+# backend/app/services/http_cache.py - VALIDATION HTTP DES RÉPONSES (ETag / 304)
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Hashable, List, Optional
+from fastapi import Request, Response
+from app.config.settings import settings
+from app.services.request_context import RequestStats
+from app.services import compression
+
+# Réponses diffusées au fil de l'eau : ni mises en mémoire, ni validées
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+@dataclass
+class Validator:
+    etag: str            # ETag du corps non compressé
+    last_modified: float
+    size: int
+    deps: List[Any]  # Données dont dépend la réponse (is_current() / remaining())
+
+    def is_current(self) -> bool:
+        return bool(self.deps) and all(dep.is_current() for dep in self.deps)
+
+
+class ValidatorCache:
+    """
+    ETag et date de modification de la dernière réponse de chaque URL GET.
+    Tant que les données dont elle dépend sont inchangées, une requête
+    conditionnelle reçoit un 304 sans que l'endpoint soit exécuté.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Validator]" = OrderedDict()
+        self.not_modified_early = 0  # 304 avant l'endpoint
+        self.not_modified_late = 0   # 304 après l'endpoint (corps identique)
+        self.served = 0
+
+    def get(self, key: Hashable) -> Optional[Validator]:
+        validator = self._entries.get(key)
+        if validator is not None:
+            self._entries.move_to_end(key)
+        return validator
+
+    def set(self, key: Hashable, validator: Validator):
+        self._entries[key] = validator
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "responses": self.served,
+            "not_modified_before_handler": self.not_modified_early,
+            "not_modified_after_handler": self.not_modified_late
+        }
+
+
+# Instance globale
+validators = ValidatorCache(settings.http_cache_max_entries)
+
+
+def applies_to(request: Request) -> bool:
+    return settings.http_cache_enabled and request.method == "GET" and request.url.path.startswith("/api/")
+
+
+def cache_key(request: Request) -> Hashable:
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def max_age(deps: List[Any], age: int = 0) -> int:
+    """
+    max-age = fraîcheur restante la plus courte parmi les données utilisées,
+    plus l'âge envoyé dans le header Age : le client calcule max-age - Age
+    """
+    remaining = [value for value in (dep.remaining() for dep in deps) if value is not None]
+    return age + int(min(remaining + [settings.http_cache_max_age]))
+
+
+def age_header(stats: Optional[RequestStats]) -> Optional[int]:
+    """Valeur du header Age (donnée la plus ancienne servie), None si aucune donnée upstream"""
+    if stats is None or not stats.payloads_served:
+        return None
+    return int(stats.max_age)
+
+
+def response_encoding(request: Request, size: int) -> str:
+    encoding = compression.negotiate(request.headers.get("accept-encoding"))
+    return encoding if size >= settings.compression_min_size else compression.IDENTITY
+
+
+def cache_headers(validator: Validator, cacheable: bool = True,
+                  encoding: str = compression.IDENTITY, age: Optional[int] = None) -> Dict[str, str]:
+    headers = {
+        "ETag": compression.variant_etag(validator.etag, encoding),
+        "Last-Modified": formatdate(validator.last_modified, usegmt=True),
+        "Vary": "Accept-Encoding"
+    }
+    if cacheable and validator.deps:
+        headers["Cache-Control"] = f"public, max-age={max_age(validator.deps, age or 0)}"
+    else:
+        headers["Cache-Control"] = "no-cache"
+    return headers
+
+
+def _matches(request: Request, validator: Validator) -> bool:
+    """If-None-Match prioritaire sur If-Modified-Since (RFC 9110)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {compression.base_etag(tag.strip().removeprefix("W/")) for tag in if_none_match.split(",")}
+        return "*" in candidates or validator.etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(validator.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified(request: Request) -> Optional[Response]:
+    """304 immédiat si le client a déjà la version courante (aucun travail d'endpoint)"""
+    if not applies_to(request):
+        return None
+    validator = validators.get(cache_key(request))
+    if validator is None or not validator.is_current() or not _matches(request, validator):
+        return None
+    validators.not_modified_early += 1
+    encoding = response_encoding(request, validator.size)
+    return Response(status_code=304, headers=cache_headers(validator, encoding=encoding))
+
+
+async def finalize(request: Request, response: Response, stats: Optional[RequestStats]) -> Response:
+    """
+    Ajouter ETag / Last-Modified / Cache-Control à une réponse 200, mémoriser
+    son validateur et la compresser selon Accept-Encoding
+    """
+    if not applies_to(request) or response.status_code != 200:
+        return response
+    if response.headers.get("content-type", "").startswith(STREAMING_MEDIA_TYPES):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = make_etag(body)
+    key = cache_key(request)
+    previous = validators.get(key)
+    last_modified = previous.last_modified if previous is not None and previous.etag == etag else time.time()
+
+    cacheable = stats is not None and stats.cacheable and not stats.stale
+    validator = Validator(etag, last_modified, len(body), list(stats.deps) if cacheable else [])
+    if cacheable and validator.deps:
+        validators.set(key, validator)
+    validators.served += 1
+
+    encoding = response_encoding(request, len(body))
+    if "content-encoding" in response.headers:
+        encoding = compression.IDENTITY
+    headers = dict(response.headers)
+    headers.pop("content-length", None)
+    headers.update(cache_headers(validator, cacheable, encoding, age_header(stats)))
+    if _matches(request, validator):
+        validators.not_modified_late += 1
+        return Response(status_code=304, headers={name: value for name, value in headers.items()
+                                                  if name.lower() != "content-type"})
+    if encoding != compression.IDENTITY:
+        body = compression.variants.get(etag, body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=200, headers=headers, media_type=response.media_type)
@@ -0,0 +1,185 @@
+# backend/app/services/live_poller.py - SONDAGE DES MATCHS EN DIRECT ET DIFFUSION SSE
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Set
+from app.config.settings import settings
+from app.services.upstream import gateway
+from app.services.rate_limit import BACKGROUND
+from app.services.fixture_store import fixture_stores
+from app.services.cache import current_season
+from app.services.live_schedule import LiveSchedule
+from app.services import request_context
+
+
+class LiveSubscription:
+    """File d'événements d'un client SSE, filtrée par ligue"""
+
+    def __init__(self, league: Optional[int]):
+        self.league = league
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.live_stream_queue_size)
+        self.resyncs = 0
+
+    def wants(self, item: Dict[str, Any]) -> bool:
+        return self.league is None or item.get("league", {}).get("id") == self.league
+
+
+class LivePoller:
+    """
+    Un seul sondeur `fixtures?live=all` par processus, quel que soit le
+    nombre de clients : chaque instantané est comparé au précédent et seuls
+    les matchs modifiés (ou terminés) sont poussés aux abonnés concernés.
+    Le sondeur démarre avec le premier abonné et s'arrête avec le dernier ;
+    sa cadence suit les matchs en cours et les prochains coups d'envoi des
+    ligues suivies par les abonnés (LiveSchedule).
+    Un abonné à une ligue charge la saison de cette ligue : même sans autre
+    requête, le calendrier connaît ses prochains coups d'envoi.
+    """
+
+    def __init__(self):
+        self.snapshot: Dict[int, Dict[str, Any]] = {}
+        self.subscribers: Set[LiveSubscription] = set()
+        self._joining: Set[LiveSubscription] = set()  # En attente du premier instantané
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._wake: Optional[asyncio.Event] = None
+        self.schedule = LiveSchedule()
+        self.polls = 0
+        self.updates_pushed = 0
+        self.last_poll_at: Optional[float] = None
+
+    # ============= ABONNEMENTS =============
+
+    async def subscribe(self, league: Optional[int] = None, season: Optional[int] = None) -> LiveSubscription:
+        if league is not None:
+            await self._watch(league, season or current_season())
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._wake = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+        elif self.last_poll_at is None or time.monotonic() - self.last_poll_at > settings.live_poll_interval:
+            # Sondeur en veille longue : rafraîchir avant d'envoyer l'état initial
+            self._ready.clear()
+            self._wake.set()
+        # Abonné inscrit une fois le premier instantané disponible : il reçoit
+        # l'état initial (snapshot) puis seulement les différences suivantes.
+        # Sa ligue compte déjà pour la cadence calculée après ce sondage.
+        subscription = LiveSubscription(league)
+        self._joining.add(subscription)
+        try:
+            await self._ready.wait()
+        finally:
+            self._joining.discard(subscription)
+        self.subscribers.add(subscription)
+        return subscription
+
+    async def _watch(self, league: int, season: int):
+        """Charger la saison de la ligue suivie, dont LiveSchedule lit les coups d'envoi"""
+        try:
+            await fixture_stores.get(league, season)
+        except Exception as e:
+            # Quota, panne : le flux reste servi, la cadence retombe sur live_poll_idle
+            print(f"⚠️ Calendrier {league}/{season} indisponible pour le sondeur live: {e}")
+
+    def unsubscribe(self, subscription: LiveSubscription):
+        self.subscribers.discard(subscription)
+
+    def current(self, league: Optional[int] = None) -> List[Dict[str, Any]]:
+        return [item for item in self.snapshot.values()
+                if league is None or item.get("league", {}).get("id") == league]
+
+    # ============= SONDAGE =============
+
+    async def _run(self):
+        request_context.detach()
+        print("🔴 Sondeur live démarré")
+        try:
+            while self.subscribers or not self._ready.is_set():
+                await self.poll()
+                self._ready.set()
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.next_interval())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._ready.set()
+            print("⚪ Sondeur live arrêté (aucun abonné)")
+
+    def next_interval(self) -> float:
+        return self.schedule.compute(self.snapshot.values(), leagues=self.watched_leagues())
+
+    def watched_leagues(self) -> Optional[Set[int]]:
+        """Ligues suivies par les abonnés (None si un abonné suit toutes les ligues)"""
+        leagues = {subscription.league for subscription in self.subscribers | self._joining}
+        return None if None in leagues else leagues
+
+    async def poll(self):
+        try:
+            data = await gateway.fetch("fixtures", {"live": "all"}, priority=BACKGROUND)
+        except Exception as e:
+            # Quota, panne, circuit ouvert : le dernier instantané reste valable
+            print(f"⚠️ Sondage live ignoré: {e}")
+            return
+        self.polls += 1
+        self.last_poll_at = time.monotonic()
+        self.apply(data.get("response", []))
+
+    def apply(self, items: List[Dict[str, Any]]):
+        """Comparer l'instantané reçu au précédent et diffuser les différences"""
+        fresh = {item["fixture"]["id"]: item for item in items}
+        changed = [item for fixture_id, item in fresh.items() if self.snapshot.get(fixture_id) != item]
+        ended = [item for fixture_id, item in self.snapshot.items() if fixture_id not in fresh]
+        self.snapshot = fresh
+        if not changed and not ended:
+            return
+
+        fixture_stores.apply_live(changed, ended=[item["fixture"]["id"] for item in ended])
+        for subscription in list(self.subscribers):
+            updates = [item for item in changed if subscription.wants(item)]
+            finished = [item["fixture"]["id"] for item in ended if subscription.wants(item)]
+            if updates:
+                self._push(subscription, "update", updates)
+            if finished:
+                self._push(subscription, "ended", finished)
+
+    def _push(self, subscription: LiveSubscription, event: str, data: Any):
+        try:
+            subscription.queue.put_nowait((event, data))
+            self.updates_pushed += 1
+        except asyncio.QueueFull:
+            # Client trop lent : remplacer son retard par un instantané complet
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(("snapshot", self.current(subscription.league)))
+            subscription.resyncs += 1
+
+    async def stop(self):
+        self.subscribers.clear()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "subscribers": len(self.subscribers),
+            "live_fixtures": len(self.snapshot),
+            "polls": self.polls,
+            "updates_pushed": self.updates_pushed,
+            "schedule": self.schedule.stats(),
+            "last_poll_ago_s": round(time.monotonic() - self.last_poll_at, 1) if self.last_poll_at else None
+        }
+
+
+def format_event(event: str, data: Any) -> str:
+    """Message Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# Instance globale
+live_poller = LivePoller()
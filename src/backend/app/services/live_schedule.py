@@ -0,0 +1,63 @@
+# backend/app/services/live_schedule.py - CADENCE DE SONDAGE SELON LES COUPS D'ENVOI
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+from app.config.settings import settings
+from app.services.fixture_store import fixture_stores
+
+# Statuts api-sports
+IN_PLAY_STATUSES = {"1H", "2H", "ET", "P", "LIVE"}
+BREAK_STATUSES = {"HT", "BT", "INT", "SUSP"}
+
+IN_PLAY = "in_play"
+BREAK = "break"
+PREMATCH = "prematch"
+IDLE = "idle"
+
+
+class LiveSchedule:
+    """
+    Intervalle avant le prochain sondage live :
+    - match en cours : live_poll_interval
+    - tous les matchs à la pause (mi-temps) : live_poll_break
+    - coup d'envoi imminent ou en retard : live_poll_prematch / live_poll_interval
+    - entre deux journées : sommeil jusqu'à l'approche du prochain coup
+      d'envoi connu, borné par live_poll_idle
+    """
+
+    def __init__(self):
+        self.phase = IDLE
+        self.next_kickoff: Optional[int] = None
+        self.interval = settings.live_poll_idle
+
+    def compute(self, live_items: Iterable[Dict[str, Any]], now: Optional[float] = None,
+                leagues: Optional[Set[int]] = None) -> float:
+        """`leagues` : ligues suivies par les abonnés (None = toutes), les autres sont ignorées"""
+        now = time.time() if now is None else now
+        statuses = {item["fixture"]["status"]["short"] for item in live_items
+                    if leagues is None or item.get("league", {}).get("id") in leagues}
+        self.next_kickoff = fixture_stores.next_kickoff(now - settings.live_kickoff_grace, leagues)
+
+        if statuses & IN_PLAY_STATUSES:
+            self.phase, self.interval = IN_PLAY, settings.live_poll_interval
+        elif self.next_kickoff is not None and self.next_kickoff <= now:
+            # Coup d'envoi passé mais match pas encore signalé en direct
+            self.phase, self.interval = IN_PLAY, settings.live_poll_interval
+        elif statuses & BREAK_STATUSES:
+            self.phase, self.interval = BREAK, settings.live_poll_break
+        elif self.next_kickoff is not None and self.next_kickoff - now <= settings.live_prematch_window:
+            self.phase, self.interval = PREMATCH, settings.live_poll_prematch
+        else:
+            self.phase = IDLE
+            wake_in = settings.live_poll_idle
+            if self.next_kickoff is not None:
+                # Se réveiller au début de la fenêtre d'avant-match
+                wake_in = min(wake_in, self.next_kickoff - settings.live_prematch_window - now)
+            self.interval = max(settings.live_poll_prematch, wake_in)
+        return self.interval
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "phase": self.phase,
+            "interval_s": round(self.interval, 1),
+            "next_kickoff_in_s": int(self.next_kickoff - time.time()) if self.next_kickoff else None
+        }
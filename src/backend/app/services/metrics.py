@@ -0,0 +1,222 @@
+# backend/app/services/metrics.py - MÉTRIQUES DÉRIVÉES DES JOUEURS ET DES ÉQUIPES
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+import numpy as np
+from app.config.settings import settings
+
+# Colonnes extraites de la réponse `players` (statistics[0])
+PLAYER_COLUMNS = ("appearances", "minutes", "goals", "assists")
+APPEARANCES, MINUTES, GOALS, ASSISTS = range(len(PLAYER_COLUMNS))
+
+# Colonnes des statistiques générales d'une équipe
+TEAM_COLUMNS = ("matches_played", "wins", "draws", "goals_for", "goals_against")
+
+# Métriques de part dans l'équipe : calculables seulement avec l'effectif complet
+SHARE_METRICS = ("goal_share", "assist_share", "goal_contribution_share", "minutes_share")
+
+SEASON_MATCHES = 38  # Projection de points sur une saison complète
+
+
+def player_row(player_item: Dict[str, Any]) -> Tuple[float, ...]:
+    statistics = player_item.get("statistics", [{}])[0] if player_item.get("statistics") else {}
+    games = statistics.get("games") or {}
+    goals = statistics.get("goals") or {}
+    return (
+        games.get("appearences") or 0,
+        games.get("minutes") or 0,
+        goals.get("total") or 0,
+        goals.get("assists") or 0
+    )
+
+
+def player_columns(player_items: Sequence[Dict[str, Any]]) -> np.ndarray:
+    """Joueurs -> matrice (joueurs x PLAYER_COLUMNS)"""
+    return np.array([player_row(item) for item in player_items], dtype=np.float64).reshape(-1, len(PLAYER_COLUMNS))
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """numerator / denominator * scale, 0 là où le dénominateur est nul"""
+    ratio = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+    return ratio * scale if scale != 1.0 else ratio
+
+
+# Métriques-ratios des joueurs : (nom, numérateur, dénominateur, échelle)
+PLAYER_RATIOS = (
+    # Par match joué
+    ("goals_per_match", "goals", "appearances", 1),
+    ("assists_per_match", "assists", "appearances", 1),
+    ("minutes_per_match", "minutes", "appearances", 1),
+    # Par 90 minutes
+    ("goals_per_90", "goals", "minutes", 90),
+    ("assists_per_90", "assists", "minutes", 90),
+    ("goal_contribution_per_90", "contribution", "minutes", 90),
+    # Part de l'équipe (%)
+    ("goal_share", "goals", "team_goals", 100),
+    ("assist_share", "assists", "team_assists", 100),
+    ("goal_contribution_share", "contribution", "team_contribution", 100),
+    ("minutes_share", "minutes", "team_minutes", 100)
+)
+
+
+def compute_player_metrics(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Toutes les métriques d'un effectif (ou d'une ligue) en une passe vectorisée"""
+    appearances, minutes, goals, assists = matrix.T
+    contribution = goals + assists
+    team_goals, team_minutes, team_assists = (np.full_like(goals, column.sum()) for column in (goals, minutes, assists))
+    columns = {
+        "appearances": appearances, "minutes": minutes, "goals": goals, "assists": assists,
+        "contribution": contribution, "team_goals": team_goals, "team_assists": team_assists,
+        "team_contribution": team_goals + team_assists, "team_minutes": team_minutes
+    }
+    # Une seule division pour toutes les métriques (lignes = métriques)
+    numerators = np.stack([columns[numerator] for _, numerator, _, _ in PLAYER_RATIOS])
+    denominators = np.stack([columns[denominator] for _, _, denominator, _ in PLAYER_RATIOS])
+    scales = np.array([[scale] for *_, scale in PLAYER_RATIOS], dtype=np.float64)
+    ratios = _ratio(numerators, denominators) * scales
+    metrics = {name: ratios[i] for i, (name, *_) in enumerate(PLAYER_RATIOS)}
+    metrics["goal_contribution"] = contribution
+    return metrics
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """round() vectorisé, identique à round() de Python (les quasi-égalités à .5 y sont repassées)"""
+    rounded = np.round(values, digits)
+    scaled = values * 10 ** digits
+    for index in zip(*np.nonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)):
+        rounded[index] = round(values[index].item(), digits)
+    return rounded
+
+
+# Précision d'arrondi de chaque métrique exposée
+ROW_DIGITS = {
+    "goals_per_match": 2, "assists_per_match": 2, "minutes_per_match": 0,
+    "goals_per_90": 2, "assists_per_90": 2, "goal_contribution_per_90": 2,
+    **dict.fromkeys(SHARE_METRICS, 1)
+}
+
+
+def player_metrics_rows(matrix: np.ndarray, metrics: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Métriques -> un dict `calculated_stats` par joueur ({} sans match joué)"""
+    columns = {}
+    for digits in set(ROW_DIGITS.values()):
+        names = [name for name, precision in ROW_DIGITS.items() if precision == digits]
+        columns.update(zip(names, _round(np.stack([metrics[name] for name in names]), digits).tolist()))
+    columns["goal_contribution"] = metrics["goal_contribution"].astype(np.int64).tolist()
+    columns["minutes_per_match"] = [value if minutes else 0 for value, minutes
+                                    in zip(columns["minutes_per_match"], matrix[:, MINUTES].tolist())]
+    keys = ["goals_per_match", "assists_per_match", "minutes_per_match", "goal_contribution",
+            "goals_per_90", "assists_per_90", "goal_contribution_per_90", *SHARE_METRICS]
+    return [dict(zip(keys, values)) if appearances > 0 else {}
+            for appearances, *values in zip(matrix[:, APPEARANCES].tolist(), *(columns[key] for key in keys))]
+
+
+def compute_team_metrics(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Métriques d'équipes (matrice équipes x TEAM_COLUMNS), ex. une ligue entière"""
+    played, wins, draws, goals_for, goals_against = matrix.T
+    return {
+        "win_percentage": _ratio(wins, played, 100),
+        "goals_per_match": _ratio(goals_for, played),
+        "goals_conceded_per_match": _ratio(goals_against, played),
+        "goal_difference": goals_for - goals_against,
+        "points_projection": _ratio(wins * 3 + draws, played, SEASON_MATCHES)
+    }
+
+
+def team_metrics(general: Dict[str, Any]) -> Dict[str, Any]:
+    """`calculated_metrics` d'une équipe à partir de ses general_stats"""
+    matrix = np.array([[general.get(column, 0) or 0 for column in TEAM_COLUMNS]], dtype=np.float64)
+    metrics = {name: values[0].item() for name, values in compute_team_metrics(matrix).items()}
+    return {
+        "win_percentage": round(metrics["win_percentage"], 1),
+        "goals_per_match": round(metrics["goals_per_match"], 2),
+        "goals_conceded_per_match": round(metrics["goals_conceded_per_match"], 2),
+        "goal_difference": int(metrics["goal_difference"]),
+        "points_projection": round(metrics["points_projection"], 0)
+    }
+
+
+class SquadMetrics:
+    __slots__ = ("ids", "matrix", "rows")
+
+    def __init__(self, ids: Tuple[Optional[int], ...], matrix: np.ndarray, rows: List[Dict[str, Any]]):
+        self.ids = ids
+        self.matrix = matrix
+        self.rows = rows
+
+
+class MetricsEngine:
+    """
+    Métriques dérivées des joueurs, calculées par effectif entier et mémorisées
+    par (équipe, ligue, saison). Un effectif dont les statistiques n'ont pas
+    changé n'est pas recalculé. Les parts de l'équipe sont toujours calculées
+    sur l'effectif complet ; la fiche d'un joueur les laisse à None plutôt
+    que de charger cet effectif.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._squads: "OrderedDict[Hashable, SquadMetrics]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def squad(self, team_id: int, league: int, season: int,
+              player_items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """`calculated_stats` de chaque joueur, dans l'ordre de player_items"""
+        key = (team_id, league, season)
+        ids = tuple((item.get("player") or {}).get("id") for item in player_items)
+        matrix = player_columns(player_items)
+
+        cached = self._squads.get(key)
+        if cached is not None and cached.ids == ids and np.array_equal(cached.matrix, matrix):
+            self._squads.move_to_end(key)
+            self.hits += 1
+            return cached.rows
+
+        self.misses += 1
+        rows = player_metrics_rows(matrix, compute_player_metrics(matrix))
+        self._squads[key] = SquadMetrics(ids, matrix, rows)
+        self._squads.move_to_end(key)
+        while len(self._squads) > self.max_entries:
+            self._squads.popitem(last=False)
+        return rows
+
+    def player(self, player_item: Dict[str, Any], league: int, season: int,
+               squad_items: Optional[Sequence[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        `calculated_stats` d'un joueur, parts calculées sur l'effectif complet
+        de son équipe ; squad_items=None (effectif inconnu) : parts à None
+        """
+        if squad_items is None:
+            matrix = player_columns([player_item])
+            row = player_metrics_rows(matrix, compute_player_metrics(matrix))[0]
+            return {**row, **dict.fromkeys(SHARE_METRICS)} if row else row
+
+        statistics = player_item.get("statistics", [{}])[0] if player_item.get("statistics") else {}
+        team_id = (statistics.get("team") or {}).get("id")
+        player_id = (player_item.get("player") or {}).get("id")
+        rows = self.squad(team_id, league, season, squad_items)
+        cached = self._squads[(team_id, league, season)]
+        row = player_columns([player_item])
+
+        if player_id in cached.ids:
+            position = cached.ids.index(player_id)
+            if np.array_equal(cached.matrix[position], row[0]):
+                return rows[position]
+            # Fiche du joueur plus récente que l'effectif : ses chiffres remplacent la ligne
+            matrix = cached.matrix.copy()
+            matrix[position] = row[0]
+        else:
+            # Joueur absent de l'effectif (arrivé en cours de saison) : ajouté au total
+            position = len(cached.ids)
+            matrix = np.vstack([cached.matrix, row])
+        return player_metrics_rows(matrix, compute_player_metrics(matrix))[position]
+
+    def clear(self):
+        self._squads.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"squads": len(self._squads), "hits": self.hits, "misses": self.misses}
+
+
+# Instance globale
+metrics_engine = MetricsEngine(settings.metrics_cache_max_entries)
@@ -0,0 +1,31 @@
+# backend/app/services/payloads.py - DÉCODAGE DES RÉPONSES API-SPORTS
+import json
+from typing import Any, Dict, Union
+
+try:
+    import msgspec
+    _untyped_decoder = msgspec.json.Decoder()
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def decoder_name() -> str:
+    if MSGSPEC_AVAILABLE:
+        return "msgspec"
+    return "orjson" if ORJSON_AVAILABLE else "json"
+
+
+def decode(raw: Union[bytes, str]) -> Dict[str, Any]:
+    """Corps JSON -> dicts Python, avec le décodeur le plus rapide disponible"""
+    if MSGSPEC_AVAILABLE:
+        return _untyped_decoder.decode(raw)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -0,0 +1,89 @@
+# backend/app/services/planner.py - GRAPHE D'APPELS UPSTREAM EN PARALLÈLE
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Union
+from app.services.upstream import gateway, make_api_request
+from app.services import request_context
+
+Params = Union[Dict[str, Any], Callable[[Dict[str, Any]], Dict[str, Any]]]
+Fetcher = Callable[[str, dict], Awaitable[Dict[str, Any]]]
+
+
+class UpstreamPlan:
+    """
+    Graphe d'appels upstream d'un endpoint composite.
+    Chaque appel démarre dès que ses dépendances sont terminées : les appels
+    indépendants partent tous en même temps, et la latence totale tend vers
+    celle de l'appel le plus lent. Les jetons de quota de tous les appels sont
+    réservés avant le premier envoi : un plan qui ne peut pas passer est
+    refusé (429) sans avoir consommé de quota.
+
+        plan = UpstreamPlan()
+        plan.add("team", "teams", {"id": team_id})
+        plan.add("standings", "standings", {"league": league, "season": season})
+        plan.add("venue", "venues", lambda r: {"id": r["team"]["response"][0]["venue"]["id"]}, after=["team"])
+        results = await plan.run()
+    """
+
+    def __init__(self, fetch: Optional[Fetcher] = None):
+        self._fetch = fetch or make_api_request
+        self._calls: Dict[str, tuple] = {}
+
+    def add(self, name: str, endpoint: str, params: Params, after: Iterable[str] = ()) -> "UpstreamPlan":
+        """params peut être une fonction des résultats des dépendances"""
+        self._calls[name] = (endpoint, params, tuple(after))
+        return self
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._calls
+
+    async def run(self) -> Dict[str, Dict[str, Any]]:
+        for name, (_, _, after) in self._calls.items():
+            missing = [dep for dep in after if dep not in self._calls]
+            if missing:
+                raise ValueError(f"Appel '{name}' dépend d'appels inconnus: {missing}")
+        self._check_acyclic()
+
+        reservation = None
+        if request_context.reservation() is None:
+            reservation = await gateway.reserve(
+                (endpoint, None if callable(params) else params) for endpoint, params, _ in self._calls.values()
+            )
+        token = request_context.use_reservation(reservation) if reservation is not None else None
+        try:
+            return await self._run_calls()
+        finally:
+            if reservation is not None:
+                request_context.end_reservation(token)
+                reservation.release()
+
+    async def _run_calls(self) -> Dict[str, Dict[str, Any]]:
+        results: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[str, asyncio.Future] = {}
+
+        async def run_call(name: str) -> Dict[str, Any]:
+            endpoint, params, after = self._calls[name]
+            if after:
+                await asyncio.gather(*(tasks[dep] for dep in after))
+            resolved = params(results) if callable(params) else params
+            results[name] = await self._fetch(endpoint, resolved)
+            return results[name]
+
+        for name in self._calls:
+            tasks[name] = asyncio.ensure_future(run_call(name))
+
+        outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        return results
+
+    def _check_acyclic(self):
+        remaining = {name: set(after) for name, (_, _, after) in self._calls.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dépendances circulaires entre: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
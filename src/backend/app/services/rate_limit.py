@@ -0,0 +1,241 @@
+# backend/app/services/rate_limit.py - BUDGET DE QUOTA API-SPORTS
+import asyncio
+import time
+from typing import Any, Dict, Mapping, Optional
+
+# Priorités d'appel : le trafic interactif (requêtes clients) passe avant
+# les rafraîchissements en arrière-plan, qui ne touchent pas à la réserve
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+
+class QuotaExceeded(Exception):
+    """Budget épuisé : l'appel ne doit pas partir vers l'API"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class QuotaReservation:
+    """Jetons pris d'avance pour tous les appels d'un plan ; ceux qui ne servent pas sont rendus"""
+
+    __slots__ = ("budget", "remaining")
+
+    def __init__(self, budget: "QuotaBudget", count: int):
+        self.budget = budget
+        self.remaining = count
+
+    def take(self) -> bool:
+        """Consommer un jeton réservé (False si la réservation est épuisée)"""
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        self.budget.reserved -= 1
+        return True
+
+    def release(self):
+        if self.remaining > 0:
+            self.budget.reserved -= self.remaining
+            self.budget._give_back(self.remaining)
+            self.remaining = 0
+
+
+class QuotaBudget:
+    """
+    Seau à jetons alimenté par les en-têtes de quota d'api-sports :
+    - x-ratelimit-requests-limit / -remaining : quota journalier
+    - X-RateLimit-Limit / -Remaining : quota par minute
+    Les appels attendent leur jeton dans une file, le débit est lissé sous le
+    plafond par minute, et une part du quota journalier est réservée au trafic
+    interactif. La rafale suit le quota par minute (jamais plus de jetons que
+    X-RateLimit-Remaining) : un plan de N appels réserve ses N jetons d'un coup,
+    ou est refusé avant le premier envoi.
+    """
+
+    def __init__(self, per_minute: int, daily: int, burst: int, headroom: float,
+                 interactive_reserve: float, max_wait: float):
+        self.per_minute = per_minute
+        self.daily_limit = daily
+        self.daily_remaining: Optional[int] = None
+        self.minute_remaining: Optional[int] = None
+        self.burst = burst
+        self.headroom = headroom
+        self.interactive_reserve = interactive_reserve
+        self.max_wait = max_wait
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._queue: Optional[asyncio.Lock] = None
+        self._queue_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+        self.reserved = 0  # Jetons réservés par des plans, pas encore envoyés
+        self.granted = 0
+        self.waited = 0
+        self.rejected = 0
+        self.rate_limited = 0
+
+    @property
+    def rate(self) -> float:
+        """Jetons par seconde, sous le plafond par minute"""
+        return max(self.per_minute * (1 - self.headroom), 1) / 60.0
+
+    @property
+    def capacity(self) -> int:
+        """Taille du seau : le quota par minute (moins la marge), au moins `burst`"""
+        return max(self.burst, int(self.per_minute * (1 - self.headroom)))
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _give_back(self, count: int):
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + count)
+        self.granted -= count
+        if self.daily_remaining is not None:
+            self.daily_remaining += count
+
+    def _check_daily(self, priority: str, count: int = 1):
+        if self.daily_remaining is None:
+            return
+        if self.daily_remaining < count:
+            raise QuotaExceeded("Quota journalier API épuisé")
+        reserve = int(self.daily_limit * self.interactive_reserve)
+        if priority != INTERACTIVE and self.daily_remaining - count < reserve:
+            raise QuotaExceeded("Quota journalier réservé au trafic interactif")
+
+    async def acquire(self, priority: str = INTERACTIVE):
+        """Attendre un jeton (file FIFO) ou lever QuotaExceeded"""
+        try:
+            self._check_daily(priority)
+        except QuotaExceeded:
+            self.rejected += 1
+            raise
+
+        deadline = time.monotonic() + self.max_wait
+        self._waiting += 1
+        try:
+            async with self._get_queue():
+                return await self._take_token(deadline)
+        finally:
+            self._waiting -= 1
+
+    async def reserve(self, count: int, priority: str = INTERACTIVE) -> QuotaReservation:
+        """
+        Réserver `count` jetons d'un coup (appels d'un même plan). Lève
+        QuotaExceeded sans rien consommer si le lot ne peut pas être servi
+        dans le délai max_wait.
+        """
+        try:
+            self._check_daily(priority, count)
+            if count > self.capacity:
+                raise QuotaExceeded("Requête trop coûteuse pour le quota API par minute")
+        except QuotaExceeded:
+            self.rejected += 1
+            raise
+
+        deadline = time.monotonic() + self.max_wait
+        self._waiting += 1
+        try:
+            async with self._get_queue():
+                await self._take_token(deadline, count)
+        finally:
+            self._waiting -= 1
+        self.reserved += count
+        return QuotaReservation(self, count)
+
+    def _get_queue(self) -> asyncio.Lock:
+        """File d'attente liée à la boucle courante (recréée si la boucle change)"""
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._queue_loop is not loop:
+            self._queue = asyncio.Lock()
+            self._queue_loop = loop
+        return self._queue
+
+    def try_acquire(self, priority: str = INTERACTIVE) -> bool:
+        """Prendre un jeton sans attendre (appels optionnels comme le hedging)"""
+        try:
+            self._check_daily(priority)
+        except QuotaExceeded:
+            return False
+        self._refill()
+        if self._waiting or time.monotonic() < self._paused_until or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.granted += 1
+        if self.daily_remaining is not None:
+            self.daily_remaining -= 1
+        return True
+
+    async def _take_token(self, deadline: float, count: int = 1):
+        while True:
+            self._refill()
+            now = time.monotonic()
+            if now >= self._paused_until and self._tokens >= count:
+                self._tokens -= count
+                self.granted += count
+                if self.daily_remaining is not None:
+                    self.daily_remaining -= count  # Estimation jusqu'aux prochains en-têtes
+                return
+            wait = max(self._paused_until - now, (count - self._tokens) / self.rate)
+            # Refus immédiat si l'attente dépasserait le délai : pas de sommeil inutile
+            if now + wait > deadline:
+                self.rejected += 1
+                raise QuotaExceeded("File d'attente du quota API saturée")
+            self.waited += 1
+            await asyncio.sleep(wait)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Recaler le budget sur les compteurs renvoyés par l'API"""
+        daily_limit = _header_int(headers, "x-ratelimit-requests-limit")
+        daily_remaining = _header_int(headers, "x-ratelimit-requests-remaining")
+        minute_limit = _header_int(headers, "x-ratelimit-limit")
+        minute_remaining = _header_int(headers, "x-ratelimit-remaining")
+
+        if daily_limit:
+            self.daily_limit = daily_limit
+        if daily_remaining is not None:
+            self.daily_remaining = daily_remaining - self.reserved
+        if minute_limit:
+            self.per_minute = minute_limit
+        if minute_remaining is not None:
+            self.minute_remaining = minute_remaining
+            # Ne jamais avoir plus de jetons que ce que l'API accepte encore
+            # (hors jetons déjà réservés par des plans en cours)
+            self._refill()
+            self._tokens = min(self._tokens, float(max(0, minute_remaining - self.reserved)))
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        """L'API a répondu 429 : vider le seau et suspendre les appels"""
+        self.rate_limited += 1
+        self._tokens = 0.0
+        pause = retry_after if retry_after is not None else 60 - (time.time() % 60)
+        self._paused_until = time.monotonic() + pause
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "per_minute_limit": self.per_minute,
+            "minute_remaining": self.minute_remaining,
+            "daily_limit": self.daily_limit,
+            "daily_remaining": self.daily_remaining,
+            "interactive_reserve": int(self.daily_limit * self.interactive_reserve),
+            "tokens_available": round(self._tokens, 2),
+            "burst_capacity": self.capacity,
+            "queued": self._waiting,
+            "reserved": self.reserved,
+            "granted": self.granted,
+            "waited": self.waited,
+            "rejected": self.rejected,
+            "rate_limited_responses": self.rate_limited
+        }
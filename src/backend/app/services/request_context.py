@@ -0,0 +1,79 @@
+# backend/app/services/request_context.py - SUIVI DES DONNÉES UPSTREAM PAR REQUÊTE
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class RequestStats:
+    """Ce que la requête HTTP en cours a consommé auprès de la passerelle"""
+    payloads_served: int = 0
+    max_age: float = 0.0  # Âge (s) de la donnée la plus ancienne servie
+    stale: bool = False   # Au moins une donnée expirée servie (stale-while-revalidate)
+    upstream_calls: int = 0  # Requêtes réseau réellement envoyées à l'API
+    loader_hits: int = 0     # Appels dédupliqués par le loader de la requête
+    loads: Dict[Any, Any] = field(default_factory=dict, repr=False)  # Clé -> tâche (loader)
+    deps: List[Any] = field(default_factory=list, repr=False)  # Données dont dépend la réponse
+    cacheable: bool = True   # Faux si une donnée de secours (erreur, expirée) a été servie
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("upstream_request_stats", default=None)
+_reservation: ContextVar[Optional[Any]] = ContextVar("quota_reservation", default=None)
+
+
+def begin_request() -> RequestStats:
+    """Ouvrir le suivi pour la requête en cours (appelé par le middleware)"""
+    stats = RequestStats()
+    _current.set(stats)
+    return stats
+
+
+def detach():
+    """Détacher la tâche courante de la requête (rafraîchissements en arrière-plan)"""
+    _current.set(None)
+    _reservation.set(None)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def use_reservation(reservation: Any) -> Token:
+    """Jetons de quota réservés pour les appels lancés depuis la tâche courante (plan)"""
+    return _reservation.set(reservation)
+
+
+def end_reservation(token: Token):
+    _reservation.reset(token)
+
+
+def reservation() -> Optional[Any]:
+    return _reservation.get()
+
+
+def record_payload(age: float = 0.0, stale: bool = False):
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.payloads_served += 1
+    stats.max_age = max(stats.max_age, age)
+    stats.stale = stats.stale or stale
+
+
+def record_dependency(dep: Any):
+    """Donnée servie dont dépend la réponse (objet exposant is_current())"""
+    stats = _current.get()
+    if stats is not None:
+        stats.deps.append(dep)
+
+
+def mark_uncacheable():
+    stats = _current.get()
+    if stats is not None:
+        stats.cacheable = False
+
+
+def record_upstream_call():
+    stats = _current.get()
+    if stats is not None:
+        stats.upstream_calls += 1
@@ -0,0 +1,172 @@
+# backend/app/services/resilience.py - TIMEOUTS ADAPTATIFS ET DISJONCTEURS
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional
+from app.config.settings import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class LatencyTracker:
+    """
+    Latences récentes par endpoint upstream (fenêtre glissante).
+    Un timeout compte comme un échantillon censuré (au moins la durée du
+    timeout) et double le timeout suivant : après un ralentissement général,
+    le timeout remonte au lieu de rester bloqué sous la nouvelle latence.
+    La requête perdante d'un hedging, annulée, compte aussi (temps écoulé).
+    """
+
+    def __init__(self, window: int):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._timeouts: Dict[str, int] = defaultdict(int)  # Timeouts consécutifs
+
+    def record(self, endpoint: str, seconds: float):
+        self._samples[endpoint].append(seconds)
+        self._timeouts.pop(endpoint, None)
+
+    def record_timeout(self, endpoint: str, timeout: float):
+        self.record_lower_bound(endpoint, timeout)
+        self._timeouts[endpoint] += 1
+
+    def record_lower_bound(self, endpoint: str, seconds: float):
+        """Échantillon censuré : la réponse aurait pris au moins `seconds` (timeout, doublon annulé)"""
+        self._samples[endpoint].append(seconds)
+
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        samples = self._samples.get(endpoint)
+        if not samples or len(samples) < settings.latency_min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Timeout dérivé du p99 observé, doublé à chaque timeout consécutif, borné par la configuration"""
+        if not settings.timeout_adaptive:
+            return settings.upstream_timeout
+        p99 = self.percentile(endpoint, 0.99)
+        if p99 is None:
+            return settings.upstream_timeout
+        timeout = max(settings.timeout_min, p99 * settings.timeout_multiplier)
+        return min(settings.upstream_timeout, timeout * 2 ** self._timeouts.get(endpoint, 0))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            endpoint: {
+                "samples": len(samples),
+                "p50_ms": self._ms(self.percentile(endpoint, 0.5)),
+                "p95_ms": self._ms(self.percentile(endpoint, 0.95)),
+                "p99_ms": self._ms(self.percentile(endpoint, 0.99)),
+                "timeout_s": round(self.timeout_for(endpoint), 2),
+                "consecutive_timeouts": self._timeouts.get(endpoint, 0)
+            }
+            for endpoint, samples in self._samples.items()
+        }
+
+    @staticmethod
+    def _ms(value: Optional[float]) -> Optional[int]:
+        return int(value * 1000) if value is not None else None
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur d'un endpoint upstream :
+    - fermé : les appels passent, les échecs consécutifs sont comptés
+    - ouvert : échec immédiat pendant breaker_reset_timeout secondes
+    - semi-ouvert : un seul appel d'essai, qui referme ou rouvre le circuit
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+        if self.state == HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def release_probe(self):
+        """L'appel d'essai n'est finalement pas parti (quota) : en autoriser un autre"""
+        self.probe_in_flight = False
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probe_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                print(f"🚨 Circuit ouvert après {self.failures} échec(s)")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class CircuitBreakers:
+    """Un disjoncteur par endpoint upstream"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(settings.breaker_failure_threshold, settings.breaker_reset_timeout)
+            self._breakers[endpoint] = breaker
+        return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        return {endpoint: breaker.stats() for endpoint, breaker in self._breakers.items()}
+
+
+class HedgeBudget:
+    """
+    Limite les requêtes dupliquées (hedging) à une fraction des appels
+    upstream, pour que le gain de latence ne consomme pas le quota.
+    """
+
+    def __init__(self, max_fraction: float):
+        self.max_fraction = max_fraction
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record_call(self):
+        self.calls += 1
+
+    def allow(self) -> bool:
+        if self.hedges + 1 > self.calls * self.max_fraction:
+            return False
+        self.hedges += 1
+        return True
+
+    def release(self):
+        """Doublon autorisé mais finalement pas envoyé (pas de jeton de quota) : le rendre"""
+        self.hedges = max(0, self.hedges - 1)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "max_fraction": self.max_fraction
+        }
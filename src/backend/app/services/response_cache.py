@@ -0,0 +1,127 @@
+# backend/app/services/response_cache.py - RÉPONSES JSON PRÉ-SÉRIALISÉES
+import functools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from app.config.settings import settings
+from app.services import request_context
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # Repli sur le module json standard
+    import json
+    ORJSON_AVAILABLE = False
+
+
+def dumps(data: Any) -> bytes:
+    """Encoder en JSON UTF-8 (orjson si disponible)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class JSONBytesResponse(Response):
+    """Réponse JSON dont le corps est déjà encodé"""
+    media_type = "application/json"
+
+
+@dataclass
+class MemoEntry:
+    body: bytes
+    deps: List[Any]        # Dépendances relevées pendant la construction (is_current())
+    created_at: float
+    data_age: float        # Âge de la donnée la plus ancienne au moment de la construction
+
+    def is_current(self, now: float) -> bool:
+        return (
+            now - self.created_at < settings.response_memo_max_age
+            and all(dep.is_current() for dep in self.deps)
+        )
+
+
+class ResponseMemo:
+    """
+    Octets JSON déjà encodés par (endpoint, paramètres). Une entrée reste
+    servie tant que les données upstream dont elle dépend sont inchangées :
+    ni reconstruction du dict, ni nouvel encodage.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, MemoEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[MemoEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if not entry.is_current(time.time()):
+            del self._entries[key]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key: Hashable, entry: MemoEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / total, 3) if total else None,
+            "orjson": ORJSON_AVAILABLE
+        }
+
+
+# Instance globale
+response_memo = ResponseMemo(settings.response_memo_max_entries)
+
+
+def memoized_response(name: str):
+    """
+    Décorateur d'endpoint : sert les octets mémorisés si les données sous-jacentes
+    n'ont pas changé, sinon exécute l'endpoint et mémorise sa réponse encodée.
+    Les réponses construites à partir de données de secours ne sont pas mémorisées.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = (name, tuple(sorted(kwargs.items())))
+            stats = request_context.current()
+
+            entry = response_memo.get(key) if settings.response_memo_enabled else None
+            if entry is not None:
+                request_context.record_payload(entry.data_age + time.time() - entry.created_at)
+                for dep in entry.deps:
+                    request_context.record_dependency(dep)
+                return JSONBytesResponse(entry.body)
+
+            result = await func(**kwargs)
+            if isinstance(result, Response):
+                return result
+            body = dumps(result)
+            if settings.response_memo_enabled and stats is not None and stats.cacheable \
+                    and not stats.stale and stats.deps:
+                response_memo.set(key, MemoEntry(body, list(stats.deps), time.time(), stats.max_age))
+            return JSONBytesResponse(body)
+        return wrapper
+    return decorator
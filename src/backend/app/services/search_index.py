@@ -0,0 +1,325 @@
+# backend/app/services/search_index.py - INDEX LOCAL DE RECHERCHE (ÉQUIPES, JOUEURS)
+import bisect
+import heapq
+import re
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from itertools import chain
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from app.config.settings import settings
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+RESULTS_CACHE_SIZE = 1000  # Dernières requêtes sans filtre (la saisie repasse par les mêmes préfixes)
+FUZZY_TIER = 3  # Rang des correspondances approchées (0 exact, 1 début du nom, 2 débuts de mots)
+
+
+def fold(text: Optional[str]) -> str:
+    """Minuscules sans accents ni ponctuation : "Saint-Étienne" -> "saint etienne" """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def trigrams(folded: str, partial: bool = False) -> Set[str]:
+    """
+    Trigrammes de chaque mot, bornés par des espaces ("  psg " -> "  p", " ps", ...).
+    partial=True : dernier mot en cours de frappe, sans borne de fin.
+    """
+    words = folded.split()
+    grams = set()
+    for position, word in enumerate(words):
+        padded = f"  {word}" if partial and position == len(words) - 1 else f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class IndexEntry:
+    __slots__ = ("id", "name", "folded", "words", "doc", "weight", "contexts", "rank")
+
+    def __init__(self, entity_id: int, name: str, doc: Dict[str, Any]):
+        self.id = entity_id
+        self.name = name
+        self.folded = fold(name)
+        self.words: Set[str] = set()  # Mots indexés : nom + alias (ex. code "PSG")
+        self.doc = doc
+        self.weight = 0.0
+        self.contexts: Set[Hashable] = set()
+        self.rank = (0.0, len(self.folded))  # Départage : popularité décroissante, nom court d'abord
+
+    @property
+    def popularity(self) -> float:
+        return self.weight + len(self.contexts)
+
+
+class SearchIndex:
+    """
+    Index de recherche en mémoire d'un type d'entité :
+    - préfixes de mots (liste triée + dichotomie) pour la saisie au fil de l'eau,
+      y compris 1 ou 2 caractères ;
+    - trigrammes pour les fautes de frappe ("marseile" -> "Marseille").
+    Résultats classés par pertinence puis popularité (contextes où l'entité
+    a été vue + poids fourni, ex. minutes jouées).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.entries: Dict[int, IndexEntry] = {}
+        self._words: List[Tuple[str, int]] = []          # (mot, id) triés
+        self._postings: Dict[str, Set[int]] = {}         # trigramme -> ids
+        self._results: "OrderedDict[Tuple[str, int], Tuple[int, List[Dict[str, Any]]]]" = OrderedDict()
+        self.version = 0  # Incrémenté à chaque changement pouvant modifier un résultat
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entity_id: Optional[int], name: Optional[str], doc: Dict[str, Any],
+            context: Hashable = None, weight: float = 0.0, partial: bool = False,
+            aliases: Iterable[Optional[str]] = ()):
+        """
+        Ajouter ou mettre à jour une entité. Un doc partiel (équipe vue dans un
+        classement ou un match) ne fait que compléter les champs manquants.
+        """
+        if entity_id is None or not name:
+            return
+        entry = self.entries.get(entity_id)
+        if entry is not None and entry.name != name:
+            self._unindex(entry)
+            entry = None
+        if entry is None:
+            entry = self.entries[entity_id] = IndexEntry(entity_id, name, dict(doc))
+        elif partial:
+            entry.doc.update((key, value) for key, value in doc.items() if entry.doc.get(key) is None)
+        else:
+            entry.doc.update(doc)
+        popularity = entry.popularity
+        if context is not None:
+            entry.contexts.add(context)
+        entry.weight = max(entry.weight, weight)
+        if entry.popularity != popularity:
+            entry.rank = (-entry.popularity, len(entry.folded))
+            self.version += 1
+
+        words = {word for text in (name, *aliases) for word in fold(text).split()}
+        if not words <= entry.words:
+            self._unindex(entry)
+            entry.words |= words
+            self._index(entry)
+            self.version += 1
+
+    def _index(self, entry: IndexEntry):
+        for word in entry.words:
+            bisect.insort(self._words, (word, entry.id))
+        for gram in trigrams(" ".join(entry.words)):
+            self._postings.setdefault(gram, set()).add(entry.id)
+
+    def _unindex(self, entry: IndexEntry):
+        for word in entry.words:
+            position = bisect.bisect_left(self._words, (word, entry.id))
+            if position < len(self._words) and self._words[position] == (word, entry.id):
+                del self._words[position]
+        for gram in trigrams(" ".join(entry.words)):
+            self._postings.get(gram, set()).discard(entry.id)
+
+    def _prefixed(self, prefix: str) -> Set[int]:
+        start = bisect.bisect_left(self._words, (prefix,))
+        end = bisect.bisect_left(self._words, (prefix + "\uffff",), start)
+        return {entity_id for _, entity_id in self._words[start:end]}
+
+    def search(self, query: str, limit: Optional[int] = None,
+               accept=None) -> List[Dict[str, Any]]:
+        """
+        Docs des entités correspondant à `query`, les plus pertinentes d'abord.
+        `accept(entry)` filtre les candidats (pays, ligue...).
+        """
+        direct, fuzzy = self.lookup(query, limit, accept)
+        return direct + fuzzy
+
+    def lookup(self, query: str, limit: Optional[int] = None,
+               accept=None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        (correspondances exactes ou par préfixe, correspondances approchées) :
+        seules les premières prouvent que l'entité cherchée est dans l'index
+        """
+        limit = limit or settings.search_index_limit
+        folded = fold(query)
+        if not folded:
+            return [], []
+        cached = self._results.get((folded, limit)) if accept is None else None
+        if cached is not None and cached[0] == self.version:
+            self._results.move_to_end((folded, limit))
+            self.hits += 1
+            return cached[1]
+
+        # 1. Tous les mots de la requête sont des débuts de mots du nom
+        matched = set.intersection(*(self._prefixed(word) for word in folded.split()))
+        scored: Dict[int, Tuple[int, float]] = dict.fromkeys(matched, (2, 0.0))
+        for entity_id in matched:
+            name = self.entries[entity_id].folded
+            if name.startswith(folded):
+                scored[entity_id] = (0 if name == folded else 1, 0.0)
+
+        # 2. Recherche approchée par trigrammes (fautes de frappe)
+        if len(folded) >= 3 and len(scored) < limit:
+            grams = trigrams(folded, partial=True)
+            counts = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in grams))
+            threshold = settings.search_index_min_similarity * len(grams)
+            for entity_id, count in counts.items():
+                if count >= threshold and entity_id not in scored:
+                    scored[entity_id] = (FUZZY_TIER, -count / len(grams))
+
+        entries = self.entries
+        candidates = ((tier, similarity, entries[entity_id].rank, entity_id)
+                      for entity_id, (tier, similarity) in scored.items())
+        if accept is not None:
+            candidates = (candidate for candidate in candidates if accept(entries[candidate[3]]))
+        best = heapq.nsmallest(limit, candidates)
+        results = ([entries[candidate[3]].doc for candidate in best if candidate[0] < FUZZY_TIER],
+                   [entries[candidate[3]].doc for candidate in best if candidate[0] == FUZZY_TIER])
+        if best:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if accept is None:
+            self._results[(folded, limit)] = (self.version, results)
+            while len(self._results) > RESULTS_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "words": len(self._words),
+            "trigrams": len(self._postings),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def with_fuzzy(results: List[Dict[str, Any]], fuzzy: List[Dict[str, Any]],
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compléter des résultats (API) par les correspondances approchées de l'index, sans doublon"""
+    limit = limit or settings.search_index_limit
+    seen = {doc.get("id") for doc in results}
+    return (results + [doc for doc in fuzzy if doc.get("id") not in seen])[:max(limit, len(results))]
+
+
+# ============= DOCUMENTS (format des réponses de recherche) =============
+
+def team_doc(team: Dict[str, Any], country: Optional[str] = None) -> Dict[str, Any]:
+    """Équipe au format de /api/teams/search"""
+    return {
+        "id": team.get("id"),
+        "name": team.get("name"),
+        "country": team.get("country") or country,
+        "logo": team.get("logo"),
+        "founded": team.get("founded"),
+        "national": team.get("national", False),
+        "code": team.get("code")
+    }
+
+
+def player_doc(player_item: Dict[str, Any]) -> Dict[str, Any]:
+    """Joueur (réponse `players`) au format de /api/players/search"""
+    player = player_item["player"]
+    statistics = player_item.get("statistics", [{}])[0] if player_item.get("statistics") else {}
+
+    # Équipe actuelle
+    current_team = None
+    if statistics.get("team"):
+        current_team = {
+            "id": statistics["team"]["id"],
+            "name": statistics["team"]["name"],
+            "logo": statistics["team"]["logo"]
+        }
+
+    return {
+        "id": player["id"],
+        "name": player["name"],
+        "age": player.get("age"),
+        "nationality": player.get("nationality"),
+        "photo": player.get("photo"),
+        "current_team": current_team,
+        "performance": {
+            "position": statistics.get("games", {}).get("position"),
+            "goals": statistics.get("goals", {}).get("total", 0),
+            "assists": statistics.get("goals", {}).get("assists", 0),
+            "appearances": statistics.get("games", {}).get("appearences", 0)
+        } if statistics else None
+    }
+
+
+# ============= ALIMENTATION DEPUIS LES RÉPONSES UPSTREAM =============
+
+class SearchIndexes:
+    """Index des équipes et des joueurs, alimentés par chaque réponse reçue de l'API"""
+
+    def __init__(self):
+        self.teams = SearchIndex("teams")
+        self.players = SearchIndex("players")
+        self.ingested = 0
+        self.ingest_time = 0.0
+
+    def ingest(self, endpoint: str, payload: Dict[str, Any]):
+        if not settings.search_index_enabled or payload.get("errors"):
+            return
+        items = payload.get("response")
+        if not isinstance(items, list) or not items:
+            return
+        started = time.perf_counter()
+        if endpoint == "teams":
+            for item in items:
+                team = item.get("team") or {}
+                self.teams.add(team.get("id"), team.get("name"), team_doc(team), aliases=[team.get("code")])
+        elif endpoint == "standings":
+            for item in items:
+                league = item.get("league") or {}
+                for row in _flatten(league.get("standings") or []):
+                    team = row.get("team") or {}
+                    self.teams.add(team.get("id"), team.get("name"), team_doc(team, league.get("country")),
+                                   context=(league.get("id"), league.get("season")), partial=True)
+        elif endpoint == "fixtures":
+            for item in items:
+                league = item.get("league") or {}
+                for team in (item.get("teams") or {}).values():
+                    self.teams.add(team.get("id"), team.get("name"), team_doc(team, league.get("country")),
+                                   context=(league.get("id"), league.get("season")), partial=True)
+        elif endpoint in ("players", "players/topscorers"):
+            for item in items:
+                player = item.get("player") or {}
+                statistics = (item.get("statistics") or [{}])[0] or {}
+                league = statistics.get("league") or {}
+                games = statistics.get("games") or {}
+                self.players.add(player.get("id"), player.get("name"), player_doc(item),
+                                 context=(league.get("id"), league.get("season")),
+                                 weight=(games.get("minutes") or 0) / 90)
+        else:
+            return
+        self.ingested += 1
+        self.ingest_time += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "teams": self.teams.stats(),
+            "players": self.players.stats(),
+            "payloads_ingested": self.ingested,
+            "ingest_ms": round(self.ingest_time * 1000, 1)
+        }
+
+
+def _flatten(groups: Iterable[Any]) -> Iterable[Dict[str, Any]]:
+    """standings : liste de groupes (listes de lignes)"""
+    for group in groups:
+        if isinstance(group, list):
+            yield from group
+        elif isinstance(group, dict):
+            yield group
+
+
+# Instance globale
+search_indexes = SearchIndexes()
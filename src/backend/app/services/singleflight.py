@@ -0,0 +1,51 @@
+# backend/app/services/singleflight.py - FUSION DES APPELS IDENTIQUES EN VOL
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Fusionne les appels identiques simultanés : le premier appelant lance
+    la requête, les suivants attendent le même résultat au lieu de la
+    dupliquer vers l'API.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.coalesced_by_endpoint: Counter = Counter()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]], label: str = "") -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            self.coalesced_by_endpoint[label] += 1
+            print(f"🔗 Appel fusionné: {label}")
+        else:
+            self.leaders += 1
+            # Tâche indépendante : si le premier client se déconnecte,
+            # les autres reçoivent quand même la réponse
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        # shield : l'annulation d'un appelant n'annule pas l'appel partagé
+        return await asyncio.shield(task)
+
+    def is_running(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Marquer l'exception comme récupérée
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.leaders,
+            "coalesced_calls": self.coalesced,
+            "coalesced_by_endpoint": dict(self.coalesced_by_endpoint)
+        }
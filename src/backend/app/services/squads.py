@@ -0,0 +1,90 @@
+# backend/app/services/squads.py - EFFECTIFS COMPLETS ET FICHES JOUEUR DÉTAILLÉES
+from typing import Any, Dict, List, Optional
+from app.services.upstream import gateway, load
+from app.services.planner import UpstreamPlan
+
+
+async def fetch_squad_players(team_id: int, league: int, season: int) -> List[dict]:
+    """
+    Effectif complet d'une équipe, toutes pages de l'endpoint `players`
+    comprises (pages suivantes en parallèle). Les parts de l'équipe
+    (SHARE_METRICS) ne sont justes que sur cet effectif entier.
+    Appel strict : une page manquante lève UpstreamError au lieu de
+    renvoyer un effectif incomplet.
+    """
+    params = _squad_params(team_id, league, season)
+    first_page = await load("players", params)
+    plan = UpstreamPlan(load)
+    for page in _next_pages(first_page):
+        plan.add(f"page_{page}", "players", {**params, "page": page})
+    results = await plan.run() if "page_2" in plan else {}
+    pages = [first_page] + [results[f"page_{page}"] for page in _next_pages(first_page)]
+    return [player_item for data in pages for player_item in data.get("response", [])]
+
+
+async def cached_squad_players(team_id: int, league: int, season: int) -> Optional[List[dict]]:
+    """Effectif complet s'il est entièrement en cache (aucun appel upstream), sinon None"""
+    params = _squad_params(team_id, league, season)
+    if gateway.will_call_upstream("players", params):
+        return None
+    first_page = await load("players", params)
+    if any(gateway.will_call_upstream("players", {**params, "page": page}) for page in _next_pages(first_page)):
+        return None
+    return await fetch_squad_players(team_id, league, season)
+
+
+def _squad_params(team_id: int, league: int, season: int) -> Dict[str, Any]:
+    return {"team": team_id, "league": league, "season": season}
+
+
+def _next_pages(first_page: Dict[str, Any]) -> range:
+    total_pages = (first_page.get("paging") or {}).get("total", 1) or 1
+    return range(2, total_pages + 1)
+
+
+def build_detailed_player(player_item: dict, calculated_stats: dict) -> dict:
+    """
+    Joueur avec statistiques détaillées (réponse `players` d'api-sports).
+    calculated_stats : métriques de metrics_engine (calculées pour tout l'effectif)
+    """
+    player = player_item["player"]
+    statistics = player_item.get("statistics", [{}])[0] if player_item.get("statistics") else {}
+    
+    # Statistiques de jeu
+    games = statistics.get("games", {})
+    goals_stats = statistics.get("goals", {})
+    cards = statistics.get("cards", {})
+    
+    player_data = {
+        "id": player["id"],
+        "name": player["name"],
+        "age": player.get("age"),
+        "nationality": player.get("nationality"),
+        "height": player.get("height"),
+        "weight": player.get("weight"),
+        "photo": player.get("photo"),
+        "injured": player.get("injured", False),
+        
+        # Statistiques de performance - CORRECTION ICI
+        "performance": {
+            "position": games.get("position"),
+            "appearances": games.get("appearences", 0) or 0,  # ← CORRIGER
+            "minutes": games.get("minutes", 0) or 0,
+            "rating": games.get("rating"),
+            "captain": games.get("captain", False),
+            
+            # Buts et passes
+            "goals": goals_stats.get("total", 0) or 0,
+            "assists": goals_stats.get("assists", 0) or 0,
+            "saves": goals_stats.get("saves", 0) or 0,
+            
+            # Cartons
+            "yellow_cards": cards.get("yellow", 0) or 0,
+            "red_cards": cards.get("red", 0) or 0,
+        },
+        
+        # Calculs personnalisés
+        "calculated_stats": calculated_stats
+    }
+    
+    return player_data
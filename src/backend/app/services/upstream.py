@@ -0,0 +1,433 @@
+# backend/app/services/upstream.py - PASSERELLE UNIQUE VERS API-SPORTS
+import asyncio
+import time
+import httpx
+from typing import Any, Dict, Iterable, Optional, Tuple
+from fastapi import HTTPException
+from app.config.settings import settings
+from app.services.singleflight import SingleFlight
+from app.services.cache import CacheEntry, TTLCache, ttl_for, is_immutable, may_be_persisted, FOREVER
+from app.services.disk_cache import DiskCache
+from app.services.resilience import LatencyTracker, CircuitBreakers, HedgeBudget
+from app.services.rate_limit import QuotaBudget, QuotaExceeded, QuotaReservation, INTERACTIVE, BACKGROUND
+from app.services import request_context
+from app.services import payloads
+from app.services.search_index import search_indexes
+
+try:
+    import h2  # noqa: F401 - HTTP/2 disponible seulement si le paquet h2 est installé
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class UpstreamError(HTTPException):
+    """Erreur remontée par l'API Football (statut HTTP, timeout, connexion)"""
+
+    def __init__(self, status_code: int, detail: str, endpoint: str = ""):
+        super().__init__(status_code=status_code, detail=detail)
+        self.endpoint = endpoint
+
+
+RequestKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Paramètres triés, en chaînes, sans valeurs None (61 et "61" sont identiques)"""
+    return {k: str(v) for k, v in sorted((params or {}).items()) if v is not None}
+
+
+def make_request_key(endpoint: str, params: Optional[Dict[str, Any]]) -> RequestKey:
+    """Clé unique (endpoint, paramètres normalisés) d'un appel upstream"""
+    return (endpoint.strip("/"), tuple(normalize_params(params).items()))
+
+
+class CachedPayload:
+    """Dépendance d'une réponse mémorisée : valide tant que le cache sert ce même payload, frais"""
+
+    __slots__ = ("cache", "key", "value")
+
+    def __init__(self, cache: TTLCache, key: RequestKey, value: Any):
+        self.cache = cache
+        self.key = key
+        self.value = value
+
+    def _entry(self) -> Optional[CacheEntry]:
+        """Entrée fraîche, lue par peek() : une validation n'est ni un hit ni une lecture LRU"""
+        entry = self.cache.peek(self.key)
+        return entry if entry is not None and entry.is_fresh() else None
+
+    def is_current(self) -> bool:
+        entry = self._entry()
+        return entry is not None and entry.value is self.value
+
+    def remaining(self) -> Optional[float]:
+        """Secondes de fraîcheur restantes (None = n'expire pas)"""
+        entry = self._entry()
+        if entry is None:
+            return 0.0
+        if entry.expires_at is None:
+            return None
+        return max(0.0, entry.expires_at - time.time())
+
+
+class UpstreamGateway:
+    """
+    Point d'entrée unique vers l'API Football.
+    Un seul client httpx partagé (keep-alive, HTTP/2 optionnel) ouvert au
+    démarrage de l'application et fermé à l'arrêt.
+    """
+
+    def __init__(self):
+        self.base_url = settings.football_api_base_url
+        self.headers = {
+            "X-RapidAPI-Key": settings.football_api_key,
+            "X-RapidAPI-Host": "v3.football.api-sports.io"
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+        self.inflight = SingleFlight()
+        self.cache = TTLCache(settings.cache_max_entries, retention=settings.cache_stale_if_error)
+        self.disk = DiskCache(settings.disk_cache_path) if settings.disk_cache_enabled else None
+        self.budget = QuotaBudget(
+            per_minute=settings.quota_per_minute,
+            daily=settings.quota_daily,
+            burst=settings.quota_burst,
+            headroom=settings.quota_headroom,
+            interactive_reserve=settings.quota_interactive_reserve,
+            max_wait=settings.quota_max_wait
+        )
+        self.latency = LatencyTracker(settings.latency_window)
+        self.breakers = CircuitBreakers()
+        self.hedging = HedgeBudget(settings.hedge_max_fraction)
+        self.stale_if_error = 0
+        self.background_refreshes = 0
+        self._refresh_tasks = set()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=httpx.Timeout(settings.upstream_timeout, connect=settings.upstream_connect_timeout),
+            limits=httpx.Limits(
+                max_connections=settings.upstream_max_connections,
+                max_keepalive_connections=settings.upstream_max_keepalive,
+                keepalive_expiry=settings.upstream_keepalive_expiry
+            ),
+            http2=settings.upstream_http2 and HTTP2_AVAILABLE
+        )
+
+    async def start(self):
+        """Ouvrir le pool de connexions (appelé par le lifespan de l'app)"""
+        if self._client is None:
+            self._client = self._build_client()
+            if self.disk is not None:
+                await self.disk.start()
+            print(f"🔌 Pool upstream ouvert (HTTP/2: {settings.upstream_http2 and HTTP2_AVAILABLE})")
+
+    async def close(self):
+        """Fermer proprement le pool de connexions"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            print("🔌 Pool upstream fermé")
+        if self.disk is not None:
+            await self.disk.close()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Ouverture paresseuse si l'app n'est pas passée par le lifespan (scripts, shell)
+        if self._client is None:
+            self._client = self._build_client()
+        return self._client
+
+    async def _send(self, endpoint: str, params: Dict[str, Any]) -> httpx.Response:
+        timeout = self.latency.timeout_for(endpoint)
+        request_context.record_upstream_call()
+        started = time.monotonic()
+        try:
+            response = await self.client.get(
+                f"/{endpoint}",
+                params=params,
+                timeout=httpx.Timeout(timeout, connect=min(timeout, settings.upstream_connect_timeout))
+            )
+        except asyncio.CancelledError:
+            # Requête perdante d'un hedging : sa latence vaut au moins le temps écoulé,
+            # l'ignorer biaiserait le p95 (et donc le délai de hedging) vers le bas
+            self.latency.record_lower_bound(endpoint, time.monotonic() - started)
+            raise
+        except httpx.TimeoutException:
+            self.latency.record_timeout(endpoint, timeout)
+            print(f"⏰ Timeout API {endpoint} ({timeout:.1f}s)")
+            raise UpstreamError(504, "Timeout lors de l'appel à l'API Football", endpoint)
+        except httpx.HTTPError as e:
+            print(f"❌ Exception API {endpoint}: {e}")
+            raise UpstreamError(503, f"Erreur de connexion à l'API Football: {str(e)}", endpoint)
+        self.latency.record(endpoint, time.monotonic() - started)
+        return response
+
+    async def _send_hedged(self, endpoint: str, params: Dict[str, Any], priority: str) -> httpx.Response:
+        """
+        Si la réponse n'est pas arrivée au p95 observé de l'endpoint, lancer
+        une seconde requête identique : la première réponse valide l'emporte.
+        """
+        self.hedging.record_call()
+        delay = None
+        if settings.hedge_enabled and endpoint in settings.hedge_endpoints:
+            delay = self.latency.percentile(endpoint, settings.hedge_percentile)
+        if delay is None:
+            return await self._send(endpoint, params)
+
+        primary = asyncio.ensure_future(self._send(endpoint, params))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.hedging.allow():
+            return await primary
+        if settings.quota_enabled and not self.budget.try_acquire(priority):
+            self.hedging.release()  # Pas de jeton disponible : pas de doublon
+            return await primary
+
+        print(f"🏇 Hedging {endpoint} après {delay * 1000:.0f} ms")
+        hedge = asyncio.ensure_future(self._send(endpoint, params))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedging.hedge_wins += 1
+                        return task.result()
+            # Les deux requêtes ont échoué : remonter l'erreur de la principale
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def fetch(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                    priority: str = INTERACTIVE) -> Dict[str, Any]:
+        """
+        Appel strict : lève UpstreamError si l'API ne répond pas 200.
+        Servi depuis le cache si possible ; sinon les appels identiques
+        simultanés partagent une seule requête upstream.
+        """
+        endpoint = endpoint.strip("/")
+        params = normalize_params(params)
+        key = make_request_key(endpoint, params)
+
+        if settings.cache_enabled:
+            max_stale = settings.cache_max_stale if self._swr_allowed(endpoint, params) else 0
+            entry = self.cache.lookup(key, max_stale)
+            if entry is not None:
+                if entry.is_fresh():
+                    request_context.record_payload(entry.age())
+                    request_context.record_dependency(CachedPayload(self.cache, key, entry.value))
+                else:
+                    self._schedule_refresh(key, endpoint, params)
+                    request_context.record_payload(entry.age(), stale=True)
+                return entry.value
+
+        try:
+            data = await self.inflight.do(key, lambda: self._load(key, endpoint, params, priority), endpoint)
+        except UpstreamError as e:
+            # API en panne ou circuit ouvert : servir la dernière donnée connue
+            if e.status_code >= 500 and settings.cache_enabled:
+                entry = self.cache.lookup(key, settings.cache_stale_if_error)
+                if entry is not None:
+                    self.stale_if_error += 1
+                    print(f"🛟 API indisponible, donnée en cache servie: {endpoint} {params}")
+                    request_context.record_payload(entry.age(), stale=True)
+                    return entry.value
+            raise
+        request_context.record_payload()
+        request_context.record_dependency(CachedPayload(self.cache, key, data))
+        return data
+
+    def _swr_allowed(self, endpoint: str, params: Dict[str, str]) -> bool:
+        return (
+            settings.cache_swr_enabled
+            and endpoint in settings.cache_swr_endpoints
+            and not params.get("live")
+        )
+
+    def _schedule_refresh(self, key: RequestKey, endpoint: str, params: Dict[str, str]):
+        """Un seul rafraîchissement en arrière-plan par clé"""
+        if self.inflight.is_running(key):
+            return
+        self.background_refreshes += 1
+        print(f"♻️ Donnée expirée servie, rafraîchissement: {endpoint} {params}")
+        task = asyncio.ensure_future(self._refresh(key, endpoint, params))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: RequestKey, endpoint: str, params: Dict[str, str]):
+        request_context.detach()
+        try:
+            await self.inflight.do(key, lambda: self._load(key, endpoint, params, BACKGROUND), endpoint)
+        except Exception as e:
+            # L'entrée expirée reste servie jusqu'à cache_max_stale
+            print(f"❌ Rafraîchissement échoué {endpoint}: {e}")
+
+    async def _load(self, key: RequestKey, endpoint: str, params: Dict[str, str],
+                    priority: str = INTERACTIVE) -> Dict[str, Any]:
+        """Cache disque (données immuables) puis réseau"""
+        if self.disk is not None and may_be_persisted(endpoint, params):
+            stored = await self.disk.get(key)
+            if stored is not None:
+                print(f"💾 Cache disque: {endpoint} {params}")
+                if settings.cache_enabled:
+                    self.cache.set(key, stored[0], FOREVER)
+                search_indexes.ingest(endpoint, stored[0])
+                return stored[0]
+
+        data = await self._fetch_upstream(key, endpoint, params, priority)
+        search_indexes.ingest(endpoint, data)
+
+        if self.disk is not None and is_immutable(endpoint, params, data):
+            await self.disk.put(key, endpoint, data)
+        return data
+
+    async def _fetch_upstream(self, key: RequestKey, endpoint: str, params: Dict[str, str],
+                              priority: str = INTERACTIVE) -> Dict[str, Any]:
+        breaker = self.breakers.get(endpoint)
+        if not breaker.allow():
+            raise UpstreamError(503, "API Football indisponible (circuit ouvert)", endpoint)
+
+        if settings.quota_enabled:
+            reservation = request_context.reservation()
+            try:
+                if reservation is None or not reservation.take():
+                    await self.budget.acquire(priority)
+            except QuotaExceeded as e:
+                breaker.release_probe()
+                print(f"⚠️ Budget API: {e.reason}")
+                raise UpstreamError(429, e.reason, endpoint)
+
+        print(f"🔍 API Call: {endpoint} avec params: {params}")
+
+        try:
+            response = await self._send_hedged(endpoint, params, priority)
+        except UpstreamError:
+            breaker.record_failure()
+            raise
+        self.budget.update_from_headers(response.headers)
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if response.status_code == 429:
+            print("⚠️ Rate limit atteint - attendre")
+            retry_after = response.headers.get("retry-after")
+            self.budget.on_rate_limited(float(retry_after) if retry_after and retry_after.isdigit() else None)
+            raise UpstreamError(429, "Rate limit API atteint", endpoint)
+        if response.status_code != 200:
+            print(f"❌ Erreur API {endpoint}: {response.status_code}")
+            raise UpstreamError(
+                response.status_code,
+                f"Erreur API Football: {response.status_code}",
+                endpoint
+            )
+
+        data = payloads.decode(response.content)
+        print(f"✅ Response OK - {len(data.get('response', []))} items")
+
+        if settings.cache_enabled:
+            self.cache.set(key, data, ttl_for(endpoint, params, data))
+        return data
+
+    def will_call_upstream(self, endpoint: str, params: Optional[Dict[str, Any]]) -> bool:
+        """
+        Vrai si cet appel partirait vers l'API : ni en cache (frais, ou expiré
+        mais servi pendant son rafraîchissement), ni déjà en vol.
+        params=None : paramètres encore inconnus (dépendance d'un plan).
+        """
+        if params is None:
+            return True
+        endpoint = endpoint.strip("/")
+        params = normalize_params(params)
+        key = make_request_key(endpoint, params)
+        if self.inflight.is_running(key):
+            return False
+        entry = self.cache.peek(key) if settings.cache_enabled else None
+        if entry is None:
+            return True
+        if entry.is_fresh():
+            return False
+        max_stale = settings.cache_max_stale if self._swr_allowed(endpoint, params) else 0
+        return time.time() - entry.expires_at > max_stale
+
+    async def reserve(self, calls: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> Optional[QuotaReservation]:
+        """
+        Réserver les jetons de quota d'un lot d'appels (plan) avant le premier
+        envoi. Lève UpstreamError 429 sans rien envoyer si le lot ne passe pas.
+        """
+        if not settings.quota_enabled:
+            return None
+        count = sum(1 for endpoint, params in calls if self.will_call_upstream(endpoint, params))
+        if count <= 1:
+            return None  # Un seul appel : file d'attente habituelle
+        try:
+            return await self.budget.reserve(count, INTERACTIVE)
+        except QuotaExceeded as e:
+            print(f"⚠️ Budget API: {e.reason} ({count} appels planifiés)")
+            raise UpstreamError(429, e.reason)
+
+    def stats(self) -> Dict[str, Any]:
+        """Compteurs exposés par /health/upstream"""
+        return {
+            "pool_open": self._client is not None,
+            "decoder": payloads.decoder_name(),
+            "http2": settings.upstream_http2 and HTTP2_AVAILABLE,
+            "single_flight": self.inflight.stats(),
+            "cache": self.cache.stats(),
+            "background_refreshes": self.background_refreshes,
+            "quota": self.budget.stats(),
+            "stale_if_error": self.stale_if_error,
+            "circuit_breakers": self.breakers.stats(),
+            "latency": self.latency.stats(),
+            "hedging": self.hedging.stats(),
+            "disk_cache": self.disk.stats() if self.disk is not None else None
+        }
+
+
+# Instance globale de la passerelle
+gateway = UpstreamGateway()
+
+
+async def load(endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Loader de la requête HTTP en cours (style DataLoader) : chaque couple
+    (endpoint, paramètres) n'est demandé qu'une fois à la passerelle par
+    requête, même si plusieurs helpers en ont besoin. Appel strict.
+    """
+    stats = request_context.current()
+    if stats is None:
+        return await gateway.fetch(endpoint, params)
+
+    key = make_request_key(endpoint, params)
+    task = stats.loads.get(key)
+    if task is None:
+        task = asyncio.ensure_future(gateway.fetch(endpoint, params))
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        stats.loads[key] = task
+    else:
+        stats.loader_hits += 1
+    return await asyncio.shield(task)
+
+
+async def make_api_request(endpoint: str, params: dict):
+    """
+    Fonction utilitaire partagée par les routers (appel tolérant) :
+    renvoie {"response": []} en cas d'erreur, sauf rate limit (429)
+    """
+    try:
+        return await load(endpoint, params)
+    except UpstreamError as e:
+        if e.status_code == 429:
+            raise
+        request_context.mark_uncacheable()
+        return {"response": []}
+    except Exception as e:
+        print(f"❌ Exception API {endpoint}: {e}")
+        request_context.mark_uncacheable()
+        return {"response": []}
@@ -0,0 +1,78 @@
+# backend/benchmarks/decode_payloads.py - BENCHMARK DU DÉCODAGE DES RÉPONSES UPSTREAM
+"""
+Compare les décodeurs JSON sur une saison synthétique de matchs (format api-sports).
+
+    cd src/backend
+    python -m benchmarks.decode_payloads [--fixtures 380] [--repeat 50]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from app.services import payloads
+
+
+def make_fixture(i: int, kickoff: int) -> dict:
+    return {
+        "fixture": {
+            "id": 1000000 + i, "referee": "C. Turpin, France", "timezone": "UTC",
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(kickoff)), "timestamp": kickoff,
+            "periods": {"first": kickoff, "second": kickoff + 3600},
+            "venue": {"id": 671, "name": "Parc des Princes", "city": "Paris"},
+            "status": {"long": "Match Finished", "short": "FT", "elapsed": 90}
+        },
+        "league": {"id": 61, "name": "Ligue 1", "country": "France", "logo": "https://media.api-sports.io/football/leagues/61.png",
+                   "flag": "https://media.api-sports.io/flags/fr.svg", "season": 2023, "round": f"Regular Season - {i // 10 + 1}"},
+        "teams": {
+            "home": {"id": 85 + i % 18, "name": f"Équipe {i % 18}", "logo": f"https://media.api-sports.io/football/teams/{85 + i % 18}.png", "winner": True},
+            "away": {"id": 90 + i % 18, "name": f"Équipe {(i + 7) % 18}", "logo": f"https://media.api-sports.io/football/teams/{90 + i % 18}.png", "winner": False}
+        },
+        "goals": {"home": 2, "away": 1},
+        "score": {"halftime": {"home": 1, "away": 0}, "fulltime": {"home": 2, "away": 1},
+                  "extratime": {"home": None, "away": None}, "penalty": {"home": None, "away": None}}
+    }
+
+
+def make_payload(count: int) -> bytes:
+    start = 1692000000
+    response = [make_fixture(i, start + i * 86400 // 10) for i in range(count)]
+    return json.dumps({
+        "get": "fixtures", "parameters": {"league": "61", "season": "2023"}, "errors": [],
+        "results": count, "paging": {"current": 1, "total": 1}, "response": response
+    }).encode()
+
+
+def bench(label: str, func, repeat: int, baseline: float = None) -> float:
+    best = min(timeit.repeat(func, number=repeat, repeat=5)) / repeat
+    ratio = f"  x{baseline / best:.2f}" if baseline else ""
+    print(f"{label:<42} {best * 1000:8.3f} ms{ratio}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=int, default=380)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    raw = make_payload(args.fixtures)
+    print(f"Payload fixtures: {args.fixtures} matchs, {len(raw) / 1024:.0f} Ko\n")
+
+    baseline = bench("httpx Response.json() (avant)", lambda: httpx.Response(200, content=raw).json(), args.repeat)
+    bench("json.loads", lambda: json.loads(raw), args.repeat, baseline)
+    if payloads.ORJSON_AVAILABLE:
+        bench("orjson.loads", lambda: payloads.orjson.loads(raw), args.repeat, baseline)
+    if payloads.MSGSPEC_AVAILABLE:
+        import msgspec
+        bench("msgspec (dicts)", lambda: msgspec.json.decode(raw), args.repeat, baseline)
+    bench(f"payloads.decode ({payloads.decoder_name()})", lambda: payloads.decode(raw), args.repeat, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# backend/benchmarks/memory_footprint.py - MÉMOIRE DES SAISONS DU FIXTURESTORE
+"""
+Compare la mémoire occupée par des saisons de matchs gardées en dicts
+imbriqués (réponse JSON décodée) et en enregistrements compacts
+(FixtureRecord, forme utilisée par le FixtureStore).
+
+    cd src/backend
+    python -m benchmarks.memory_footprint [--leagues 5] [--teams 20]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.decode_payloads import make_fixture
+from app.services.compact import FixtureRecord
+
+
+def envelope(endpoint: str, params: dict, items: list) -> bytes:
+    return json.dumps({"get": endpoint, "parameters": params, "errors": [], "results": len(items),
+                       "paging": {"current": 1, "total": 1}, "response": items}).encode()
+
+
+def build_bodies(leagues: int, teams: int):
+    return [
+        envelope("fixtures", {"league": str(league), "season": "2023"},
+                 [make_fixture(league * 1000 + i, 1692000000 + i * 8640) for i in range(teams * (teams - 1))])
+        for league in range(leagues)
+    ]
+
+
+def to_records(payload: dict) -> list:
+    return [FixtureRecord(item) for item in payload["response"]]
+
+
+def traced_size(build):
+    """(résultat, octets alloués par build() encore vivants après coup)"""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, size
+
+
+def timed(build) -> float:
+    start = time.perf_counter()
+    build()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--leagues", type=int, default=5)
+    parser.add_argument("--teams", type=int, default=20)
+    args = parser.parse_args()
+
+    bodies = build_bodies(args.leagues, args.teams)
+    fixtures = args.leagues * args.teams * (args.teams - 1)
+    print(f"{args.leagues} ligues : {fixtures} matchs ({sum(len(body) for body in bodies) / 1e6:.1f} Mo de JSON)\n")
+
+    # Mesure du compact en premier : les chaînes internées sont comptées
+    packed, packed_size = traced_size(lambda: [to_records(json.loads(body)) for body in bodies])
+    raw, raw_size = traced_size(lambda: [json.loads(body) for body in bodies])
+    pack_time = timed(lambda: [to_records(payload) for payload in raw])
+    print(f"{'dicts imbriqués':<24} {raw_size / 1e6:8.2f} Mo")
+    print(f"{'FixtureRecord':<24} {packed_size / 1e6:8.2f} Mo  ({packed_size / raw_size:.0%}, "
+          f"compactage {pack_time * 1000:.0f} ms)")
+
+    start = time.perf_counter()
+    expanded = [[record.to_item() for record in records] for records in packed]
+    print(f"{'restitution JSON':<24} {(time.perf_counter() - start) * 1000:8.1f} ms pour toutes les saisons")
+    assert expanded == [payload["response"] for payload in raw]
+
+
+if __name__ == "__main__":
+    main()
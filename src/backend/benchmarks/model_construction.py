@@ -0,0 +1,93 @@
+# backend/benchmarks/model_construction.py - BENCHMARK DE LA CONSTRUCTION DES MODÈLES
+"""
+Compare la construction des MatchPreview / Player : constructeur par élément,
+validation de liste (TypeAdapter) et model_construct (sans validation).
+
+    cd src/backend
+    python -m benchmarks.model_construction [--fixtures 380] [--players 30] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.decode_payloads import make_fixture
+from app.models.team import Player, TeamBase
+from app.models.match import MatchPreview, MatchScore
+from app.services.football_api import build_models, match_preview_row, player_row
+
+
+def make_player(i: int) -> dict:
+    return {"player": {
+        "id": 20000 + i, "name": f"J. Joueur{i}", "firstname": "Jean", "lastname": f"Joueur{i}", "age": 20 + i % 15,
+        "birth": {"date": "1999-04-12", "place": "Lyon", "country": "France"}, "nationality": "France",
+        "height": "182 cm", "weight": "76 kg", "injured": False,
+        "photo": f"https://media.api-sports.io/football/players/{20000 + i}.png"
+    }}
+
+
+def per_item_previews(items):
+    """Ancienne boucle : un constructeur pydantic par modèle et sous-modèle"""
+    matches = []
+    for item in items:
+        fixture, teams, goals = item["fixture"], item["teams"], item["goals"]
+        matches.append(MatchPreview(
+            id=fixture.get("id"),
+            date=datetime.fromtimestamp(fixture.get("timestamp")),
+            status=fixture.get("status", {}).get("long", ""),
+            home_team=TeamBase(id=teams["home"]["id"], name=teams["home"]["name"], country="", logo=teams["home"]["logo"]),
+            away_team=TeamBase(id=teams["away"]["id"], name=teams["away"]["name"], country="", logo=teams["away"]["logo"]),
+            score=MatchScore(home=goals.get("home"), away=goals.get("away"))
+        ))
+    return matches
+
+
+def per_item_players(items):
+    return [Player(**player_row(item["player"])) for item in items]
+
+
+def construct_previews(rows):
+    """model_construct : aucune validation, mais une boucle Python par champ"""
+    return [MatchPreview.model_construct(
+        **{**row, "home_team": TeamBase.model_construct(**row["home_team"]),
+           "away_team": TeamBase.model_construct(**row["away_team"]),
+           "score": MatchScore.model_construct(**row["score"])}
+    ) for row in rows]
+
+
+def bench(label: str, func, repeat: int, baseline: float = None) -> float:
+    best = min(timeit.repeat(func, number=repeat, repeat=5)) / repeat
+    ratio = f"  x{baseline / best:.2f}" if baseline else ""
+    print(f"{label:<44} {best * 1000:8.3f} ms{ratio}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=int, default=380)
+    parser.add_argument("--players", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    fixtures = [make_fixture(i, 1692000000 + i * 8640) for i in range(args.fixtures)]
+    players = [make_player(i) for i in range(args.players)]
+
+    print(f"MatchPreview x {args.fixtures}")
+    base = bench("constructeur par élément (avant)", lambda: per_item_previews(fixtures), args.repeat)
+    bench("TypeAdapter(List[MatchPreview])", lambda: build_models(MatchPreview, [match_preview_row(i) for i in fixtures]), args.repeat, base)
+    bench("model_construct", lambda: construct_previews([match_preview_row(i) for i in fixtures]), args.repeat, base)
+
+    print(f"\nPlayer x {args.players}")
+    base = bench("constructeur par élément (avant)", lambda: per_item_players(players), args.repeat)
+    bench("TypeAdapter(List[Player])", lambda: build_models(Player, [player_row(i["player"]) for i in players]), args.repeat, base)
+    bench("model_construct", lambda: [Player.model_construct(**player_row(i["player"])) for i in players], args.repeat, base)
+
+    # Le chemin par lot produit les mêmes modèles que l'ancienne boucle
+    assert build_models(MatchPreview, [match_preview_row(i) for i in fixtures]) == per_item_previews(fixtures)
+
+
+if __name__ == "__main__":
+    main()
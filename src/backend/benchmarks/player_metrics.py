@@ -0,0 +1,79 @@
+# backend/benchmarks/player_metrics.py - CALCUL DES MÉTRIQUES DÉRIVÉES DES JOUEURS
+"""
+Temps de calcul des `calculated_stats` d'une ligue entière : boucle joueur
+par joueur (ancien calcul des routes) contre le moteur vectorisé
+(app/services/metrics.py) : à froid par effectif, effectifs déjà
+mémorisés, et ligue entière en une seule matrice.
+
+    cd src/backend
+    python -m benchmarks.player_metrics [--teams 20] [--players 30]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.memory_footprint import make_player
+from app.services.metrics import MetricsEngine, compute_player_metrics, player_columns, player_metrics_rows
+
+
+def per_player(player_item: dict) -> dict:
+    """Calcul historique des routes, un joueur à la fois"""
+    statistics = player_item.get("statistics", [{}])[0] if player_item.get("statistics") else {}
+    appearances = statistics.get("games", {}).get("appearences", 0)
+    goals = statistics.get("goals", {}).get("total", 0)
+    assists = statistics.get("goals", {}).get("assists", 0)
+    minutes = statistics.get("games", {}).get("minutes", 0)
+    if appearances <= 0:
+        return {}
+    return {
+        "goals_per_match": round(goals / appearances, 2),
+        "assists_per_match": round(assists / appearances, 2),
+        "minutes_per_match": round(minutes / appearances, 0) if minutes else 0,
+        "goal_contribution": goals + assists
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--players", type=int, default=30)
+    args = parser.parse_args()
+
+    squads = {team: [make_player(team * 100 + i, team, 61) for i in range(args.players)]
+              for team in range(args.teams)}
+    print(f"Ligue : {args.teams} équipes x {args.players} joueurs\n")
+
+    def loop():
+        for items in squads.values():
+            [per_player(item) for item in items]
+
+    def cold():
+        engine = MetricsEngine(args.teams)
+        for team, items in squads.items():
+            engine.squad(team, 61, 2023, items)
+
+    warm_engine = MetricsEngine(args.teams)
+
+    def warm():
+        for team, items in squads.items():
+            warm_engine.squad(team, 61, 2023, items)
+
+    def league():
+        matrix = player_columns([item for items in squads.values() for item in items])
+        player_metrics_rows(matrix, compute_player_metrics(matrix))
+
+    warm()
+    number = 20
+    for label, function, metrics in (("boucle par joueur", loop, 4),
+                                     ("moteur, à froid", cold, 11),
+                                     ("moteur, mémorisé", warm, 11),
+                                     ("ligue, une matrice", league, 11)):
+        elapsed = min(timeit.repeat(function, number=number, repeat=5)) / number
+        print(f"{label:<18} {elapsed * 1000:7.2f} ms  ({metrics} métriques par joueur)")
+
+
+if __name__ == "__main__":
+    main()
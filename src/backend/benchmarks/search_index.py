@@ -0,0 +1,68 @@
+# backend/benchmarks/search_index.py - LATENCE DE L'INDEX LOCAL DE RECHERCHE
+"""
+Temps de réponse de l'index local (app/services/search_index.py) pour des
+saisies au fil de l'eau, sur des effectifs synthétiques.
+
+    cd src/backend
+    python -m benchmarks.search_index [--leagues 20] [--teams 20] [--players 30]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.memory_footprint import make_player
+from app.services.search_index import SearchIndexes
+
+FIRST = ["Jean", "Kylian", "Ousmane", "Étienne", "Théo", "Lucas", "Hugo", "Noël", "Raphaël", "Adrien", "Benjamin", "Mattéo"]
+LAST = ["Mbappé", "Dembélé", "Griezmann", "Hernández", "Kanté", "Pogba", "Giroud", "Lloris", "Varane", "Rabiot", "Koundé", "Camavinga"]
+
+
+def build(leagues: int, teams: int, players: int) -> SearchIndexes:
+    random.seed(1)
+    indexes = SearchIndexes()
+    for league in range(leagues):
+        rows = [{"team": {"id": league * 100 + team, "name": f"Olympique Équipe {league}-{team}", "logo": "l"}}
+                for team in range(teams)]
+        indexes.ingest("standings", {"response": [{"league": {"id": league, "season": 2023, "country": "France",
+                                                              "standings": [rows]}}]})
+        for team in range(teams):
+            squad = []
+            for i in range(players):
+                item = make_player((league * 100 + team) * 100 + i, league * 100 + team, league)
+                item["player"]["name"] = f"{random.choice(FIRST)[0]}. {random.choice(LAST)}{i}"
+                squad.append(item)
+            indexes.ingest("players", {"response": squad})
+    return indexes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--leagues", type=int, default=20)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--players", type=int, default=30)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    indexes = build(args.leagues, args.teams, args.players)
+    print(f"Index : {len(indexes.teams)} équipes, {len(indexes.players)} joueurs "
+          f"(construction {(time.perf_counter() - start) * 1000:.0f} ms)\n")
+
+    for index, queries in ((indexes.teams, ["o", "ol", "olymp", "equipe 7", "olympiqe 3-1"]),
+                           (indexes.players, ["m", "mb", "mbappe", "kante1", "grizman", "dembele 12"])):
+        for query in queries:
+            number = 200
+            cold = min(timeit.repeat(lambda: (index._results.clear(), index.search(query)),
+                                     number=number, repeat=5)) / number
+            cached = min(timeit.repeat(lambda: index.search(query), number=number, repeat=5)) / number
+            results = index.search(query)
+            print(f"{index.name:<8} {query!r:<16} {cold * 1e6:8.1f} µs  (déjà demandée {cached * 1e6:5.1f} µs)"
+                  f"  {len(results):>3} résultats  {results[0]['name'] if results else '-'}")
+
+
+if __name__ == "__main__":
+    main()
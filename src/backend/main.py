@@ -1,14 +1,33 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 import uvicorn
 
 from app.config.settings import settings
+from app.services.upstream import gateway
+from app.services.fixture_store import fixture_stores
+from app.services.live_poller import live_poller
+from app.services.response_cache import response_memo
+from app.services import http_cache
+from app.services.compression import variants as compressed_variants
+from app.services.search_index import search_indexes
+from app.services.metrics import metrics_engine
+from app.services import request_context
 from app.api.teams import router as teams_router
 from app.api.matches import router as matches_router
 from app.api.players import router as players_router
 
 from app.api.standings import router as standings_router 
+from app.api.export import router as export_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ouvrir le pool upstream au démarrage, le fermer à l'arrêt"""
+    await gateway.start()
+    yield
+    await live_poller.stop()
+    await gateway.close()
 
 # Créer l'application FastAPI
 app = FastAPI(
@@ -16,7 +35,8 @@ app = FastAPI(
     description="API Backend pour l'application Football avec React",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configuration CORS pour permettre les requêtes depuis le frontend React
@@ -28,6 +48,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Middleware : ETag / Last-Modified / Cache-Control et compression gzip/brotli sur les GET /api
+# (déclaré avant le suivi des appels upstream pour s'exécuter à l'intérieur de celui-ci)
+@app.middleware("http")
+async def http_cache_validation(request, call_next):
+    cached = http_cache.not_modified(request)
+    if cached is not None:
+        return cached
+    response = await call_next(request)
+    return await http_cache.finalize(request, response, request_context.current())
+
+# Middleware : suivi des appels upstream de chaque requête (loader, âge des données)
+@app.middleware("http")
+async def upstream_request_context(request, call_next):
+    stats = request_context.begin_request()
+    response = await call_next(request)
+    response.headers["X-Upstream-Calls"] = str(stats.upstream_calls)
+    age = http_cache.age_header(stats)
+    if age is not None:
+        # Même valeur que celle ajoutée au max-age par http_cache.finalize
+        response.headers["Age"] = str(age)
+        if stats.stale:
+            response.headers["X-Data-Stale"] = "true"
+    return response
+
 # Middleware pour gérer les erreurs globalement
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -49,7 +93,8 @@ async def root():
         "endpoints": {
             "teams": "/teams",
             "matches": "/matches",
-            "standings": "/standings"  # ← NOUVEAU
+            "standings": "/standings",  # ← NOUVEAU
+            "export": "/api/export"
         }
     }
 
@@ -64,11 +109,28 @@ async def health_check():
         "football_api": "connected" if settings.football_api_key else "not configured"
     }
 
+@app.get("/health/upstream")
+async def upstream_health():
+    """
+    Compteurs de la passerelle vers l'API Football
+    """
+    return {
+        **gateway.stats(),
+        "fixture_stores": fixture_stores.stats(),
+        "live_poller": live_poller.stats(),
+        "response_memo": response_memo.stats(),
+        "http_cache": http_cache.validators.stats(),
+        "compression": compressed_variants.stats(),
+        "search_index": search_indexes.stats(),
+        "player_metrics": metrics_engine.stats()
+    }
+
 # Inclure les routers
 app.include_router(teams_router, prefix="/api")
 app.include_router(matches_router, prefix="/api")
 app.include_router(standings_router, prefix="/api")
 app.include_router(players_router, prefix="/api")
+app.include_router(export_router, prefix="/api")
 
 # Point d'entrée pour le développement
 if __name__ == "__main__":
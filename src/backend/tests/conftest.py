@@ -0,0 +1,138 @@
+# backend/tests/conftest.py - API-SPORTS SIMULÉE POUR LES TESTS
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+os.environ.setdefault("FOOTBALL_API_KEY", "test-key")
+os.environ["DISK_CACHE_ENABLED"] = "false"  # Pas de fichier sqlite partagé entre tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.upstream import gateway
+from app.services.fixture_store import fixture_stores
+from app.services.live_poller import live_poller
+from app.services.response_cache import response_memo
+from app.services.http_cache import validators
+from app.services.compression import variants
+from app.services.search_index import search_indexes
+from app.services.metrics import metrics_engine
+
+NOW = int(time.time())
+
+# Headers d'un plan payant : le budget de quota ne ralentit pas les tests
+PAID_PLAN_HEADERS = {
+    "x-ratelimit-requests-limit": "7500", "x-ratelimit-requests-remaining": "7000",
+    "X-RateLimit-Limit": "300", "X-RateLimit-Remaining": "290"
+}
+
+
+def fixture_item(fixture_id: int, timestamp: int, status: str = "FT", home: int = 1, away: int = 2,
+                 league: int = 61, season: int = 2023) -> Dict[str, Any]:
+    return {
+        "fixture": {"id": fixture_id, "referee": None, "timezone": "UTC", "date": "2023-01-01T00:00:00+00:00",
+                    "timestamp": timestamp, "periods": {"first": None, "second": None},
+                    "venue": {"id": 1, "name": "Stade", "city": "Paris"},
+                    "status": {"long": status, "short": status, "elapsed": 90}},
+        "league": {"id": league, "name": "Ligue 1", "country": "France", "logo": "l", "flag": "f",
+                   "season": season, "round": "Regular Season - 1"},
+        "teams": {"home": {"id": home, "name": f"Team {home}", "logo": "h", "winner": None},
+                  "away": {"id": away, "name": f"Team {away}", "logo": "a", "winner": None}},
+        "goals": {"home": 1, "away": 0},
+        "score": {"halftime": {"home": 0, "away": 0}, "fulltime": {"home": 1, "away": 0},
+                  "extratime": {"home": None, "away": None}, "penalty": {"home": None, "away": None}}
+    }
+
+
+def standing_item(rank: int, team_id: int) -> Dict[str, Any]:
+    side = {"played": 10, "win": 5, "draw": 3, "lose": 2, "goals": {"for": 15, "against": 9}}
+    return {"rank": rank, "team": {"id": team_id, "name": f"Team {team_id}", "logo": "l"}, "points": 30 - rank,
+            "goalsDiff": 6, "group": "Ligue 1", "form": "WWDLW", "status": "same", "description": None,
+            "all": side, "home": side, "away": side, "update": "2024-05-01T00:00:00+00:00"}
+
+
+def player_item(player_id: int, team_id: int = 85, goals: int = 5, assists: int = 2,
+                appearances: int = 10, minutes: int = 800) -> Dict[str, Any]:
+    return {
+        "player": {"id": player_id, "name": f"Player {player_id}", "firstname": "A", "lastname": "B", "age": 25,
+                   "birth": {"date": "1999-01-01", "place": "Paris", "country": "France"}, "nationality": "France",
+                   "height": "180 cm", "weight": "75 kg", "injured": False, "photo": "p"},
+        "statistics": [{
+            "team": {"id": team_id, "name": f"Team {team_id}", "logo": "l"},
+            "league": {"id": 61, "season": 2023},
+            "games": {"appearences": appearances, "lineups": appearances, "minutes": minutes,
+                      "position": "Attacker", "rating": "7.1", "captain": False},
+            "goals": {"total": goals, "assists": assists, "saves": None, "conceded": 0},
+            "cards": {"yellow": 1, "yellowred": 0, "red": 0}
+        }]
+    }
+
+
+class FakeApi:
+    """
+    API-Sports simulée : `routes[endpoint](params)` renvoie la liste `response`
+    (ou un httpx.Response complet). Chaque appel reçu est noté dans `calls`.
+    """
+
+    def __init__(self):
+        self.calls: List[Tuple[str, Dict[str, str]]] = []
+        self.headers: Dict[str, str] = dict(PAID_PLAN_HEADERS)
+        self.routes: Dict[str, Callable[[Dict[str, str]], Any]] = {
+            "standings": lambda params: [{"league": {
+                "id": int(params.get("league", 61)), "name": "Ligue 1", "country": "France", "logo": "l",
+                "flag": "f", "season": int(params.get("season", 2023)),
+                "standings": [[standing_item(rank, rank) for rank in range(1, 19)]]
+            }}],
+            "teams": lambda params: [{
+                "team": {"id": int(params.get("id", 85)), "name": "Paris Saint Germain", "code": "PSG",
+                         "country": "France", "founded": 1970, "national": False, "logo": "l"},
+                "venue": {"id": 1, "name": "Parc des Princes", "address": "a", "city": "Paris",
+                          "capacity": 48000, "surface": "grass", "image": "i"}
+            }],
+            "fixtures": lambda params: [],
+            "players": lambda params: []
+        }
+
+    def calls_to(self, endpoint: str) -> List[Dict[str, str]]:
+        return [params for called, params in self.calls if called == endpoint]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        endpoint = request.url.path.strip("/")
+        params = dict(request.url.params)
+        self.calls.append((endpoint, params))
+        result = self.routes.get(endpoint, lambda params: [])(params)
+        if isinstance(result, httpx.Response):
+            return result
+        body = {"get": endpoint, "parameters": params, "errors": [],
+                "results": len(result) if isinstance(result, list) else 1,
+                "paging": {"current": 1, "total": 1}, "response": result}
+        if isinstance(result, dict) and "paging" in result:
+            body.update(result)
+        return httpx.Response(200, json=body, headers=self.headers)
+
+
+def reset_services():
+    """Instances globales remises à l'état d'un processus neuf"""
+    for instance, args in ((gateway, ()), (fixture_stores, ()), (live_poller, ()),
+                           (response_memo, (response_memo.max_entries,)),
+                           (validators, (validators.max_entries,)), (variants, (variants.max_bytes,)),
+                           (search_indexes, ()), (metrics_engine, (metrics_engine.max_entries,))):
+        instance.__init__(*args)
+
+
+@pytest.fixture
+def api() -> FakeApi:
+    reset_services()
+    fake = FakeApi()
+    gateway._client = httpx.AsyncClient(base_url=gateway.base_url, transport=httpx.MockTransport(fake.handle))
+    return fake
+
+
+@pytest.fixture
+def client(api: FakeApi):
+    import main
+    with TestClient(main.app) as test_client:
+        yield test_client
@@ -0,0 +1,25 @@
+# backend/tests/test_export.py - EXPORTS NDJSON
+import json
+
+import httpx
+
+from conftest import player_item
+
+FAILING_TEAM = 3
+
+
+def test_squad_export_reports_a_team_whose_squad_failed(client, api):
+    def players_route(params):
+        team_id = int(params["team"])
+        if team_id == FAILING_TEAM:
+            return httpx.Response(500, json={"message": "upstream error"})
+        return [player_item(team_id * 100 + n, team_id=team_id) for n in range(2)]
+    api.routes["players"] = players_route
+
+    lines = [json.loads(line) for line in client.get("/api/export/squads?league=61&season=2023").iter_lines()]
+
+    errors = [line for line in lines if "error" in line]
+    assert [error["team"]["id"] for error in errors] == [FAILING_TEAM]
+    assert errors[0]["status"] >= 500
+    exported_teams = {line["team"]["id"] for line in lines if "error" not in line}
+    assert exported_teams == set(range(1, 19)) - {FAILING_TEAM}
@@ -0,0 +1,84 @@
+# backend/tests/test_fixture_store.py - SYNCHRONISATION INCRÉMENTALE DES MATCHS
+import asyncio
+import time
+
+from app.config.settings import settings
+from app.services.fixture_store import fixture_stores
+from conftest import NOW, fixture_item
+
+SEASON = 2026  # Saison en cours : synchronisée de façon incrémentale
+HOUR = 3600
+
+
+def season_api(api, fixtures):
+    """`fixtures` : saison complète, fenêtre from/to et relecture ids= servies depuis la même liste"""
+    def fixtures_route(params):
+        if "ids" in params:
+            wanted = {int(fixture_id) for fixture_id in params["ids"].split("-")}
+            return [item for item in fixtures if item["fixture"]["id"] in wanted]
+        if "from" in params:
+            return [item for item in fixtures if item["fixture"]["timestamp"] >= NOW - 2 * 86400]
+        return fixtures
+    api.routes["fixtures"] = fixtures_route
+
+
+def load_then_sync(league: int = 61):
+    async def scenario():
+        store = await fixture_stores.get(league, SEASON)
+        store.synced_at -= settings.fixture_sync_interval  # Fenêtre à relire
+        return await fixture_stores.get(league, SEASON)
+    return asyncio.run(scenario())
+
+
+def test_incremental_sync_is_a_single_window_call(api):
+    season_api(api, [fixture_item(1, NOW - 30 * 86400, season=SEASON),
+                     fixture_item(2, NOW + HOUR, "NS", season=SEASON)])
+
+    load_then_sync()
+
+    window_calls = api.calls_to("fixtures")[1:]
+    assert len(window_calls) == 1
+    assert "from" in window_calls[0] and "to" in window_calls[0]
+    assert not any("live" in params for params in api.calls_to("fixtures"))
+
+
+def test_fixture_rescheduled_into_a_finished_window_is_picked_up(api):
+    fixtures = [fixture_item(1, NOW - 2 * HOUR, "FT", season=SEASON),
+                fixture_item(2, NOW - 20 * 86400, "PST", season=SEASON)]
+    season_api(api, fixtures)
+
+    async def scenario():
+        store = await fixture_stores.get(61, SEASON)
+        store.rescheduled_at = time.monotonic()  # Relecture ids= pas encore due
+        # Le match reporté est reprogrammé dans la fenêtre, déjà toute terminée
+        fixtures[1] = fixture_item(2, NOW + HOUR, "NS", season=SEASON)
+        store.synced_at -= settings.fixture_sync_interval
+        return await fixture_stores.get(61, SEASON)
+
+    store = asyncio.run(scenario())
+
+    assert [item["fixture"]["id"] for item in store.upcoming(limit=5)] == [2]
+    assert not any("ids" in params for params in api.calls_to("fixtures"))
+
+
+def test_rescheduled_fixtures_are_reread_at_their_own_cadence(api):
+    season_api(api, [fixture_item(1, NOW + HOUR, "NS", season=SEASON),
+                     fixture_item(7, NOW - 10 * 86400, "PST", season=SEASON)])
+
+    store = load_then_sync()
+    assert not any("ids" in params for params in api.calls_to("fixtures"))
+
+    store.rescheduled_at -= settings.fixture_reschedule_interval
+    load_then_sync()
+    assert [params["ids"] for params in api.calls_to("fixtures") if "ids" in params] == ["7"]
+
+
+def test_live_rows_come_from_the_poller_snapshot(api):
+    kickoff = NOW - 1800
+    season_api(api, [fixture_item(5, kickoff, "NS", season=SEASON)])
+    fixture_stores.apply_live([fixture_item(5, kickoff, "1H", season=SEASON)])
+
+    store = asyncio.run(fixture_stores.get(61, SEASON))
+
+    assert [item["fixture"]["status"]["short"] for item in store.live()] == ["1H"]
+    assert len(api.calls) == 1
@@ -0,0 +1,59 @@
+# backend/tests/test_http_cache.py - EN-TÊTES DE CACHE HTTP (Age / Cache-Control)
+import re
+
+from app.config.settings import settings
+from app.services.response_cache import response_memo
+from app.services.upstream import gateway
+from conftest import NOW, fixture_item
+
+
+def freshness(response) -> int:
+    """Fraîcheur restante vue par un cache HTTP : max-age - Age"""
+    max_age = int(re.search(r"max-age=(\d+)", response.headers["cache-control"]).group(1))
+    return max_age - int(response.headers.get("age", 0))
+
+
+def test_max_age_includes_the_age_of_the_data(client, api):
+    first = client.get("/api/standings/61?season=2026")
+    ttl = freshness(first)
+    assert first.headers["age"] == "0" and ttl > 200
+
+    # La donnée upstream a vieilli de 200s dans le cache de la passerelle
+    for entry in gateway.cache._entries.values():
+        entry.stored_at -= 200
+        entry.expires_at -= 200
+    response_memo.clear()  # Réponse reconstruite depuis le cache de la passerelle
+
+    second = client.get("/api/standings/61?season=2026")
+
+    assert len(api.calls) == 1
+    assert int(second.headers["age"]) >= 200
+    assert abs(freshness(second) - (ttl - 200)) <= 1
+
+
+def test_finished_season_gets_the_long_max_age(client, api):
+    api.routes["fixtures"] = lambda params: [fixture_item(fixture_id, NOW - fixture_id * 86400)
+                                             for fixture_id in range(1, 11)]
+
+    response = client.get("/api/matches/recent?league=61&season=2023")
+
+    assert response.headers["cache-control"] == f"public, max-age={settings.http_cache_max_age}"
+
+
+def test_season_with_open_fixtures_keeps_the_sync_interval(client, api):
+    api.routes["fixtures"] = lambda params: [fixture_item(1, NOW - 86400, season=2026),
+                                             fixture_item(2, NOW + 86400, "NS", season=2026)]
+
+    response = client.get("/api/matches/recent?league=61&season=2026")
+
+    assert freshness(response) <= settings.fixture_sync_interval
+
+
+def test_revalidation_does_not_count_as_a_cache_read(client, api):
+    first = client.get("/api/standings/61?season=2026")
+    stats = gateway.cache.stats()
+
+    second = client.get("/api/standings/61?season=2026", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 304
+    assert gateway.cache.stats() == stats
@@ -0,0 +1,63 @@
+# backend/tests/test_live_poller.py - CADENCE DU SONDEUR LIVE
+import asyncio
+
+from app.config.settings import settings
+from app.services.live_poller import live_poller
+from app.services.live_schedule import IDLE, IN_PLAY, PREMATCH
+from conftest import NOW, fixture_item
+
+SEASON = 2026
+
+
+def test_cold_process_stream_learns_the_league_kickoffs(api):
+    kickoff = NOW + 300  # Dans la fenêtre d'avant-match
+    api.routes["fixtures"] = lambda params: [] if "live" in params else [
+        fixture_item(1, NOW - 86400, "FT", season=SEASON),
+        fixture_item(2, kickoff, "NS", season=SEASON)
+    ]
+
+    async def scenario():
+        # Aucune autre requête : seul le flux SSE de la ligue tourne
+        subscription = await live_poller.subscribe(61, SEASON)
+        interval = live_poller.schedule.interval  # Calculé par le sondeur après son premier sondage
+        live_poller.unsubscribe(subscription)
+        await live_poller.stop()
+        return interval
+
+    interval = asyncio.run(scenario())
+
+    assert live_poller.schedule.next_kickoff == kickoff
+    assert live_poller.schedule.phase == PREMATCH
+    assert interval == settings.live_poll_prematch
+
+
+def test_stream_without_league_keeps_the_idle_cadence(api):
+    async def scenario():
+        subscription = await live_poller.subscribe()
+        interval = live_poller.schedule.interval
+        live_poller.unsubscribe(subscription)
+        await live_poller.stop()
+        return interval
+
+    interval = asyncio.run(scenario())
+
+    assert live_poller.schedule.phase == IDLE
+    assert interval == settings.live_poll_idle
+    assert [params for _, params in api.calls] == [{"live": "all"}]
+
+
+def test_live_match_in_an_unsubscribed_league_does_not_set_the_cadence(api):
+    live_elsewhere = fixture_item(9, NOW - 1800, "1H", league=140, season=SEASON)
+    api.routes["fixtures"] = lambda params: [live_elsewhere] if "live" in params else [
+        fixture_item(2, NOW + 10 * 86400, "NS", season=SEASON)
+    ]
+
+    async def scenario(league):
+        subscription = await live_poller.subscribe(league, SEASON)
+        phase, interval = live_poller.schedule.phase, live_poller.schedule.interval
+        live_poller.unsubscribe(subscription)
+        await live_poller.stop()
+        return phase, interval
+
+    assert asyncio.run(scenario(61)) == (IDLE, settings.live_poll_idle)
+    assert asyncio.run(scenario(140)) == (IN_PLAY, settings.live_poll_interval)
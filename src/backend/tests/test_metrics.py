@@ -0,0 +1,54 @@
+# backend/tests/test_metrics.py - PARTS DE L'ÉQUIPE SUR L'EFFECTIF COMPLET
+import json
+
+from app.services.metrics import SHARE_METRICS
+from conftest import player_item, standing_item
+
+PAGE_SIZE = 20
+
+
+def paged_squad(api, size: int = 30):
+    """Effectif de `size` joueurs servi par pages de PAGE_SIZE, comme api-sports"""
+    squad = [player_item(player_id, goals=player_id % 4) for player_id in range(1, size + 1)]
+    pages = (size + PAGE_SIZE - 1) // PAGE_SIZE
+
+    def players_route(params):
+        if "id" in params:
+            return [item for item in squad if item["player"]["id"] == int(params["id"])]
+        page = int(params.get("page", 1))
+        return {"paging": {"current": page, "total": pages},
+                "response": squad[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]}
+    api.routes["players"] = players_route
+    return squad
+
+
+def test_detailed_players_covers_every_page(client, api):
+    squad = paged_squad(api)
+
+    players = client.get("/api/teams/85/players/detailed?league=61&season=2023").json()["players"]
+
+    assert len(players) == len(squad)
+    assert sorted(params.get("page", "1") for params in api.calls_to("players")) == ["1", "2"]
+    assert round(sum(player["calculated_stats"]["goal_share"] for player in players)) == 100
+
+
+def test_player_details_reuse_the_squad_only_when_cached(client, api):
+    paged_squad(api)
+    api.routes["standings"] = lambda params: [{"league": {
+        "id": 61, "name": "Ligue 1", "country": "France", "logo": "l", "flag": "f", "season": 2023,
+        "standings": [[standing_item(1, 85)]]
+    }}]
+
+    # Fiche demandée avant toute liste d'effectif : clés de parts présentes, à None, sans appel d'effectif
+    cold = client.get("/api/players/27/details?league=61&season=2023").json()["calculated_stats"]
+    assert {name: cold[name] for name in SHARE_METRICS} == dict.fromkeys(SHARE_METRICS)
+    assert all("id" in params for params in api.calls_to("players"))
+
+    detailed = {player["id"]: player["calculated_stats"] for player in
+                client.get("/api/teams/85/players/detailed?league=61&season=2023").json()["players"]}
+    exported = {player["id"]: player["calculated_stats"] for player in
+                map(json.loads, client.get("/api/export/squads?league=61&season=2023").iter_lines())}
+    details = client.get("/api/players/27/details?league=61&season=2023").json()["calculated_stats"]
+
+    assert details == detailed[27] == exported[27]
+    assert details["goal_share"] is not None
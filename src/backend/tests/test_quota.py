@@ -0,0 +1,84 @@
+# backend/tests/test_quota.py - BUDGET DE QUOTA ET PLANS D'APPELS
+import asyncio
+import time
+
+import pytest
+
+from app.services.rate_limit import QuotaBudget, QuotaExceeded
+from app.services.upstream import gateway
+
+
+def free_plan(api, per_minute: int = 10):
+    """En-têtes d'un plan gratuit : X-RateLimit-Remaining décompté à chaque appel"""
+    def handle(request, handle=api.handle):
+        response = handle(request)
+        remaining = max(0, per_minute - len(api.calls))
+        response.headers.update({
+            "x-ratelimit-requests-limit": "100", "x-ratelimit-requests-remaining": str(100 - len(api.calls)),
+            "X-RateLimit-Limit": str(per_minute), "X-RateLimit-Remaining": str(remaining)
+        })
+        return response
+    gateway.client._transport.handler = handle
+
+
+def test_team_profile_fan_out_fits_a_free_plan_minute(client, api):
+    free_plan(api)
+
+    started = time.monotonic()
+    response = client.get("/api/teams/85/complete?league=61&season=2023")
+
+    assert response.status_code == 200
+    assert time.monotonic() - started < 2
+    assert len(api.calls) == 6
+    assert gateway.budget.reserved == 0
+
+
+def test_plan_refused_before_any_call_when_quota_cannot_cover_it(client, api):
+    free_plan(api)
+    gateway.budget.max_wait = 1.0
+    gateway.budget._tokens = 2.0  # Rafale déjà consommée par d'autres clients
+
+    response = client.get("/api/teams/85/complete?league=61&season=2023")
+
+    assert response.status_code == 429
+    assert api.calls == []
+    assert gateway.budget._tokens >= 2.0 - 1e-6
+
+
+def test_cached_calls_are_not_reserved(client, api):
+    free_plan(api)
+    assert client.get("/api/teams/85/complete?league=61&season=2023&include=standing").status_code == 200
+    calls = len(api.calls)
+    gateway.budget.max_wait = 1.0
+    gateway.budget._tokens = 4.0
+
+    # team et standings déjà en cache : seuls les 4 appels restants sont réservés
+    response = client.get("/api/teams/85/complete?league=61&season=2023&include=standing,statistics,players")
+
+    assert response.status_code == 200
+    assert len(api.calls) - calls == 4
+
+
+def test_reservation_returns_unused_tokens():
+    budget = QuotaBudget(per_minute=10, daily=100, burst=3, headroom=0.1, interactive_reserve=0.2, max_wait=1.0)
+    assert budget.capacity == 9
+
+    async def scenario():
+        reservation = await budget.reserve(5)
+        assert reservation.take()
+        reservation.release()
+
+    asyncio.run(scenario())
+    assert budget.reserved == 0
+    assert budget.granted == 1
+    assert budget._tokens == pytest.approx(8, abs=0.1)
+
+
+def test_reservation_larger_than_the_minute_quota_is_refused_at_once():
+    budget = QuotaBudget(per_minute=10, daily=100, burst=3, headroom=0.1, interactive_reserve=0.2, max_wait=15.0)
+
+    started = time.monotonic()
+    with pytest.raises(QuotaExceeded):
+        asyncio.run(budget.reserve(12))
+    assert time.monotonic() - started < 0.1
+    assert budget.granted == 0
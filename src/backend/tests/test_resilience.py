@@ -0,0 +1,109 @@
+# backend/tests/test_resilience.py - TIMEOUTS ADAPTATIFS ET DISJONCTEURS
+import asyncio
+
+import httpx
+import pytest
+
+from app.config.settings import settings
+from app.services.resilience import LatencyTracker
+from app.services.upstream import UpstreamError, gateway
+
+
+def slow_api(api, latency: float):
+    """API dont chaque réponse prend `latency` secondes : timeout si le client attend moins"""
+    def handle(request, handle=api.handle):
+        if request.extensions["timeout"]["read"] < latency:
+            api.calls.append((request.url.path.strip("/"), dict(request.url.params)))
+            raise httpx.ReadTimeout("simulated", request=request)
+        return handle(request)
+    gateway.client._transport.handler = handle
+
+
+def test_timeouts_are_recorded_and_double_the_next_timeout():
+    tracker = LatencyTracker(200)
+    for _ in range(settings.latency_min_samples):
+        tracker.record("teams", 0.1)
+    assert tracker.timeout_for("teams") == settings.timeout_min
+
+    # Échantillon censuré à 2s (p99 x 3 = 6s), doublé par le timeout consécutif
+    tracker.record_timeout("teams", settings.timeout_min)
+    assert tracker.timeout_for("teams") == pytest.approx(12.0)
+
+    for _ in range(5):
+        tracker.record_timeout("teams", tracker.timeout_for("teams"))
+    assert tracker.timeout_for("teams") == settings.upstream_timeout
+
+    # Une réponse arrive : plus de doublement, le p99 garde la trace des timeouts
+    tracker.record("teams", 0.1)
+    assert tracker.stats()["teams"]["consecutive_timeouts"] == 0
+
+
+def test_endpoint_recovers_after_a_uniform_slowdown(api, monkeypatch):
+    monkeypatch.setattr(settings, "breaker_reset_timeout", 0.0)
+    for _ in range(settings.latency_min_samples):
+        gateway.latency.record("teams", 0.1)
+    slow_api(api, latency=5.0)  # Au-delà de timeout_min (2s)
+
+    async def until_recovered():
+        for attempt in range(1, 10):
+            try:
+                await gateway.fetch("teams", {"id": 85})
+                return attempt
+            except UpstreamError as e:
+                assert e.status_code in (503, 504)
+        return None
+
+    attempts = asyncio.run(until_recovered())
+
+    assert attempts is not None and attempts <= 4
+    assert gateway.breakers.get("teams").state == "closed"
+    assert gateway.latency.timeout_for("teams") >= 5.0
+
+
+def test_hedges_refused_by_the_quota_do_not_drain_the_hedge_budget(api, monkeypatch):
+    monkeypatch.setattr(settings, "hedge_max_fraction", 0.5)
+    gateway.hedging.max_fraction = 0.5
+    for _ in range(settings.latency_min_samples):
+        gateway.latency.record("fixtures", 0.001)
+
+    async def slow(request, handle=api.handle):
+        await asyncio.sleep(0.05)  # Au-delà du p95 observé : un doublon serait lancé
+        return handle(request)
+    gateway.client._transport.handler = slow
+
+    async def scenario():
+        for season in range(2000, 2004):
+            gateway.budget.try_acquire = lambda priority: False  # Aucun jeton pour un doublon
+            await gateway.fetch("fixtures", {"league": 61, "season": season})
+
+    asyncio.run(scenario())
+
+    assert len(api.calls) == 4
+    assert gateway.hedging.hedges == 0
+    assert gateway.hedging.allow()
+
+
+def test_cancelled_hedge_leg_is_recorded_as_a_latency_sample(api, monkeypatch):
+    monkeypatch.setattr(settings, "hedge_max_fraction", 1.0)
+    gateway.hedging.max_fraction = 1.0
+    for _ in range(settings.latency_min_samples):
+        gateway.latency.record("fixtures", 0.01)
+    sent = []
+
+    async def primary_slow(request, handle=api.handle):
+        sent.append(request)
+        if len(sent) == 1:
+            await asyncio.sleep(0.5)  # Requête principale perdante
+        return handle(request)
+    gateway.client._transport.handler = primary_slow
+
+    async def scenario():
+        await gateway.fetch("fixtures", {"league": 61, "season": 2023})
+        await asyncio.sleep(0.01)  # Laisser la requête annulée se terminer
+
+    asyncio.run(scenario())
+
+    samples = list(gateway.latency._samples["fixtures"])
+    assert gateway.hedging.hedge_wins == 1
+    assert len(samples) == settings.latency_min_samples + 2  # Gagnante et perdante
+    assert max(samples[settings.latency_min_samples:]) >= 0.01  # Perdante : au moins le délai de hedging
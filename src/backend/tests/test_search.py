@@ -0,0 +1,29 @@
+# backend/tests/test_search.py - RECHERCHE D'ÉQUIPES (INDEX LOCAL + API)
+from app.services.search_index import search_indexes
+
+
+def team(team_id: int, name: str) -> dict:
+    return {"team": {"id": team_id, "name": name, "country": "France", "code": None, "logo": "l"}}
+
+
+def indexed_reims(api):
+    search_indexes.ingest("teams", {"response": [team(93, "Reims")]})
+    api.routes["teams"] = lambda params: [team(541, "Real Madrid")] if "search" in params else []
+
+
+def test_fuzzy_local_match_does_not_hide_teams_only_known_upstream(client, api):
+    indexed_reims(api)
+
+    names = [doc["name"] for doc in client.get("/api/teams/search?q=real").json()]
+
+    assert names == ["Real Madrid", "Reims"]
+    assert api.calls_to("teams") == [{"search": "real"}]
+
+
+def test_prefix_match_is_answered_from_the_index(client, api):
+    indexed_reims(api)
+
+    names = [doc["name"] for doc in client.get("/api/teams/search?q=reim").json()]
+
+    assert names == ["Reims"]
+    assert api.calls_to("teams") == []
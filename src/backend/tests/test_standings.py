@@ -0,0 +1,17 @@
+# backend/tests/test_standings.py - ROUTES /api/standings
+
+
+def test_raw_standings_route_is_not_captured_by_league_id(client, api):
+    response = client.get("/api/standings/standings?league=61&season=2023")
+
+    assert response.status_code == 200
+    assert response.json()["response"][0]["league"]["id"] == 61
+    assert api.calls_to("standings") == [{"league": "61", "season": "2023"}]
+
+
+def test_league_standings_route_still_matches_numeric_ids(client, api):
+    response = client.get("/api/standings/61?season=2023")
+
+    assert response.status_code == 200
+    assert response.json()["league"]["id"] == 61
+    assert len(response.json()["standings"]) == 18
@@ -0,0 +1,19 @@
+# backend/tests/test_upstream_cache.py - CACHE MÉMOIRE DE LA PASSERELLE
+import asyncio
+
+from app.services.upstream import gateway
+from conftest import NOW, fixture_item
+
+
+def test_cache_hit_returns_the_stored_payload_without_rebuilding_it(api):
+    api.routes["fixtures"] = lambda params: [fixture_item(fixture_id, NOW - fixture_id * 86400)
+                                             for fixture_id in range(1, 6)]
+
+    async def twice():
+        params = {"league": 61, "season": 2023}
+        return await gateway.fetch("fixtures", params), await gateway.fetch("fixtures", params)
+
+    first, second = asyncio.run(twice())
+
+    assert len(api.calls) == 1
+    assert second is first